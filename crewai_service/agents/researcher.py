@@ -2,7 +2,7 @@
 
 from crewai import Agent
 from tools.screenpipe_tools import fetch_screenpipe_activities
-from tools.minecontext_tools import search_documents, get_context
+from tools.minecontext_tools import search_documents, search_documents_multi, get_context
 from tools.database_tools import fetch_conversations
 from utils.llm_config import get_llm
 
@@ -39,6 +39,7 @@ def create_researcher_agent() -> Agent:
         
         tools=[
             fetch_screenpipe_activities,
+            search_documents_multi,
             search_documents,
             get_context,
             fetch_conversations
@@ -1,16 +1,21 @@
 """Quality Reviewer Agent - Reviews and improves report quality."""
 
+from typing import Any, List, Optional
+
 from crewai import Agent
 from utils.llm_config import get_llm
 
 
-def create_reviewer_agent() -> Agent:
+def create_reviewer_agent(callbacks: Optional[List[Any]] = None) -> Agent:
     """
     Create Quality Reviewer Agent.
     
     This agent reviews the generated report for quality, accuracy,
     and consistency, making improvements where needed.
     
+    Args:
+        callbacks: Optional LLM callbacks (e.g. token streaming handlers)
+    
     Returns:
         Configured Agent instance
     """
@@ -45,7 +50,7 @@ def create_reviewer_agent() -> Agent:
         
         tools=[],  # Reviewer doesn't need external tools
         
-        llm=get_llm(),
+        llm=get_llm(callbacks=callbacks),
         
         verbose=True,
         allow_delegation=False,
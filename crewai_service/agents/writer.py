@@ -1,16 +1,21 @@
 """Content Writer Agent - Writes structured reports."""
 
+from typing import Any, List, Optional
+
 from crewai import Agent
 from utils.llm_config import get_llm
 
 
-def create_writer_agent() -> Agent:
+def create_writer_agent(callbacks: Optional[List[Any]] = None) -> Agent:
     """
     Create Report Writer Agent.
     
     This agent transforms analysis results into a well-structured,
     professional, and engaging weekly report in Markdown format.
     
+    Args:
+        callbacks: Optional LLM callbacks (e.g. token streaming handlers)
+    
     Returns:
         Configured Agent instance
     """
@@ -39,7 +44,7 @@ def create_writer_agent() -> Agent:
         
         tools=[],  # Writer doesn't need external tools
         
-        llm=get_llm(),
+        llm=get_llm(callbacks=callbacks),
         
         verbose=True,
         allow_delegation=False,
@@ -5,6 +5,7 @@ from .schemas import (
     GenerateReportRequest,
     GenerateReportResponse,
     ReportOptions,
+    ReportStatus,
     HealthResponse
 )
 
@@ -13,6 +14,7 @@ __all__ = [
     'GenerateReportRequest',
     'GenerateReportResponse',
     'ReportOptions',
+    'ReportStatus',
     'HealthResponse',
 ]
 
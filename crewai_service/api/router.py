@@ -1,16 +1,33 @@
 """API routes for CrewAI Service."""
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+import asyncio
 import time
-import requests
+import uuid
 
 from api.schemas import (
     GenerateReportRequest,
     GenerateReportResponse,
+    ReportStatus,
     HealthResponse
 )
+from api.streaming import (
+    SSE_HEADERS,
+    SSE_KEEPALIVE_SECONDS,
+    format_sse,
+    format_sse_comment
+)
 from crews.crew_manager import CrewManager
+from crews.weekly_report import WEEKLY_REPORT_AGENTS, WEEKLY_REPORT_STEPS
+from crews.execution_registry import ExecutionRegistry
+from crews.report_jobs import ReportJobQueue
+from utils.health_monitor import health_monitor
+from utils.http_client import get_http_client
+from utils.llm_cache import get_response_cache
+from utils.search_cache import get_search_cache
 from utils.logger import logger
 from utils.exceptions import CrewAIServiceException
 from config import settings
@@ -20,8 +37,15 @@ router = APIRouter(prefix="/api")
 # Service start time
 start_time = time.time()
 
-# Global crew manager instance
-crew_manager = CrewManager()
+# Global crew manager instance (stateless; per-run state lives in its registry)
+crew_manager = CrewManager(ExecutionRegistry(max_finished=settings.REPORT_JOB_RETENTION))
+
+# Background report jobs (bounded worker pool)
+report_jobs = ReportJobQueue(
+    crew_manager,
+    max_workers=settings.REPORT_JOB_WORKERS,
+    max_finished_jobs=settings.REPORT_JOB_RETENTION
+)
 
 
 @router.post("/weekly-report/generate", response_model=GenerateReportResponse)
@@ -45,8 +69,9 @@ async def generate_report(request: GenerateReportRequest):
     try:
         logger.info(f"Report generation requested: {request.start_date} to {request.end_date}")
         
-        # Call crew manager to generate report
-        result = crew_manager.generate_report(
+        # Run the blocking crew workflow off the event loop
+        result = await run_in_threadpool(
+            crew_manager.generate_report,
             start_date=request.start_date,
             end_date=request.end_date,
             options=request.options.dict()
@@ -59,27 +84,180 @@ async def generate_report(request: GenerateReportRequest):
     
     except CrewAIServiceException as e:
         logger.error(f"Service error during report generation: {e}")
-        return GenerateReportResponse(
-            status="error",
-            message="Failed to generate report",
-            error={
-                "code": "SERVICE_ERROR",
-                "detail": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        return _error_response("Failed to generate report", "SERVICE_ERROR", e)
     
     except Exception as e:
         logger.error(f"Unexpected error during report generation: {e}")
-        return GenerateReportResponse(
-            status="error",
-            message="An unexpected error occurred",
-            error={
-                "code": "INTERNAL_ERROR",
-                "detail": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
-        )
+        return _error_response("An unexpected error occurred", "INTERNAL_ERROR", e)
+
+
+@router.post("/weekly-report/generate/stream")
+async def generate_report_stream(request: GenerateReportRequest):
+    """
+    Generate weekly report and stream progress as Server-Sent Events.
+    
+    Events:
+    - ``start``: execution id and the ordered task list
+    - ``task_start`` / ``task_end``: one pair per crew task
+      (researcher, analyst, writer, reviewer, exporter); ``task_end``
+      carries the task output
+    - ``token``: writer/reviewer output tokens as the LLM produces them
+    - ``result``: the same payload POST /weekly-report/generate returns
+    
+    Keep-alive comments are sent while no event is pending. If the client
+    disconnects, the crew is cancelled at its next agent step.
+    
+    Args:
+        request: Report generation parameters
+        
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Streaming report generation requested: {request.start_date} to {request.end_date}")
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    execution_id = f"stream_{uuid.uuid4().hex[:12]}"
+    
+    def emit(event: str, data: dict):
+        # Called from the crew worker thread
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+    
+    async def run_crew():
+        try:
+            result = await run_in_threadpool(
+                crew_manager.generate_report,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                options=request.options.dict(),
+                execution_id=execution_id,
+                event_callback=emit
+            )
+            response = GenerateReportResponse(status="success", data=result)
+        except CrewAIServiceException as e:
+            logger.error(f"Service error during streamed report generation: {e}")
+            response = _error_response("Failed to generate report", "SERVICE_ERROR", e)
+        except Exception as e:
+            logger.error(f"Unexpected error during streamed report generation: {e}")
+            response = _error_response("An unexpected error occurred", "INTERNAL_ERROR", e)
+        
+        await events.put(("result", response.dict()))
+        await events.put((None, None))
+    
+    async def event_stream():
+        worker = asyncio.create_task(run_crew())
+        try:
+            yield format_sse("start", {
+                "execution_id": execution_id,
+                "tasks": WEEKLY_REPORT_AGENTS,
+                "steps": WEEKLY_REPORT_STEPS
+            })
+            
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(events.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield format_sse_comment()
+                    continue
+                
+                if event is None:
+                    break
+                yield format_sse(event, data)
+        finally:
+            if not worker.done():
+                logger.info(f"Stream client disconnected, cancelling {execution_id}")
+                crew_manager.cancel(execution_id)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+def _error_response(message: str, code: str, error: Exception) -> GenerateReportResponse:
+    """Build an error GenerateReportResponse."""
+    return GenerateReportResponse(
+        status="error",
+        message=message,
+        error={
+            "code": code,
+            "detail": str(error),
+            "timestamp": datetime.now().isoformat()
+        }
+    )
+
+
+@router.post("/weekly-report/jobs", response_model=ReportStatus, status_code=202)
+async def submit_report_job(request: GenerateReportRequest):
+    """
+    Queue a weekly report generation job.
+    
+    Returns immediately with a job id; the crew runs on a background
+    worker pool. Poll GET /weekly-report/jobs/{job_id} for progress.
+    
+    Args:
+        request: Report generation parameters
+        
+    Returns:
+        ReportStatus of the newly queued job
+    """
+    logger.info(f"Report job requested: {request.start_date} to {request.end_date}")
+    
+    job = report_jobs.submit(
+        start_date=request.start_date,
+        end_date=request.end_date,
+        options=request.options.dict()
+    )
+    
+    return ReportStatus(**report_jobs.status(job))
+
+
+@router.get("/weekly-report/jobs/{job_id}", response_model=ReportStatus)
+async def get_report_job(job_id: str):
+    """
+    Get status (and result, once completed) of a report job.
+    
+    Args:
+        job_id: Job identifier returned by POST /weekly-report/jobs
+        
+    Returns:
+        ReportStatus of the job
+    """
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Report job not found: {job_id}")
+    
+    return ReportStatus(**report_jobs.status(job))
+
+
+@router.post("/weekly-report/jobs/{job_id}/cancel", response_model=ReportStatus)
+async def cancel_report_job(job_id: str):
+    """
+    Cancel a pending or running report job.
+    
+    Args:
+        job_id: Job identifier
+        
+    Returns:
+        ReportStatus of the job after the cancellation request
+    """
+    job = report_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Report job not found: {job_id}")
+    
+    return ReportStatus(**report_jobs.status(job))
+
+
+@router.get("/weekly-report/status")
+async def get_generation_status():
+    """
+    Summarize report generations currently running in this worker.
+    
+    Returns:
+        Per-execution timing, step and progress information
+    """
+    return crew_manager.get_status()
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -87,49 +265,22 @@ async def health_check():
     """
     Health check endpoint.
     
-    Checks availability of:
+    Reports availability of:
     - Screenpipe service
     - MineContext service
     - LLM configuration
     
+    Service statuses (availability window, latency percentiles) come from
+    the background health monitor, so the endpoint does not wait on probes.
+    
     Returns:
         HealthResponse with service statuses
     """
-    services = {}
-    
-    # Check Screenpipe
-    try:
-        start = time.time()
-        r = requests.get(f"{settings.SCREENPIPE_URL}/health", timeout=3)
-        response_time = (time.time() - start) * 1000
-        services["screenpipe"] = {
-            "available": r.status_code == 200,
-            "url": settings.SCREENPIPE_URL,
-            "response_time_ms": round(response_time, 2)
-        }
-    except Exception as e:
-        logger.warning(f"Screenpipe health check failed: {e}")
-        services["screenpipe"] = {
-            "available": False,
-            "url": settings.SCREENPIPE_URL
-        }
-    
-    # Check MineContext
-    try:
-        start = time.time()
-        r = requests.get(f"{settings.MINECONTEXT_URL}/health", timeout=3)
-        response_time = (time.time() - start) * 1000
-        services["minecontext"] = {
-            "available": r.status_code == 200,
-            "url": settings.MINECONTEXT_URL,
-            "response_time_ms": round(response_time, 2)
-        }
-    except Exception as e:
-        logger.warning(f"MineContext health check failed: {e}")
-        services["minecontext"] = {
-            "available": False,
-            "url": settings.MINECONTEXT_URL
-        }
+    # Served from the background monitor; probe once if it has not run yet
+    services = health_monitor.snapshot()
+    if not services:
+        await health_monitor.probe_all()
+        services = health_monitor.snapshot()
     
     # Check LLM configuration
     services["llm"] = {
@@ -137,6 +288,12 @@ async def health_check():
         "provider": "SiliconFlow",
         "model": settings.LLM_MODEL
     }
+    llm_cache = get_response_cache()
+    if llm_cache is not None:
+        services["llm"]["cache"] = llm_cache.stats()
+    search_cache = get_search_cache()
+    if search_cache is not None:
+        services.setdefault("minecontext", {})["search_cache"] = search_cache.stats()
     
     # Determine overall health status
     all_critical_services_ok = (
@@ -149,6 +306,6 @@ async def health_check():
         status=status,
         version="1.0.0",
         services=services,
-        uptime_seconds=round(time.time() - start_time, 2)
+        uptime_seconds=round(time.time() - start_time, 2),
+        http_pools=get_http_client().stats()
     )
-
@@ -58,12 +58,17 @@ class HealthResponse(BaseModel):
     version: str
     services: Dict[str, Any]
     uptime_seconds: float
+    http_pools: Dict[str, Any] = Field(default_factory=dict, description="Per-host HTTP connection pool metrics")
 
 
 class ReportStatus(BaseModel):
     """Status of report generation."""
-    status: str = Field(..., description="pending, in_progress, completed, or failed")
+    job_id: Optional[str] = Field(default=None, description="Report job identifier")
+    status: str = Field(..., description="pending, in_progress, completed, fallback, failed, or cancelled")
     progress: int = Field(..., ge=0, le=100, description="Progress percentage")
     current_step: str
     estimated_time_remaining: Optional[int] = None
+    created_at: Optional[str] = Field(default=None, description="Job creation time (ISO 8601)")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Report data once completed")
+    error: Optional[Dict[str, Any]] = Field(default=None, description="Error details if failed")
 
@@ -0,0 +1,43 @@
+"""Server-Sent Events helpers for streaming report generation."""
+
+import json
+from typing import Any
+
+
+# Seconds without events before a keep-alive comment is sent, so clients
+# and proxies don't time out during long LLM calls
+SSE_KEEPALIVE_SECONDS = 15
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format a single Server-Sent Event.
+    
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+    
+    Returns:
+        SSE wire-format string
+    """
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def format_sse_comment(comment: str = "keep-alive") -> str:
+    """
+    Format an SSE comment line (ignored by clients, keeps the connection open).
+    
+    Args:
+        comment: Comment text
+    
+    Returns:
+        SSE wire-format string
+    """
+    return f": {comment}\n\n"
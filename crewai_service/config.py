@@ -1,7 +1,7 @@
 """Configuration management for CrewAI Service."""
 
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -16,7 +16,12 @@ class Settings(BaseSettings):
     
     # External Services
     SCREENPIPE_URL: str = "http://localhost:3030"
+    SCREENPIPE_BACKEND: str = "http"  # http, sqlite, or auto (sqlite when the DB exists)
+    SCREENPIPE_DB_PATH: str = "~/.screenpipe/db.sqlite"
     MINECONTEXT_URL: str = "http://localhost:17860"
+    # State file of scripts/screenpipe/screenpipe_sync.py; its ingestion
+    # watermark invalidates the MineContext search cache
+    MINECONTEXT_SYNC_STATE_PATH: str = "~/.screenpipe/minecontext_sync_state.json"
     
     # LLM Configuration
     LLM_BASE_URL: str = "https://api.siliconflow.cn/v1"
@@ -24,12 +29,26 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "Qwen/Qwen2.5-7B-Instruct"
     LLM_TEMPERATURE: float = 0.7
     LLM_MAX_TOKENS: int = 4000
+    # Token budget for collected data embedded in the analysis prompt
+    # (0 embeds the raw data); counted with the tiktoken encoding below
+    CONTEXT_TOKEN_BUDGET: int = 6000
+    CONTEXT_TOKENIZER: str = "cl100k_base"
+    # On-disk cache of LLM responses keyed on prompt, model, temperature and
+    # max tokens; reruns with unchanged inputs skip the API calls
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_PATH: str = "~/MineDesk/cache/llm_cache.sqlite3"
+    LLM_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 5000
     
     # Database
     DB_PATH: str = "~/Library/Application Support/MineDesk/conversations.db"
     
     # Reports
     REPORTS_DIR: str = "~/MineDesk/reports"
+    # Per-day cache of collected activities and daily summaries
+    # (REPORTS_DIR/day_cache.sqlite3), reused by overlapping reports
+    DAY_CACHE_ENABLED: bool = True
+    DAY_CACHE_RETENTION_DAYS: int = 60
     
     # Data Filtering - Sensitive Keywords
     SENSITIVE_KEYWORDS: List[str] = [
@@ -37,6 +56,18 @@ class Settings(BaseSettings):
         "密码", "口令", "秘钥", "私钥"
     ]
     
+    # Data Filtering - Secret detectors (see utils.data_filter.SECRET_DETECTORS)
+    SECRET_DETECTORS: List[str] = [
+        "aws_access_key", "github_token", "jwt",
+        "bearer_token", "private_key", "credit_card"
+    ]
+    
+    # Data Filtering - Parallel redaction: FILTER_WORKERS > 1 shards large
+    # batches across a process pool; 0 or 1 filters in-process
+    FILTER_WORKERS: int = 0
+    FILTER_PARALLEL_MIN_ITEMS: int = 5000
+    FILTER_CHUNK_SIZE: int = 2000
+    
     # Data Filtering - Excluded Apps
     EXCLUDED_APPS: List[str] = [
         "1Password", "Keychain Access", "Passwords",
@@ -44,9 +75,66 @@ class Settings(BaseSettings):
     ]
     
     # Performance
-    MAX_ACTIVITIES_PER_REQUEST: int = 10000
+    # Cap on the activities one Screenpipe fetch returns (0 for no limit);
+    # fetches page through the whole range, so no cap is needed by default
+    MAX_ACTIVITIES_PER_REQUEST: int = 0
+    SCREENPIPE_PAGE_SIZE: int = 1000  # Rows per Screenpipe page / SQLite batch
     REQUEST_TIMEOUT: int = 30
     CREW_MAX_RPM: int = 100
+    # Keep-alive connections per service host (see utils.http_client)
+    HTTP_POOL_MAXSIZE: int = 10
+    HTTP_POOL_BLOCK: bool = False
+    # Circuit breaker per service host: open after CIRCUIT_FAILURE_THRESHOLD
+    # consecutive failures, probe again after CIRCUIT_RESET_SECONDS
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_RESET_SECONDS: float = 30
+    # Adaptive timeouts: MULTIPLIER x observed p95 latency, capped by the
+    # configured timeouts
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = 3.0
+    ADAPTIVE_TIMEOUT_MIN_SECONDS: float = 1.0
+    
+    # Health Monitor - background probes of Screenpipe and MineContext;
+    # sources failing HEALTH_DOWN_AFTER_FAILURES probes in a row are skipped
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 15
+    HEALTH_CHECK_TIMEOUT: float = 3
+    HEALTH_WINDOW_SAMPLES: int = 40
+    HEALTH_DOWN_AFTER_FAILURES: int = 2
+    
+    # Data Collection - fetch sources directly before kickoff instead of
+    # letting the researcher agent call the tools
+    PRECOLLECT_DATA: bool = True
+    COLLECTION_DEADLINE_SECONDS: float = 45
+    SCREENPIPE_TIMEOUT: float = 30
+    MINECONTEXT_TIMEOUT: float = 15
+    DOCUMENT_QUERIES: List[str] = ["work", "project", "document"]
+    # Document text returned by multi-query searches until full content is
+    # requested (tokens)
+    DOCUMENT_SNIPPET_TOKENS: int = 150
+    # In-memory cache of MineContext searches and context queries (TTL + LRU),
+    # cleared whenever the sync script ingests new data
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: float = 3600
+    SEARCH_CACHE_MAX_ENTRIES: int = 512
+    
+    # Time Accounting - frame gaps above IDLE_GAP_SECONDS count as idle
+    IDLE_GAP_SECONDS: float = 300
+    FOCUS_SESSION_SECONDS: float = 1800
+    # Extra category rules checked before the built-in table, e.g.
+    # [{"category": "coding", "app": "Chrome", "window": "github\\.com"}]
+    CATEGORY_RULES: List[Dict[str, str]] = []
+    
+    # Map-reduce summarization - summarize each day in parallel LLM calls
+    # (bounded by CREW_MAX_RPM) and give the analyst the daily summaries.
+    # "auto" enables it from MAP_REDUCE_MIN_ACTIVITIES activities
+    MAP_REDUCE_MODE: str = "auto"  # auto, on, off
+    MAP_REDUCE_MIN_ACTIVITIES: int = 20000
+    MAP_REDUCE_WORKERS: int = 4
+    DAY_SUMMARY_INPUT_TOKENS: int = 3000
+    DAY_SUMMARY_MAX_TOKENS: int = 600
+    
+    # Report Jobs
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_RETENTION: int = 100
     
     class Config:
         """Pydantic config."""
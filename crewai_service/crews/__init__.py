@@ -1,11 +1,33 @@
 """Crews package for CrewAI workflows."""
 
-from .weekly_report import create_weekly_report_crew, create_weekly_report_tasks
+from .weekly_report import (
+    create_weekly_report_crew,
+    create_weekly_report_tasks,
+    WEEKLY_REPORT_AGENTS,
+    WEEKLY_REPORT_STEPS
+)
+from .data_collector import collect_weekly_data, all_sources_failed
+from .context_compactor import compact_collected_data
+from .daily_summaries import use_map_reduce, split_by_day, summarize_days
+from .execution_registry import CrewExecution, ExecutionRegistry
 from .crew_manager import CrewManager
+from .report_jobs import ReportJob, ReportJobQueue
 
 __all__ = [
     'create_weekly_report_crew',
     'create_weekly_report_tasks',
+    'WEEKLY_REPORT_AGENTS',
+    'WEEKLY_REPORT_STEPS',
+    'collect_weekly_data',
+    'all_sources_failed',
+    'compact_collected_data',
+    'use_map_reduce',
+    'split_by_day',
+    'summarize_days',
+    'CrewExecution',
+    'ExecutionRegistry',
     'CrewManager',
+    'ReportJob',
+    'ReportJobQueue',
 ]
 
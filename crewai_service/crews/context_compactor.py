@@ -0,0 +1,253 @@
+"""Context Compactor - Fits collected data into a prompt token budget."""
+
+import json
+from typing import Dict, Any, List, Tuple
+
+from config import settings
+from tools.screenpipe_tools import compute_time_stats, get_app_classifier
+from utils.data_filter import sanitize_for_llm
+from utils.sessions import sessionize, sort_by_timestamp
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+
+# Share of the remaining budget for each ranked section; unused share
+# flows to the next sections
+SECTION_SHARES = (
+    ("sessions", 0.45),
+    ("documents", 0.35),
+    ("conversations", 0.20)
+)
+
+# Per-item text limits (tokens); document snippets use
+# settings.DOCUMENT_SNIPPET_TOKENS like the document search
+SESSION_TEXT_TOKENS = 80
+CONVERSATION_EXCERPT_TOKENS = 150
+
+# Applications listed in the per-app summary
+MAX_APPS = 20
+
+# Reserved for the compaction metadata added after filling
+COMPACTION_METADATA_TOKENS = 64
+
+
+class _SeenTexts:
+    """Exact per-session text dedup for sessionize."""
+
+    def __init__(self):
+        self.seen = set()
+
+    def add(self, text: str) -> bool:
+        """Return True for a text not seen in this session yet."""
+        if text in self.seen:
+            return False
+        self.seen.add(text)
+        return True
+
+
+def compact_collected_data(
+    collected_data: Dict[str, Any],
+    token_budget: int,
+    include_sessions: bool = True
+) -> Dict[str, Any]:
+    """
+    Compact collected data so it fits a prompt token budget.
+
+    Raw activities are replaced by aggregates: precomputed time statistics,
+    a per-app summary and activity sessions (see utils.sessions) ranked by
+    duration, each with a short OCR excerpt. Documents are ranked by search
+    score and conversations by message count, and both are reduced to
+    snippets. Sections are then filled greedily in rank order until the
+    budget is spent, so prompt size stays bounded however much data a
+    week produces.
+
+    Args:
+        collected_data: Output of the data collection stage
+        token_budget: Maximum tokens for the serialized result
+        include_sessions: Set to False when sessions are covered elsewhere
+            (e.g. daily summaries); the budget then goes to documents and
+            conversations
+
+    Returns:
+        Dictionary with time_summary, apps, sessions, documents,
+        conversations and metadata (including a ``compaction`` entry with
+        token usage and omitted item counts)
+    """
+    activities = collected_data.get("activities", [])
+
+    time_summary = compute_time_stats(activities) if activities else {}
+    sessions = _summarize_sessions(activities)
+    apps = _summarize_apps(sessions)
+
+    sections = {
+        "sessions": sessions if include_sessions else [],
+        "documents": _rank_documents(collected_data.get("documents", [])),
+        "conversations": _rank_conversations(collected_data.get("conversations", []))
+    }
+
+    compacted = {
+        "time_summary": time_summary,
+        "apps": apps,
+        "sessions": [],
+        "documents": [],
+        "conversations": [],
+        "metadata": dict(collected_data.get("metadata", {}))
+    }
+
+    used = count_tokens(_dumps(compacted)) + COMPACTION_METADATA_TOKENS
+    remaining = max(0, token_budget - used)
+    selected, spent = _fill_sections(sections, remaining)
+
+    for name, items in selected.items():
+        # Sessions read best in chronological order once selected
+        if name == "sessions":
+            items = sorted(items, key=lambda item: item["start"])
+        compacted[name] = items
+
+    compacted["metadata"]["compaction"] = {
+        "token_budget": token_budget,
+        "tokens_used": used + spent,
+        "total_sessions": len(sessions),
+        "omitted": {
+            name: len(sections[name]) - len(selected[name])
+            for name in sections
+            if len(sections[name]) > len(selected[name])
+        }
+    }
+
+    return compacted
+
+
+def _fill_sections(
+    sections: Dict[str, List[Dict[str, Any]]],
+    budget: int
+) -> Tuple[Dict[str, List[Dict[str, Any]]], int]:
+    """
+    Greedily take ranked items per section within the budget.
+
+    Each section first gets its share of the budget; a second pass hands
+    whatever is left (unused shares, empty sections) to the sections in
+    order.
+    """
+    selected = {name: [] for name in sections}
+    positions = {name: 0 for name in sections}
+    spent = 0
+
+    def take(name: str, allowance: int) -> int:
+        used = 0
+        items = sections[name]
+        while positions[name] < len(items):
+            # +1 for the separating comma
+            cost = count_tokens(_dumps(items[positions[name]])) + 1
+            if used + cost > allowance:
+                break
+            selected[name].append(items[positions[name]])
+            positions[name] += 1
+            used += cost
+        return used
+
+    for name, share in SECTION_SHARES:
+        spent += take(name, int(budget * share))
+
+    for name, _ in SECTION_SHARES:
+        spent += take(name, budget - spent)
+
+    return selected, spent
+
+
+def _summarize_sessions(activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Split activities into sessions, longest first, with OCR excerpts."""
+    sessions = []
+    classify = get_app_classifier().classify
+
+    for session in sessionize(
+        sort_by_timestamp(activities),
+        idle_gap_seconds=settings.IDLE_GAP_SECONDS,
+        text_filter_factory=_SeenTexts
+    ):
+        text = " | ".join(text.strip() for text in session["texts"] if text.strip())
+        sessions.append({
+            "app": session["app"],
+            "window": session["window"],
+            "category": classify(session["app"], session["window"]),
+            "start": session["start_time"],
+            "minutes": round(session["duration_seconds"] / 60, 1),
+            "frames": session["frame_count"],
+            "text": truncate_to_tokens(text, SESSION_TEXT_TOKENS)
+        })
+
+    sessions.sort(key=lambda item: item["minutes"], reverse=True)
+    return sessions
+
+
+def _summarize_apps(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-app totals with session counts and the busiest windows."""
+    apps: Dict[str, Dict[str, Any]] = {}
+
+    for session in sessions:
+        app = apps.setdefault(session["app"], {
+            "app": session["app"],
+            "category": session["category"],
+            "minutes": 0.0,
+            "sessions": 0,
+            "windows": {}
+        })
+        app["minutes"] += session["minutes"]
+        app["sessions"] += 1
+        app["windows"][session["window"]] = app["windows"].get(session["window"], 0) + session["minutes"]
+
+    summary = []
+    for app in sorted(apps.values(), key=lambda item: item["minutes"], reverse=True)[:MAX_APPS]:
+        windows = sorted(app.pop("windows").items(), key=lambda item: item[1], reverse=True)
+        app["minutes"] = round(app["minutes"], 1)
+        app["top_windows"] = [window for window, _ in windows[:3]]
+        summary.append(app)
+
+    return summary
+
+
+def _rank_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Documents by descending search score, reduced to snippets."""
+    ranked = sorted(documents, key=lambda doc: doc.get("score") or 0, reverse=True)
+
+    compacted = []
+    for doc in ranked:
+        doc = sanitize_for_llm(doc)
+        compacted.append({
+            "id": doc.get("id"),
+            "title": doc.get("title"),
+            "created_at": doc.get("created_at"),
+            "score": doc.get("score"),
+            "snippet": truncate_to_tokens(
+                str(doc.get("content") or doc.get("snippet") or ""),
+                settings.DOCUMENT_SNIPPET_TOKENS
+            )
+        })
+
+    return compacted
+
+
+def _rank_conversations(conversations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Conversations by message count, reduced to excerpts."""
+    ranked = sorted(conversations, key=lambda conv: len(conv.get("messages") or []), reverse=True)
+
+    compacted = []
+    for conversation in ranked:
+        conversation = sanitize_for_llm(conversation)
+        messages = conversation.get("messages") or []
+        excerpt = "\n".join(
+            f"{message.get('role')}: {message.get('content')}"
+            for message in messages
+        )
+        compacted.append({
+            "title": conversation.get("title"),
+            "created_at": conversation.get("created_at"),
+            "messages": len(messages),
+            "excerpt": truncate_to_tokens(excerpt, CONVERSATION_EXCERPT_TOKENS)
+        })
+
+    return compacted
+
+
+def _dumps(value: Any) -> str:
+    """Serialize like the prompt does."""
+    return json.dumps(value, ensure_ascii=False, default=str)
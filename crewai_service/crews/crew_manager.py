@@ -1,13 +1,27 @@
 """Crew Manager - Orchestrates crew execution and handles errors."""
 
-import time
+import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 
-from crews.weekly_report import create_weekly_report_crew
+from crews.weekly_report import (
+    create_weekly_report_crew,
+    WEEKLY_REPORT_AGENTS,
+    WEEKLY_REPORT_STEPS
+)
+from crews.execution_registry import ExecutionRegistry
+from crews.data_collector import (
+    collect_weekly_data,
+    all_sources_failed,
+    SOURCE_SERVICES
+)
+from crews.daily_summaries import use_map_reduce, summarize_days
+from tools.screenpipe_tools import compute_time_stats
+from config import settings
 from utils.logger import logger
 from utils.exceptions import (
     ReportGenerationException,
+    ReportCancelledException,
     ServiceUnavailableException,
     LLMException
 )
@@ -22,18 +36,28 @@ class CrewManager:
     - Execution with error handling
     - Progress tracking
     - Fallback strategies
+    
+    The manager itself is stateless between calls; per-run state lives in
+    an ExecutionRegistry keyed by execution id, so a single instance can
+    serve concurrent report generations.
     """
     
-    def __init__(self):
-        """Initialize Crew Manager."""
-        self.current_crew = None
-        self.execution_start_time = None
+    def __init__(self, registry: Optional[ExecutionRegistry] = None):
+        """
+        Initialize Crew Manager.
+        
+        Args:
+            registry: Execution registry (a private one is created if omitted)
+        """
+        self.executions = registry or ExecutionRegistry()
         
     def generate_report(
         self,
         start_date: str,
         end_date: str,
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        execution_id: Optional[str] = None,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate weekly report using CrewAI workflow.
@@ -42,49 +66,91 @@ class CrewManager:
             start_date: Start date (ISO 8601)
             end_date: End date (ISO 8601)
             options: Report options (language, includes, etc.)
+            execution_id: Job/report id used to track this run (generated if omitted)
+            event_callback: Optional ``(event, data)`` callable receiving
+                ``task_start``, ``task_end`` and ``token`` progress events.
+                Called from the worker thread running the crew.
         
         Returns:
-            Dictionary with report content and metadata
+            Dictionary with report content and metadata. When the data
+            sources are unavailable no crew runs and a fallback report
+            (``metadata.is_fallback``) is returned; the execution then
+            finishes with status "fallback".
         
         Raises:
             ReportGenerationException: If generation fails
+            ReportCancelledException: If the run was cancelled
         """
+        # Extract options
+        language = options.get('language', 'zh')
+        
+        # Generate report ID (suffix keeps concurrent runs distinct)
+        report_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        execution_id = execution_id or report_id
+        
+        execution = self.executions.start(
+            execution_id,
+            steps=list(WEEKLY_REPORT_STEPS),
+            description=f"{start_date} to {end_date}"
+        )
+        
         try:
-            self.execution_start_time = time.time()
-            
-            # Extract options
-            language = options.get('language', 'zh')
-            
             logger.info("="*60)
-            logger.info(f"Starting report generation")
+            logger.info(f"Starting report generation [{execution_id}]")
             logger.info(f"Date range: {start_date} to {end_date}")
             logger.info(f"Language: {language}")
             logger.info(f"Options: {options}")
             logger.info("="*60)
             
+            # Deterministic data collection stage (replaces the research task)
+            collected_data = None
+            if settings.PRECOLLECT_DATA:
+                collected_data = self._collect_data(
+                    execution_id, start_date, end_date, language, options, event_callback
+                )
+                if all_sources_failed(collected_data):
+                    self.executions.finish(execution_id, "fallback")
+                    return self._generate_fallback_report(
+                        start_date, end_date, language,
+                        self._failed_services(collected_data)
+                    )
+            
+            token_callback = None
+            if event_callback is not None:
+                token_callback = lambda agent, token: event_callback(
+                    "token", {"task": agent, "token": token}
+                )
+            
             # Create crew
             crew = create_weekly_report_crew(
                 start_date=start_date,
                 end_date=end_date,
-                language=language
+                language=language,
+                task_callback=lambda output: self._on_task_completed(
+                    execution_id, output, event_callback
+                ),
+                step_callback=lambda step: self._on_agent_step(execution_id, step),
+                token_callback=token_callback,
+                collected_data=collected_data
             )
             
-            self.current_crew = crew
-            
             # Execute crew workflow
             logger.info("🚀 Executing crew workflow...")
+            if event_callback is not None:
+                event_callback("task_start", self._task_event(execution.completed_steps))
             result = crew.kickoff()
             
             # Calculate execution time
-            duration = time.time() - self.execution_start_time
+            duration = execution.elapsed_seconds
             
             logger.info(f"✅ Crew execution completed in {duration:.2f}s")
             
             # Process result
             report_content = self._extract_report_content(result)
             
-            # Generate report ID
-            report_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            metadata = (collected_data or {}).get("metadata", {})
+            activities = (collected_data or {}).get("activities", [])
+            time_stats = compute_time_stats(activities) if activities else {}
             
             # Prepare response
             response = {
@@ -96,16 +162,19 @@ class CrewManager:
                     "word_count": len(report_content.split()),
                     "sections": self._count_sections(report_content),
                     "language": language,
-                    "date_range": f"{start_date} to {end_date}"
+                    "date_range": f"{start_date} to {end_date}",
+                    "unavailable_sources": list(self._failed_services(collected_data))
                 },
                 "statistics": {
-                    "total_activities": 0,  # TODO: Extract from crew output
-                    "total_documents": 0,
-                    "total_time_hours": 0,
+                    "total_activities": metadata.get("total_activities", 0),
+                    "total_documents": metadata.get("total_documents", 0),
+                    "total_time_hours": time_stats.get("total_hours", 0),
                     "productivity_score": 0.0
                 }
             }
             
+            self.executions.finish(execution_id, "completed")
+            
             logger.info("="*60)
             logger.info("✨ Report generation successful!")
             logger.info(f"Report ID: {report_id}")
@@ -114,18 +183,138 @@ class CrewManager:
             
             return response
         
+        except ReportCancelledException:
+            logger.info(f"Report generation cancelled [{execution_id}]")
+            self.executions.finish(execution_id, "cancelled")
+            raise
+        
         except ServiceUnavailableException as e:
             logger.error(f"External service unavailable: {e}")
-            return self._generate_fallback_report(start_date, end_date, language, str(e))
+            self.executions.finish(execution_id, "fallback")
+            return self._generate_fallback_report(
+                start_date, end_date, language, {e.service_name: str(e)}
+            )
         
         except LLMException as e:
             logger.error(f"LLM API error: {e}")
+            self.executions.finish(execution_id, "failed")
             return self._generate_error_report(start_date, end_date, "LLM_ERROR", str(e))
         
         except Exception as e:
             logger.error(f"Unexpected error during report generation: {e}", exc_info=True)
+            self.executions.finish(execution_id, "failed")
             raise ReportGenerationException(f"Failed to generate report: {str(e)}")
     
+    def cancel(self, execution_id: str):
+        """
+        Request cooperative cancellation of a running execution.
+        
+        The crew is stopped at its next agent step.
+        
+        Args:
+            execution_id: Execution identifier
+        """
+        self.executions.request_cancel(execution_id)
+    
+    def _collect_data(
+        self,
+        execution_id: str,
+        start_date: str,
+        end_date: str,
+        language: str,
+        options: Dict[str, Any],
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the data collection stage as the first execution step.
+        
+        Large weeks are also summarized per day here (the map step, see
+        crews.daily_summaries), so the analyst only sees reduced summaries.
+        
+        Args:
+            execution_id: Execution identifier
+            start_date: Start date
+            end_date: End date
+            language: Report language for the daily summaries
+            options: Report options
+            event_callback: Optional progress event callable
+        
+        Returns:
+            Collected data for the crew (failed sources listed in ``errors``)
+        """
+        if event_callback is not None:
+            event_callback("task_start", self._task_event(0))
+        
+        collected_data = collect_weekly_data(start_date, end_date, options)
+        
+        if use_map_reduce(collected_data):
+            collected_data["daily_summaries"] = summarize_days(
+                collected_data,
+                language,
+                progress_callback=lambda summary: self._on_agent_step(execution_id, summary)
+            )
+            collected_data["metadata"]["summarized_days"] = len(collected_data["daily_summaries"])
+        
+        self.executions.step_completed(execution_id)
+        if event_callback is not None:
+            event_callback("task_end", self._task_event(
+                0,
+                output=collected_data["metadata"],
+                errors=collected_data["errors"]
+            ))
+        
+        if self.executions.is_cancel_requested(execution_id):
+            raise ReportCancelledException(f"Report generation cancelled: {execution_id}")
+        
+        return collected_data
+    
+    def _failed_services(self, collected_data: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Map collection errors to service name -> error description."""
+        if not collected_data:
+            return {}
+        return {
+            SOURCE_SERVICES.get(source, source): detail
+            for source, detail in collected_data["errors"].items()
+        }
+    
+    def _on_task_completed(
+        self,
+        execution_id: str,
+        output: Any,
+        event_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ):
+        """Crew task callback: advance the execution to its next step."""
+        execution = self.executions.step_completed(execution_id)
+        
+        if event_callback is not None and execution is not None:
+            finished_index = execution.completed_steps - 1
+            event_callback("task_end", self._task_event(
+                finished_index,
+                output=self._extract_report_content(output)
+            ))
+            if execution.completed_steps < len(WEEKLY_REPORT_STEPS):
+                event_callback("task_start", self._task_event(execution.completed_steps))
+        
+        if self.executions.is_cancel_requested(execution_id):
+            raise ReportCancelledException(f"Report generation cancelled: {execution_id}")
+    
+    def _on_agent_step(self, execution_id: str, step: Any):
+        """Crew step callback: record activity and honor cancellation."""
+        self.executions.touch(execution_id)
+        if self.executions.is_cancel_requested(execution_id):
+            raise ReportCancelledException(f"Report generation cancelled: {execution_id}")
+    
+    def _task_event(self, index: int, **extra: Any) -> Dict[str, Any]:
+        """Build the payload of a task progress event."""
+        event = {
+            "task": WEEKLY_REPORT_AGENTS[index],
+            "step": WEEKLY_REPORT_STEPS[index],
+            "index": index,
+            "total": len(WEEKLY_REPORT_STEPS)
+        }
+        event.update(extra)
+        return event
+    
     def _extract_report_content(self, result: Any) -> str:
         """
         Extract Markdown content from crew execution result.
@@ -144,6 +333,8 @@ class CrewManager:
                 return str(result.output)
             elif hasattr(result, 'result'):
                 return str(result.result)
+            elif hasattr(result, 'raw_output'):
+                return str(result.raw_output)
             else:
                 return str(result)
         except Exception as e:
@@ -172,7 +363,7 @@ class CrewManager:
         start_date: str,
         end_date: str,
         language: str,
-        error_message: str
+        failed_sources: Dict[str, str]
     ) -> Dict[str, Any]:
         """
         Generate a fallback report when external services are unavailable.
@@ -181,14 +372,25 @@ class CrewManager:
             start_date: Start date
             end_date: End date
             language: Report language
-            error_message: Error description
+            failed_sources: Service name -> error description, for the
+                sources that actually failed
         
         Returns:
             Minimal report with error notification
         """
-        logger.warning("Generating fallback report due to service unavailability")
+        logger.warning(
+            f"Generating fallback report due to unavailable sources: {', '.join(failed_sources)}"
+        )
+        
+        error_message = "; ".join(
+            f"{service} ({detail})" for service, detail in failed_sources.items()
+        )
         
         if language == "zh":
+            check_steps = "\n".join(
+                f"{i}. 检查 {service} 服务状态"
+                for i, service in enumerate(failed_sources, 1)
+            )
             content = f"""# 📊 周报
 
 **报告期间**: {start_date} 至 {end_date}
@@ -201,11 +403,14 @@ class CrewManager:
 
 ## 📌 下一步
 
-1. 检查 Screenpipe 服务状态
-2. 检查 MineContext 服务状态
-3. 重新生成报告
+{check_steps}
+{len(failed_sources) + 1}. 重新生成报告
 """
         else:
+            check_steps = "\n".join(
+                f"{i}. Check {service} service status"
+                for i, service in enumerate(failed_sources, 1)
+            )
             content = f"""# 📊 Weekly Report
 
 **Period**: {start_date} to {end_date}
@@ -218,9 +423,8 @@ This report was generated with limited data. Please check external service statu
 
 ## 📌 Next Steps
 
-1. Check Screenpipe service status
-2. Check MineContext service status  
-3. Regenerate the report
+{check_steps}
+{len(failed_sources) + 1}. Regenerate the report
 """
         
         return {
@@ -231,7 +435,8 @@ This report was generated with limited data. Please check external service statu
                 "duration_seconds": 0,
                 "word_count": len(content.split()),
                 "is_fallback": True,
-                "error": error_message
+                "error": error_message,
+                "unavailable_sources": list(failed_sources)
             },
             "statistics": {}
         }
@@ -279,29 +484,35 @@ Please check the service logs for more information.
             "statistics": {}
         }
     
-    def get_status(self) -> Dict[str, Any]:
+    def get_status(self, execution_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get current execution status.
+        Get execution status.
+        
+        Args:
+            execution_id: Execution to report on; if omitted, summarize all
+                running executions
         
         Returns:
             Status information
         """
-        if self.current_crew is None:
+        if execution_id is not None:
+            execution = self.executions.get(execution_id)
+            if execution is None:
+                return {
+                    "status": "unknown",
+                    "message": f"No execution found: {execution_id}"
+                }
+            return execution.to_dict()
+        
+        active = self.executions.active()
+        if not active:
             return {
                 "status": "idle",
                 "message": "No crew currently executing"
             }
         
-        if self.execution_start_time:
-            elapsed = time.time() - self.execution_start_time
-            return {
-                "status": "in_progress",
-                "elapsed_seconds": round(elapsed, 2),
-                "message": "Crew is currently executing"
-            }
-        
         return {
-            "status": "unknown",
-            "message": "Status unavailable"
+            "status": "in_progress",
+            "message": f"{len(active)} crew(s) currently executing",
+            "executions": [execution.to_dict() for execution in active]
         }
-
@@ -0,0 +1,258 @@
+"""Daily Summaries - Map step of map-reduce summarization for large weeks."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import HumanMessage
+
+from config import settings
+from crews.context_compactor import compact_collected_data
+from utils.day_cache import content_key, get_day_cache
+from utils.exceptions import ReportCancelledException
+from utils.llm_config import get_llm
+from utils.logger import logger
+from utils.rate_limiter import get_rate_limiter
+from utils.sessions import to_local_date
+
+
+# Seconds between cancellation checks while waiting for the rate limiter
+RATE_LIMIT_POLL_SECONDS = 1.0
+
+# Top applications kept next to each summary (also the fallback when the
+# day could not be summarized)
+DAY_TOP_APPS = 5
+
+DAY_SUMMARY_PROMPT = '''Summarize one day of work activity for a weekly report.
+
+Date: {day}
+Language: {language} (zh=Chinese, en=English)
+
+In at most 200 words, cover:
+- Main tasks and projects, with the applications used
+- Concrete accomplishments (documents, code, decisions)
+- Notable conversations, blockers or context switches
+
+Use only the data below. Time statistics are precomputed in time_summary
+and activities are summarized as sessions ranked by duration.
+
+Data (JSON):
+{data}
+'''
+
+
+def use_map_reduce(collected_data: Dict[str, Any]) -> bool:
+    """
+    Decide whether to summarize the collected data per day first.
+
+    Follows ``settings.MAP_REDUCE_MODE``: "on", "off", or "auto" (from
+    ``settings.MAP_REDUCE_MIN_ACTIVITIES`` activities).
+
+    Args:
+        collected_data: Output of the data collection stage
+
+    Returns:
+        True if the map step should run
+    """
+    mode = settings.MAP_REDUCE_MODE.lower()
+    if mode == "on":
+        return True
+    if mode == "auto":
+        return len(collected_data.get("activities", [])) >= settings.MAP_REDUCE_MIN_ACTIVITIES
+    return False
+
+
+def split_by_day(collected_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Split collected data into per-day chunks.
+
+    Activities are bucketed by the local date of their timestamp, documents
+    and conversations by ``created_at``. Items without a usable timestamp
+    are left out; they are still part of the week-level data the analyst
+    receives.
+
+    Args:
+        collected_data: Output of the data collection stage
+
+    Returns:
+        Mapping of ISO date -> {activities, documents, conversations,
+        metadata}, in date order
+    """
+    days: Dict[str, Dict[str, Any]] = {}
+
+    def bucket(day: Optional[str]) -> Optional[Dict[str, Any]]:
+        if day is None:
+            return None
+        if day not in days:
+            days[day] = {
+                "activities": [],
+                "documents": [],
+                "conversations": [],
+                "metadata": {"date": day}
+            }
+        return days[day]
+
+    for source, field in (
+        ("activities", "timestamp"),
+        ("documents", "created_at"),
+        ("conversations", "created_at")
+    ):
+        for item in collected_data.get(source, []):
+            chunk = bucket(to_local_date(item.get(field)))
+            if chunk is not None:
+                chunk[source].append(item)
+
+    return {day: days[day] for day in sorted(days)}
+
+
+def summarize_day(
+    day: str,
+    day_data: Dict[str, Any],
+    language: str = "zh",
+    llm: Any = None
+) -> Dict[str, Any]:
+    """
+    Summarize one day of collected data with a single LLM call.
+
+    The day is compacted to ``settings.DAY_SUMMARY_INPUT_TOKENS`` first
+    (see crews.context_compactor). LLM errors are not raised: the result
+    then carries ``error`` and an empty summary, and the top applications
+    still describe the day.
+
+    Args:
+        day: ISO date
+        day_data: Chunk from split_by_day
+        language: Report language ("zh" or "en")
+        llm: LangChain chat model (defaults to get_llm())
+
+    Returns:
+        Dictionary with date, activities, hours, top_apps and summary
+    """
+    compacted = compact_collected_data(day_data, settings.DAY_SUMMARY_INPUT_TOKENS)
+    result = {
+        "date": day,
+        "activities": len(day_data["activities"]),
+        "hours": compacted["time_summary"].get("total_hours", 0),
+        "top_apps": [
+            {"app": app["app"], "minutes": app["minutes"]}
+            for app in compacted["apps"][:DAY_TOP_APPS]
+        ],
+        "summary": ""
+    }
+
+    prompt = DAY_SUMMARY_PROMPT.format(
+        day=day,
+        language=language,
+        data=json.dumps(compacted, ensure_ascii=False, default=str)
+    )
+
+    try:
+        llm = llm or get_llm(max_tokens=settings.DAY_SUMMARY_MAX_TOKENS)
+        response = llm.invoke([HumanMessage(content=prompt)])
+        result["summary"] = str(response.content).strip()
+    except Exception as e:
+        logger.warning(f"Daily summary failed for {day}: {e}")
+        result["error"] = str(e)
+
+    return result
+
+
+def summarize_days(
+    collected_data: Dict[str, Any],
+    language: str = "zh",
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    llm: Any = None
+) -> List[Dict[str, Any]]:
+    """
+    Map step: summarize each day in parallel.
+
+    Up to ``settings.MAP_REDUCE_WORKERS`` days are summarized at once, and
+    every call first waits on the process-wide limiter for
+    ``settings.CREW_MAX_RPM`` so the map step stays within the same request
+    budget as the crew. Successful summaries are kept in the day cache
+    (see utils.day_cache) under a key of the day's content, model and
+    prompt, so days already summarized for an earlier report are reused.
+
+    Args:
+        collected_data: Output of the data collection stage
+        language: Report language ("zh" or "en")
+        progress_callback: Called in the calling thread after each day; an
+            exception raised by it (e.g. ReportCancelledException) cancels
+            the remaining days and propagates
+        llm: LangChain chat model shared by all calls (defaults to get_llm())
+
+    Returns:
+        Daily summaries in date order (see summarize_day)
+    """
+    days = split_by_day(collected_data)
+    cache = get_day_cache()
+    summaries = []
+    keys: Dict[str, str] = {}
+
+    if cache is not None:
+        for day in list(days):
+            keys[day] = _summary_key(day, days[day], language)
+            cached = cache.get_summary(keys[day])
+            if cached is not None:
+                summaries.append(cached)
+                del days[day]
+        if summaries:
+            logger.info(f"Reusing {len(summaries)} cached daily summaries")
+
+    if not days:
+        return sorted(summaries, key=lambda summary: summary["date"])
+
+    llm = llm or get_llm(max_tokens=settings.DAY_SUMMARY_MAX_TOKENS)
+    limiter = get_rate_limiter(settings.CREW_MAX_RPM)
+    aborted = threading.Event()
+
+    def run(day: str, day_data: Dict[str, Any]) -> Dict[str, Any]:
+        while not limiter.acquire(timeout=RATE_LIMIT_POLL_SECONDS):
+            if aborted.is_set():
+                raise ReportCancelledException(f"Daily summary cancelled: {day}")
+        if aborted.is_set():
+            raise ReportCancelledException(f"Daily summary cancelled: {day}")
+        return summarize_day(day, day_data, language, llm)
+
+    logger.info(f"Summarizing {len(days)} days with up to {settings.MAP_REDUCE_WORKERS} parallel calls")
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, settings.MAP_REDUCE_WORKERS),
+        thread_name_prefix="day-summary"
+    )
+    try:
+        futures = [executor.submit(run, day, day_data) for day, day_data in days.items()]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            if cache is not None and "error" not in summary:
+                cache.put_summary(keys[summary["date"]], summary["date"], summary)
+            if progress_callback is not None:
+                progress_callback(summary)
+    except BaseException:
+        aborted.set()
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    failed = sum(1 for summary in summaries if "error" in summary)
+    if failed:
+        logger.warning(f"{failed} of {len(summaries)} daily summaries failed")
+
+    return sorted(summaries, key=lambda summary: summary["date"])
+
+
+def _summary_key(day: str, day_data: Dict[str, Any], language: str) -> str:
+    """Cache key of a daily summary: the day's content plus model and prompt."""
+    return content_key(
+        "day_summary",
+        DAY_SUMMARY_PROMPT,
+        settings.LLM_MODEL,
+        settings.LLM_TEMPERATURE,
+        settings.DAY_SUMMARY_INPUT_TOKENS,
+        settings.DAY_SUMMARY_MAX_TOKENS,
+        language,
+        day,
+        day_data
+    )
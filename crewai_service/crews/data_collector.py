@@ -0,0 +1,329 @@
+"""Data Collector - Deterministic pre-collection stage for report crews."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from config import settings
+from tools.screenpipe_tools import get_screenpipe_activities
+from tools.screenpipe_source import get_screenpipe_source
+from tools.minecontext_tools import fuse_document_results, search_minecontext_documents
+from tools.database_tools import get_conversations
+from utils.day_cache import DayCache, content_key, get_day_cache
+from utils.health_monitor import health_monitor
+from utils.logger import logger
+from utils.sessions import to_local_date
+
+
+# External service behind each collected data source
+SOURCE_SERVICES = {
+    "activities": "Screenpipe",
+    "documents": "MineContext",
+    "conversations": "Conversation Database"
+}
+
+# Health monitor service behind each HTTP-backed source
+MONITORED_SERVICES = {
+    "activities": "screenpipe",
+    "documents": "minecontext"
+}
+
+# Bump when the shape of collected activities changes, so cached days from
+# older versions are not reused
+ACTIVITY_CACHE_VERSION = 1
+
+# A past day is cached only once it ended at least this long ago, leaving
+# time for late captures to arrive
+DAY_SETTLE_SECONDS = 3600
+
+
+def collect_weekly_data(
+    start_date: str,
+    end_date: str,
+    options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Collect activities, documents and conversations for a date range.
+
+    All tool arguments are known up front, so instead of letting the
+    researcher agent spend LLM round-trips deciding to call each tool,
+    the sources are fetched directly. Screenpipe, every MineContext query
+    and the SQLite read run concurrently; each HTTP call has its own
+    timeout and the whole fan-out is bounded by
+    ``settings.COLLECTION_DEADLINE_SECONDS``, so worst-case collection
+    time is one deadline rather than the sum of all timeouts.
+
+    A source that fails or misses the deadline is reported in ``errors``
+    and contributes no data; the other sources are still returned. If
+    only some MineContext queries fail, the documents found so far are
+    kept and the source is listed in ``metadata.partial_sources``.
+    Documents found by several queries are returned once, ranked by
+    reciprocal-rank fusion and reduced to snippets (see
+    tools.minecontext_tools.fuse_document_results).
+
+    Sources whose service the background health monitor reports down are
+    not queried at all and are listed in ``errors`` right away.
+
+    Activities of complete past days are kept in the day cache (see
+    utils.day_cache). Days at the start of the range that are already
+    cached are not fetched again, so sliding or regenerating a week only
+    queries Screenpipe for the days it has not seen.
+
+    Args:
+        start_date: Start date (ISO 8601)
+        end_date: End date (ISO 8601)
+        options: Report options (include_activities/documents/conversations)
+
+    Returns:
+        Dictionary with activities, documents, conversations, metadata
+        and per-source errors
+    """
+    started = time.time()
+
+    include_activities = options.get('include_activities', True)
+    cache = get_day_cache() if include_activities else None
+    cached_days: List[str] = []
+    cached_activities: List[Dict[str, Any]] = []
+    activities_start: Optional[str] = start_date
+    if cache is not None:
+        cached_days, cached_activities, activities_start = _load_cached_activities(
+            cache, start_date, end_date
+        )
+
+    # Sources whose service the health monitor currently reports down are
+    # skipped instead of waiting for their timeouts
+    down = _known_down_sources()
+    skipped = {
+        source: f"{SOURCE_SERVICES[source]} is down (health monitor)"
+        for source, wanted in (
+            ("activities", include_activities and activities_start is not None),
+            ("documents", options.get('include_documents', True) and bool(settings.DOCUMENT_QUERIES))
+        )
+        if wanted and source in down
+    }
+
+    # One future per call: (source, fetch)
+    calls = []
+    if include_activities and activities_start is not None and "activities" not in skipped:
+        calls.append(("activities", lambda: get_screenpipe_activities(
+            activities_start, end_date,
+            timeout=settings.SCREENPIPE_TIMEOUT,
+            deadline=started + settings.COLLECTION_DEADLINE_SECONDS
+        )))
+    if options.get('include_documents', True) and "documents" not in skipped:
+        for query in settings.DOCUMENT_QUERIES:
+            calls.append(("documents", lambda query=query: (query, search_minecontext_documents(
+                query, start_date, end_date, timeout=settings.MINECONTEXT_TIMEOUT
+            ))))
+    if options.get('include_conversations', True):
+        calls.append(("conversations", lambda: get_conversations(start_date, end_date)))
+
+    requested = sorted(
+        {source for source, _ in calls}
+        | set(skipped)
+        | ({"activities"} if cached_days else set())
+    )
+    results: Dict[str, List[List[Dict[str, Any]]]] = {source: [] for source in requested}
+    failures: Dict[str, List[str]] = {source: [] for source in requested}
+    for source, reason in skipped.items():
+        logger.warning(f"Skipping {source}: {reason}")
+        failures[source].append(reason)
+    if cached_days:
+        results["activities"].append(cached_activities)
+
+    if calls:
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="collector")
+        futures = {executor.submit(fetch): source for source, fetch in calls}
+        done, not_done = wait(futures, timeout=settings.COLLECTION_DEADLINE_SECONDS)
+
+        # Walk futures in submission order so merged results are deterministic
+        for future, source in futures.items():
+            if future not in done:
+                continue
+            try:
+                results[source].append(future.result())
+            except Exception as e:
+                logger.warning(f"Data collection failed for {source}: {e}")
+                failures[source].append(str(e))
+
+        for future in not_done:
+            source = futures[future]
+            future.cancel()
+            failures[source].append(
+                f"deadline of {settings.COLLECTION_DEADLINE_SECONDS}s exceeded"
+            )
+
+        # Don't wait for stragglers; their own request timeouts end them
+        executor.shutdown(wait=False, cancel_futures=True)
+        if not_done:
+            logger.warning(
+                f"Collection deadline exceeded for: "
+                f"{', '.join(sorted({futures[f] for f in not_done}))}"
+            )
+
+    errors = {
+        source: "; ".join(messages)
+        for source, messages in failures.items()
+        if messages and not results[source]
+    }
+    partial_sources = sorted(
+        source for source, messages in failures.items()
+        if messages and results[source]
+    )
+
+    activities = _flatten(results.get("activities", []))
+    if cache is not None and activities_start is not None and not failures["activities"]:
+        _store_activities(cache, activities[len(cached_activities):], activities_start, end_date)
+    # Per-query batches are (query, results); fused by reciprocal rank and
+    # reduced to snippets
+    documents = fuse_document_results(dict(results.get("documents", [])))
+    conversations = _flatten(results.get("conversations", []))
+
+    duration = time.time() - started
+    logger.info(
+        f"Collected {len(activities)} activities, {len(documents)} documents, "
+        f"{len(conversations)} conversations in {duration:.2f}s"
+        + (f" (failed: {', '.join(sorted(errors))})" if errors else "")
+    )
+
+    return {
+        "activities": activities,
+        "documents": documents,
+        "conversations": conversations,
+        "metadata": {
+            "total_activities": len(activities),
+            "total_documents": len(documents),
+            "total_conversations": len(conversations),
+            "date_range": f"{start_date} to {end_date}",
+            "collection_seconds": round(duration, 2),
+            "requested_sources": requested,
+            "partial_sources": partial_sources,
+            "cached_days": cached_days
+        },
+        "errors": errors
+    }
+
+
+def all_sources_failed(collected_data: Dict[str, Any]) -> bool:
+    """
+    Check whether every requested source failed.
+
+    Args:
+        collected_data: Output of collect_weekly_data
+
+    Returns:
+        True if at least one source was requested and none returned data
+    """
+    requested = collected_data["metadata"]["requested_sources"]
+    return bool(requested) and all(source in collected_data["errors"] for source in requested)
+
+
+def _flatten(batches: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Concatenate result batches."""
+    return [item for batch in batches for item in batch]
+
+
+def _known_down_sources() -> Set[str]:
+    """Sources whose service the health monitor reports down."""
+    down = {
+        source for source, service in MONITORED_SERVICES.items()
+        if health_monitor.is_known_down(service)
+    }
+    # Activities read from the local database don't depend on the API
+    if "activities" in down and get_screenpipe_source().name != "http":
+        down.discard("activities")
+    return down
+
+
+def _activity_fingerprint() -> str:
+    """Identify where activities come from and how they were filtered."""
+    return content_key(
+        "activities",
+        ACTIVITY_CACHE_VERSION,
+        settings.SCREENPIPE_URL,
+        settings.SCREENPIPE_DB_PATH,
+        settings.SENSITIVE_KEYWORDS,
+        settings.SECRET_DETECTORS,
+        settings.EXCLUDED_APPS
+    )
+
+
+def _complete_days(start_date: str, end_date: str) -> List[str]:
+    """
+    Days fully inside [start_date, end_date) that have settled.
+
+    Only a range starting at local midnight is split into days; otherwise
+    the first day would be partial and nothing can be cached.
+    """
+    start = datetime.fromisoformat(start_date)
+    if start.time() != datetime.min.time():
+        return []
+
+    end_ts = datetime.fromisoformat(end_date).timestamp()
+    settled_ts = time.time() - DAY_SETTLE_SECONDS
+    days = []
+    day = start.date()
+    while True:
+        day_end = datetime.combine(day + timedelta(days=1), datetime.min.time(), start.tzinfo)
+        if day_end.timestamp() > min(end_ts, settled_ts):
+            return days
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+
+
+def _load_cached_activities(
+    cache: DayCache,
+    start_date: str,
+    end_date: str
+) -> Tuple[List[str], List[Dict[str, Any]], Optional[str]]:
+    """
+    Load the cached leading days of the range.
+
+    Returns:
+        (cached days, their activities, start of the range still to fetch
+        or None if everything is cached)
+    """
+    fingerprint = _activity_fingerprint()
+    days: List[str] = []
+    activities: List[Dict[str, Any]] = []
+
+    for day in _complete_days(start_date, end_date):
+        items = cache.get_day_data("activities", day, fingerprint)
+        if items is None:
+            break
+        days.append(day)
+        activities.extend(items)
+
+    if not days:
+        return [], [], start_date
+
+    logger.info(f"Reusing cached activities for {len(days)} days ({days[0]} to {days[-1]})")
+
+    next_day = date.fromisoformat(days[-1]) + timedelta(days=1)
+    next_start = datetime.combine(next_day, datetime.min.time(), datetime.fromisoformat(start_date).tzinfo)
+    if next_start.timestamp() >= datetime.fromisoformat(end_date).timestamp():
+        return days, activities, None
+    return days, activities, next_start.isoformat()
+
+
+def _store_activities(
+    cache: DayCache,
+    activities: List[Dict[str, Any]],
+    start_date: str,
+    end_date: str
+):
+    """Cache the fetched activities of every complete day in the range."""
+    days = _complete_days(start_date, end_date)
+    if not days:
+        return
+
+    by_day: Dict[str, List[Dict[str, Any]]] = {day: [] for day in days}
+    for activity in activities:
+        day = to_local_date(activity.get("timestamp"))
+        if day in by_day:
+            by_day[day].append(activity)
+
+    fingerprint = _activity_fingerprint()
+    for day, items in by_day.items():
+        cache.put_day_data("activities", day, fingerprint, items)
@@ -0,0 +1,209 @@
+"""Execution Registry - Thread-safe per-execution state for crew runs."""
+
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from utils.logger import logger
+
+
+class CrewExecution:
+    """State of a single crew execution (one report generation)."""
+
+    def __init__(self, execution_id: str, steps: List[str], description: str = ""):
+        """
+        Initialize an execution record.
+
+        Args:
+            execution_id: Job or report identifier
+            steps: Ordered human-readable step names (one per crew task)
+            description: Free-form label, e.g. the date range
+        """
+        self.execution_id = execution_id
+        self.steps = steps
+        self.description = description
+        self.status = "in_progress"
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.completed_steps = 0
+        self.last_activity_at = self.started_at
+        self.cancel_requested = False
+
+    @property
+    def current_step(self) -> str:
+        """Name of the step currently executing."""
+        if self.status != "in_progress":
+            return self.status
+        if self.completed_steps < len(self.steps):
+            return self.steps[self.completed_steps]
+        return "Finalizing"
+
+    @property
+    def progress(self) -> int:
+        """Completion percentage based on finished steps."""
+        if self.status == "completed":
+            return 100
+        if not self.steps:
+            return 0
+        # Reserve the last percent for post-processing after the final task
+        return min(99, int(self.completed_steps * 100 / len(self.steps)))
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the execution started (or its total duration)."""
+        end = self.finished_at or time.time()
+        return end - self.started_at
+
+    def estimated_time_remaining(self) -> Optional[int]:
+        """Linear extrapolation from completed steps, in seconds."""
+        if self.status != "in_progress" or self.completed_steps == 0:
+            return None
+        per_step = self.elapsed_seconds / self.completed_steps
+        remaining_steps = max(0, len(self.steps) - self.completed_steps)
+        return int(per_step * remaining_steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize execution state for status endpoints."""
+        return {
+            "execution_id": self.execution_id,
+            "status": self.status,
+            "progress": self.progress,
+            "current_step": self.current_step,
+            "completed_steps": self.completed_steps,
+            "total_steps": len(self.steps),
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "estimated_time_remaining": self.estimated_time_remaining(),
+            "description": self.description
+        }
+
+
+class ExecutionRegistry:
+    """
+    Registry of crew executions keyed by job/report id.
+
+    Replaces the single ``current_crew`` / ``execution_start_time`` pair
+    that used to live on CrewManager, so overlapping report generations
+    each keep their own timing and progress.
+
+    State is per process: with ``WORKERS > 1`` a job is only visible to
+    the uvicorn worker that is running it.
+    """
+
+    def __init__(self, max_finished: int = 100):
+        """
+        Initialize the registry.
+
+        Args:
+            max_finished: Number of finished executions kept for lookups
+        """
+        self.max_finished = max_finished
+        self._executions: Dict[str, CrewExecution] = {}
+        self._lock = threading.Lock()
+
+    def start(self, execution_id: str, steps: List[str], description: str = "") -> CrewExecution:
+        """
+        Register a new execution.
+
+        Args:
+            execution_id: Job or report identifier
+            steps: Ordered step names
+            description: Free-form label
+
+        Returns:
+            The registered execution
+        """
+        execution = CrewExecution(execution_id, steps, description)
+        with self._lock:
+            previous = self._executions.get(execution_id)
+            if previous is not None and previous.cancel_requested:
+                # Cancellation may arrive before the execution starts
+                execution.cancel_requested = True
+            self._executions[execution_id] = execution
+            self._evict_finished()
+        return execution
+
+    def step_completed(self, execution_id: str) -> Optional[CrewExecution]:
+        """
+        Mark the current step of an execution as completed.
+
+        Args:
+            execution_id: Execution identifier
+
+        Returns:
+            The updated execution, or None if unknown
+        """
+        with self._lock:
+            execution = self._executions.get(execution_id)
+            if execution is None:
+                return None
+            execution.completed_steps = min(len(execution.steps), execution.completed_steps + 1)
+            execution.last_activity_at = time.time()
+
+        logger.info(
+            f"[{execution_id}] Step {execution.completed_steps}/{len(execution.steps)} "
+            f"completed ({execution.elapsed_seconds:.1f}s elapsed)"
+        )
+        return execution
+
+    def touch(self, execution_id: str):
+        """Record agent activity (used by step callbacks)."""
+        with self._lock:
+            execution = self._executions.get(execution_id)
+            if execution is not None:
+                execution.last_activity_at = time.time()
+
+    def finish(self, execution_id: str, status: str = "completed"):
+        """
+        Move an execution into a terminal state.
+
+        Args:
+            execution_id: Execution identifier
+            status: completed, fallback (no crew ran, fallback report
+                returned), failed, or cancelled
+        """
+        with self._lock:
+            execution = self._executions.get(execution_id)
+            if execution is not None:
+                execution.status = status
+                execution.finished_at = time.time()
+
+    def request_cancel(self, execution_id: str):
+        """
+        Flag an execution for cooperative cancellation.
+
+        Unknown ids are recorded too, so a cancel that races ahead of
+        ``start`` is still honored.
+        """
+        with self._lock:
+            execution = self._executions.get(execution_id)
+            if execution is None:
+                execution = CrewExecution(execution_id, [])
+                execution.status = "cancelled"
+                execution.finished_at = time.time()
+                self._executions[execution_id] = execution
+            execution.cancel_requested = True
+
+    def is_cancel_requested(self, execution_id: str) -> bool:
+        """Check whether cancellation was requested for an execution."""
+        with self._lock:
+            execution = self._executions.get(execution_id)
+            return execution is not None and execution.cancel_requested
+
+    def get(self, execution_id: str) -> Optional[CrewExecution]:
+        """Look up an execution by id."""
+        with self._lock:
+            return self._executions.get(execution_id)
+
+    def active(self) -> List[CrewExecution]:
+        """List executions that are still running."""
+        with self._lock:
+            return [e for e in self._executions.values() if e.status == "in_progress"]
+
+    def _evict_finished(self):
+        """Drop the oldest finished executions. Caller must hold the lock."""
+        finished = sorted(
+            (e for e in self._executions.values() if e.status != "in_progress"),
+            key=lambda e: e.finished_at or e.started_at
+        )
+        for execution in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._executions[execution.execution_id]
@@ -0,0 +1,264 @@
+"""Report Job Queue - Runs report generations on a bounded worker pool."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from crews.crew_manager import CrewManager
+from utils.logger import logger
+from utils.exceptions import ReportCancelledException
+
+
+# Job states (mirrors api.schemas.ReportStatus.status)
+JOB_PENDING = "pending"
+JOB_IN_PROGRESS = "in_progress"
+JOB_COMPLETED = "completed"
+JOB_FALLBACK = "fallback"  # sources unavailable; result is the fallback report
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FALLBACK, JOB_FAILED, JOB_CANCELLED)
+
+
+class ReportJob:
+    """A single report generation job and its lifecycle state."""
+
+    def __init__(self, start_date: str, end_date: str, options: Dict[str, Any]):
+        """Initialize a pending job."""
+        self.job_id = f"job_{uuid.uuid4().hex[:12]}"
+        self.start_date = start_date
+        self.end_date = end_date
+        self.options = options
+        self.status = JOB_PENDING
+        self.current_step = "Queued"
+        self.created_at = datetime.now().isoformat()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.cancel_requested = False
+        self.future = None
+
+    def to_status(self, execution: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build a ReportStatus-compatible dictionary.
+
+        Args:
+            execution: Live execution state from the CrewManager registry,
+                used for progress while the job is running
+
+        Returns:
+            Status dictionary for the API layer
+        """
+        progress = 100 if self.status == JOB_COMPLETED else 0
+        current_step = self.current_step
+        estimated_time_remaining = None
+
+        if self.status == JOB_IN_PROGRESS and execution:
+            progress = execution["progress"]
+            if not self.cancel_requested:
+                current_step = execution["current_step"]
+            estimated_time_remaining = execution["estimated_time_remaining"]
+
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": progress,
+            "current_step": current_step,
+            "estimated_time_remaining": estimated_time_remaining,
+            "created_at": self.created_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class ReportJobQueue:
+    """
+    Queue of report generation jobs backed by a thread pool.
+
+    Crew execution is synchronous and can take minutes, so it runs on
+    worker threads instead of the event loop. The pool size bounds how
+    many crews (and therefore concurrent LLM conversations) run at once;
+    extra jobs wait in the executor queue as "pending".
+    """
+
+    def __init__(
+        self,
+        crew_manager: CrewManager,
+        max_workers: int = 2,
+        max_finished_jobs: int = 100
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            crew_manager: Manager used to run each report
+            max_workers: Maximum number of reports generated concurrently
+            max_finished_jobs: Number of finished jobs kept for status lookups
+        """
+        self.crew_manager = crew_manager
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="report-job"
+        )
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, start_date: str, end_date: str, options: Dict[str, Any]) -> ReportJob:
+        """
+        Queue a report generation job.
+
+        Args:
+            start_date: Start date (ISO 8601)
+            end_date: End date (ISO 8601)
+            options: Report options
+
+        Returns:
+            The newly created job
+        """
+        job = ReportJob(start_date, end_date, options)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_finished_jobs()
+
+        job.future = self._executor.submit(self._run_job, job)
+        logger.info(f"Queued report job {job.job_id}: {start_date} to {end_date}")
+
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        """
+        Look up a job by id.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown or already evicted
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[ReportJob]:
+        """
+        Cancel a job.
+
+        Pending jobs are removed from the queue immediately. A running crew
+        cannot be interrupted mid-call, so running jobs are flagged and the
+        crew stops at its next agent step.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        with self._lock:
+            if job.status in FINISHED_STATES:
+                return job
+
+            job.cancel_requested = True
+            if job.future is not None and job.future.cancel():
+                self._finish(job, JOB_CANCELLED, "Cancelled")
+            else:
+                job.current_step = "Cancellation requested"
+                self.crew_manager.cancel(job.job_id)
+
+        logger.info(f"Cancellation requested for report job {job_id}")
+        return job
+
+    def status(self, job: ReportJob) -> Dict[str, Any]:
+        """
+        Build the API status for a job, including live crew progress.
+
+        Args:
+            job: The job to describe
+
+        Returns:
+            ReportStatus-compatible dictionary
+        """
+        execution = None
+        if job.status == JOB_IN_PROGRESS:
+            live = self.crew_manager.executions.get(job.job_id)
+            execution = live.to_dict() if live else None
+        return job.to_status(execution)
+
+    def shutdown(self):
+        """Stop accepting jobs and cancel everything still queued."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_job(self, job: ReportJob):
+        """Execute a job on a worker thread."""
+        with self._lock:
+            if job.cancel_requested:
+                self._finish(job, JOB_CANCELLED, "Cancelled")
+                return
+            job.status = JOB_IN_PROGRESS
+            job.current_step = "Running crew workflow"
+            job.started_at = time.time()
+
+        try:
+            result = self.crew_manager.generate_report(
+                start_date=job.start_date,
+                end_date=job.end_date,
+                options=job.options,
+                execution_id=job.job_id
+            )
+        except ReportCancelledException:
+            with self._lock:
+                self._finish(job, JOB_CANCELLED, "Cancelled")
+            logger.info(f"Report job {job.job_id} cancelled while running")
+            return
+        except Exception as e:
+            logger.error(f"Report job {job.job_id} failed: {e}")
+            with self._lock:
+                job.error = {
+                    "code": "SERVICE_ERROR",
+                    "detail": str(e),
+                    "timestamp": datetime.now().isoformat()
+                }
+                self._finish(job, JOB_FAILED, "Failed")
+            return
+
+        with self._lock:
+            if job.cancel_requested:
+                self._finish(job, JOB_CANCELLED, "Cancelled")
+            elif result.get("metadata", {}).get("is_fallback"):
+                # No crew ran; keep the fallback report but report the failure
+                job.result = result
+                job.error = {
+                    "code": "SERVICE_UNAVAILABLE",
+                    "detail": result["metadata"].get("error", ""),
+                    "timestamp": datetime.now().isoformat()
+                }
+                self._finish(job, JOB_FALLBACK, "Data sources unavailable")
+            else:
+                job.result = result
+                self._finish(job, JOB_COMPLETED, "Completed")
+
+        logger.info(f"Report job {job.job_id} finished: {job.status}")
+
+    def _finish(self, job: ReportJob, status: str, step: str):
+        """Move a job into a terminal state. Caller must hold the lock."""
+        job.status = status
+        job.current_step = step
+        job.finished_at = time.time()
+
+    def _evict_finished_jobs(self):
+        """Drop the oldest finished jobs beyond the retention limit. Caller must hold the lock."""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINISHED_STATES
+        ]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
@@ -1,5 +1,8 @@
 """Weekly Report Crew - Multi-agent workflow for report generation."""
 
+import json
+from typing import Any, Callable, Dict, List, Optional
+
 from crewai import Crew, Task, Process
 from agents import (
     create_researcher_agent,
@@ -8,10 +11,34 @@ from agents import (
     create_reviewer_agent,
     create_exporter_agent
 )
+from config import settings
+from crews.context_compactor import compact_collected_data
+from tools.screenpipe_tools import compute_time_stats
+from utils.llm_config import StreamingTokenHandler
 from utils.logger import logger
+from utils.token_counter import count_tokens
+
+
+# Agent keys, one per task in execution order
+WEEKLY_REPORT_AGENTS = ["researcher", "analyst", "writer", "reviewer", "exporter"]
 
+# Human-readable step names, one per task in execution order
+WEEKLY_REPORT_STEPS = [
+    "Collecting data",
+    "Analyzing data",
+    "Writing report",
+    "Reviewing report",
+    "Exporting report"
+]
 
-def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "zh"):
+
+def create_weekly_report_tasks(
+    start_date: str,
+    end_date: str,
+    language: str = "zh",
+    token_callback: Optional[Callable[[str, str], None]] = None,
+    collected_data: Optional[Dict[str, Any]] = None
+):
     """
     Create task definitions for weekly report generation.
     
@@ -19,60 +46,81 @@ def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "
         start_date: Start date for data collection (ISO 8601)
         end_date: End date for data collection (ISO 8601)
         language: Report language ("zh" or "en")
+        token_callback: Optional ``(agent_key, token)`` callable; when given,
+            the writer and reviewer stream their output through it
+        collected_data: Output of the deterministic collection stage. When
+            given, the LLM-driven research task is skipped and the data is
+            injected into the analysis task directly.
     
     Returns:
         List of Task instances
     """
+    writer_callbacks = None
+    reviewer_callbacks = None
+    if token_callback is not None:
+        writer_callbacks = [StreamingTokenHandler(lambda token: token_callback("writer", token))]
+        reviewer_callbacks = [StreamingTokenHandler(lambda token: token_callback("reviewer", token))]
     
-    # Task 1: Data Collection
-    research_task = Task(
-        description=f'''Gather all activities and context from {start_date} to {end_date}.
-        
-        Focus on collecting:
-        1. Desktop activities from Screenpipe (apps, windows, OCR text)
-           - Use the fetch_screenpipe_activities tool
-           - Get all activities within the date range
-        
-        2. Documents created or edited from MineContext
-           - Use search_documents tool with relevant queries
-           - Search for "work", "project", "document" etc.
-        
-        3. Conversations and chat history from database
-           - Use fetch_conversations tool
-           - Get all conversations in the date range
-        
-        4. Any significant events or milestones
-        
-        Use ALL available tools to collect comprehensive data.
-        Organize the information chronologically and by category.
-        
-        Expected output structure:
-        - activities: list of desktop activities with timestamps
-        - documents: list of documents with metadata
-        - conversations: list of chat records
-        - metadata: statistics about data collection
-        ''',
-        
-        expected_output='''A structured JSON containing:
-        {{
-          "activities": [array of activity objects],
-          "documents": [array of document objects],
-          "conversations": [array of conversation objects],
-          "metadata": {{
-            "total_activities": number,
-            "total_documents": number,
-            "total_conversations": number,
-            "date_range": "{start_date} to {end_date}"
-          }}
-        }}''',
-        
-        agent=create_researcher_agent()
-    )
+    # Task 1: Data Collection (skipped when data was pre-collected)
+    research_task = None
+    if collected_data is None:
+        research_task = Task(
+            description=f'''Gather all activities and context from {start_date} to {end_date}.
+        
+            Focus on collecting:
+            1. Desktop activities from Screenpipe (apps, windows, OCR text)
+               - Use the fetch_screenpipe_activities tool
+               - Get all activities within the date range
+        
+            2. Documents created or edited from MineContext
+               - Use the search_documents_multi tool with all relevant queries
+                 at once, e.g. ["work", "project", "document"]
+               - Results are snippets; request full content only for the
+                 documents you need
+        
+            3. Conversations and chat history from database
+               - Use fetch_conversations tool
+               - Get all conversations in the date range
+        
+            4. Any significant events or milestones
+        
+            Use ALL available tools to collect comprehensive data.
+            Organize the information chronologically and by category.
+        
+            Expected output structure:
+            - activities: list of desktop activities with timestamps
+            - documents: list of documents with metadata
+            - conversations: list of chat records
+            - metadata: statistics about data collection
+            ''',
+        
+            expected_output='''A structured JSON containing:
+            {{
+              "activities": [array of activity objects],
+              "documents": [array of document objects],
+              "conversations": [array of conversation objects],
+              "metadata": {{
+                "total_activities": number,
+                "total_documents": number,
+                "total_conversations": number,
+                "date_range": "{start_date} to {end_date}"
+              }}
+            }}''',
+        
+            agent=create_researcher_agent()
+        )
     
     # Task 2: Data Analysis
+    if collected_data is not None:
+        data_section = _format_collected_data(collected_data)
+        analysis_context = []
+    else:
+        data_section = ""
+        analysis_context = [research_task]  # Depends on research task output
+    
     analysis_task = Task(
         description=f'''Analyze the collected data and extract meaningful insights.
-        
+        {data_section}        
         Calculate and identify:
         1. Total time and productive time distribution
            - Use calculate_time_stats tool on the activities
@@ -127,7 +175,7 @@ def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "
         }}''',
         
         agent=create_analyst_agent(),
-        context=[research_task]  # Depends on research task output
+        context=analysis_context
     )
     
     # Task 3: Report Writing
@@ -188,7 +236,7 @@ def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "
         Language: {language}
         Length: Approximately 800-1200 words.''',
         
-        agent=create_writer_agent(),
+        agent=create_writer_agent(callbacks=writer_callbacks),
         context=[analysis_task]  # Depends on analysis task output
     )
     
@@ -231,7 +279,7 @@ def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "
         The report should be professional, accurate, and easy to read.
         All formatting should be correct and consistent.''',
         
-        agent=create_reviewer_agent(),
+        agent=create_reviewer_agent(callbacks=reviewer_callbacks),
         context=[writing_task]  # Depends on writing task output
     )
     
@@ -279,10 +327,105 @@ def create_weekly_report_tasks(start_date: str, end_date: str, language: str = "
         context=[review_task]  # Depends on review task output
     )
     
-    return [research_task, analysis_task, writing_task, review_task, export_task]
+    tasks = [analysis_task, writing_task, review_task, export_task]
+    if research_task is not None:
+        tasks.insert(0, research_task)
+    return tasks
 
 
-def create_weekly_report_crew(start_date: str, end_date: str, language: str = "zh") -> Crew:
+def _format_collected_data(collected_data: Dict[str, Any]) -> str:
+    """
+    Render pre-collected data as a task description section.
+    
+    With ``settings.CONTEXT_TOKEN_BUDGET`` set, the data is first compacted
+    into summaries that fit the budget (see crews.context_compactor). When
+    the map step produced ``daily_summaries`` (see crews.daily_summaries),
+    they replace the activities and the analyst reduces them.
+    
+    Args:
+        collected_data: Output of the data collection stage
+    
+    Returns:
+        Text block embedding the data as JSON
+    """
+    daily_summaries = collected_data.get("daily_summaries")
+    
+    if daily_summaries:
+        payload = _reduce_payload(collected_data, daily_summaries)
+        hint = (
+            "Activities are summarized per day in daily_summaries; combine them\n"
+            "        into the weekly analysis. Week-level time statistics are\n"
+            "        precomputed in time_summary."
+        )
+    elif settings.CONTEXT_TOKEN_BUDGET > 0:
+        payload = compact_collected_data(collected_data, settings.CONTEXT_TOKEN_BUDGET)
+        compaction = payload["metadata"]["compaction"]
+        logger.info(
+            f"Compacted collected data to {compaction['tokens_used']} tokens "
+            f"(budget {compaction['token_budget']}, omitted {compaction['omitted'] or 'nothing'})"
+        )
+        hint = (
+            "Time statistics are precomputed in time_summary; activities are\n"
+            "        summarized per app and as sessions ranked by duration."
+        )
+    else:
+        payload = {
+            "activities": collected_data.get("activities", []),
+            "documents": collected_data.get("documents", []),
+            "conversations": collected_data.get("conversations", []),
+            "metadata": collected_data.get("metadata", {})
+        }
+        hint = ""
+    
+    unavailable = collected_data.get("errors") or {}
+    note = ""
+    if unavailable:
+        note = f"\n        Unavailable data sources (no data collected): {', '.join(sorted(unavailable))}\n"
+    
+    return f'''
+        The data below was already collected from Screenpipe, MineContext and
+        the conversation database. Do not try to fetch it again.
+        {hint}
+        {note}
+        Collected data (JSON):
+        {json.dumps(payload, ensure_ascii=False, default=str)}
+        '''
+
+
+def _reduce_payload(
+    collected_data: Dict[str, Any],
+    daily_summaries: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Week-level data for the reduce step, with daily summaries instead of activities."""
+    if settings.CONTEXT_TOKEN_BUDGET > 0:
+        summary_tokens = count_tokens(json.dumps(daily_summaries, ensure_ascii=False, default=str))
+        week = compact_collected_data(
+            collected_data,
+            max(0, settings.CONTEXT_TOKEN_BUDGET - summary_tokens),
+            include_sessions=False
+        )
+        week.pop("sessions")
+    else:
+        activities = collected_data.get("activities", [])
+        week = {
+            "time_summary": compute_time_stats(activities) if activities else {},
+            "documents": collected_data.get("documents", []),
+            "conversations": collected_data.get("conversations", []),
+            "metadata": collected_data.get("metadata", {})
+        }
+    
+    return {"daily_summaries": daily_summaries, **week}
+
+
+def create_weekly_report_crew(
+    start_date: str,
+    end_date: str,
+    language: str = "zh",
+    task_callback: Optional[Callable] = None,
+    step_callback: Optional[Callable] = None,
+    token_callback: Optional[Callable[[str, str], None]] = None,
+    collected_data: Optional[Dict[str, Any]] = None
+) -> Crew:
     """
     Create and configure the weekly report generation crew.
     
@@ -290,6 +433,11 @@ def create_weekly_report_crew(start_date: str, end_date: str, language: str = "z
         start_date: Start date for report (ISO 8601)
         end_date: End date for report (ISO 8601)
         language: Report language
+        task_callback: Called with each task output when a task finishes
+        step_callback: Called after every agent step (tool call or thought)
+        token_callback: Called as ``(agent_key, token)`` for streamed writer
+            and reviewer tokens
+        collected_data: Pre-collected data; skips the research task
     
     Returns:
         Configured Crew instance
@@ -297,16 +445,12 @@ def create_weekly_report_crew(start_date: str, end_date: str, language: str = "z
     logger.info(f"Creating weekly report crew: {start_date} to {end_date}")
     
     # Create tasks
-    tasks = create_weekly_report_tasks(start_date, end_date, language)
+    tasks = create_weekly_report_tasks(
+        start_date, end_date, language, token_callback, collected_data
+    )
     
-    # Create agents
-    agents = [
-        create_researcher_agent(),
-        create_analyst_agent(),
-        create_writer_agent(),
-        create_reviewer_agent(),
-        create_exporter_agent()
-    ]
+    # Reuse the agents bound to the tasks so callbacks and LLM settings match
+    agents = [task.agent for task in tasks]
     
     # Create crew
     crew = Crew(
@@ -315,7 +459,9 @@ def create_weekly_report_crew(start_date: str, end_date: str, language: str = "z
         process=Process.sequential,  # Execute tasks in order
         verbose=True,
         memory=False,  # Disable memory for Phase 3.1
-        max_rpm=100   # Rate limit
+        max_rpm=100,  # Rate limit
+        task_callback=task_callback,
+        step_callback=step_callback
     )
     
     logger.info("Weekly report crew created successfully")
@@ -4,9 +4,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from api.router import router
+from api.router import router, report_jobs
 from config import settings
 from utils.logger import logger
+from utils.data_filter import shutdown_filter_pool
+from utils.http_client import init_http_clients, close_http_clients
+from utils.health_monitor import health_monitor
 
 
 # Create FastAPI app
@@ -41,12 +44,18 @@ async def startup_event():
     logger.info(f"🔧 Debug Mode: {settings.DEBUG}")
     logger.info(f"🤖 LLM Model: {settings.LLM_MODEL}")
     logger.info("=" * 60)
+    init_http_clients()
+    await health_monitor.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler."""
     logger.info("👋 CrewAI Service shutting down...")
+    await health_monitor.stop()
+    report_jobs.shutdown()
+    shutdown_filter_pool()
+    close_http_clients()
 
 
 @app.get("/")
@@ -0,0 +1,109 @@
+"""Shared fixtures for the CrewAI service tests."""
+
+import json
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from utils.http_client import close_http_clients
+
+
+# (frame_id, timestamp, app, window, ocr_text)
+Frame = Tuple[int, str, str, str, Optional[str]]
+
+SCREENPIPE_SCHEMA = """
+CREATE TABLE frames (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    app_name TEXT,
+    window_name TEXT
+);
+CREATE INDEX idx_frames_timestamp ON frames (timestamp);
+CREATE TABLE ocr_text (
+    frame_id INTEGER NOT NULL,
+    text TEXT
+);
+"""
+
+
+def write_screenpipe_db(path: str, frames: List[Frame]) -> str:
+    """Create a database with Screenpipe's frames/ocr_text layout."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCREENPIPE_SCHEMA)
+    for frame_id, timestamp, app, window, text in frames:
+        conn.execute(
+            "INSERT INTO frames VALUES (?, ?, ?, ?)", (frame_id, timestamp, app, window)
+        )
+        if text is not None:
+            conn.execute("INSERT INTO ocr_text VALUES (?, ?)", (frame_id, text))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def screenpipe_db(tmp_path) -> Callable[[List[Frame]], str]:
+    """Factory writing frames to a Screenpipe-style database under tmp_path."""
+    def build(frames: List[Frame]) -> str:
+        return write_screenpipe_db(str(tmp_path / "db.sqlite"), frames)
+    return build
+
+
+@pytest.fixture
+def http_server():
+    """
+    Factory starting a local HTTP server.
+
+    The handler receives ``(method, path, query, body)`` and returns
+    ``(status, json_payload)``. Returns the server's base URL.
+    """
+    servers = []
+
+    def start(handle: Callable[[str, str, Dict[str, List[str]], Any], Tuple[int, Any]]) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse connections
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, method: str):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, payload = handle(method, parts.path, parse_qs(parts.query), body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_clients():
+    """Give every test its own connection pools and circuit breakers."""
+    close_http_clients()
+    yield
+    close_http_clients()
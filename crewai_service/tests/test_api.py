@@ -0,0 +1,231 @@
+"""Tests for the API routes."""
+
+import asyncio
+import importlib
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+pytest.importorskip("crewai_tools")
+
+from fastapi.testclient import TestClient
+
+from crews.weekly_report import WEEKLY_REPORT_AGENTS, WEEKLY_REPORT_STEPS
+from main import app
+from utils.exceptions import ReportCancelledException, ServiceUnavailableException
+from utils.health_monitor import HealthMonitor
+
+# api/__init__ re-exports the APIRouter as ``api.router``, shadowing the module
+router_module = importlib.import_module("api.router")
+
+
+REQUEST = {"start_date": "2025-11-03", "end_date": "2025-11-09", "options": {"language": "en"}}
+
+RESULT = {"report_id": "report_1", "content": "# Weekly report", "metadata": {"word_count": 3}}
+
+
+def _parse_sse(body):
+    """Split an SSE body into (event, data) pairs; comments become ("comment", text)."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        if block.startswith(":"):
+            events.append(("comment", block[1:].strip()))
+            continue
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def client():
+    # Without the context manager the startup handlers (health monitor) don't run
+    return TestClient(app)
+
+
+@pytest.fixture
+def generate(monkeypatch):
+    """Replace the crew run behind the API with a function of its kwargs."""
+    def install(fake):
+        monkeypatch.setattr(router_module.crew_manager, "generate_report", fake)
+    return install
+
+
+def test_stream_emits_events_in_order(client, generate):
+    def fake(start_date, end_date, options, execution_id, event_callback):
+        assert (start_date, end_date, options["language"]) == ("2025-11-03", "2025-11-09", "en")
+        event_callback("task_start", {"task": "writer", "index": 2})
+        event_callback("token", {"task": "writer", "token": "# Weekly"})
+        event_callback("token", {"task": "writer", "token": " report"})
+        event_callback("task_end", {"task": "writer", "index": 2, "output": "# Weekly report"})
+        return RESULT
+
+    generate(fake)
+
+    response = client.post("/api/weekly-report/generate/stream", json=REQUEST)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-accel-buffering"] == "no"
+    events = _parse_sse(response.text)
+    assert [event for event, _ in events] == [
+        "start", "task_start", "token", "token", "task_end", "result"
+    ]
+    start = events[0][1]
+    assert start["execution_id"].startswith("stream_")
+    assert start["tasks"] == WEEKLY_REPORT_AGENTS
+    assert start["steps"] == WEEKLY_REPORT_STEPS
+    assert "".join(data["token"] for event, data in events if event == "token") == "# Weekly report"
+    assert events[-1][1]["status"] == "success"
+    assert events[-1][1]["data"] == RESULT
+
+
+@pytest.mark.parametrize("error, code, message", [
+    (ServiceUnavailableException("MineContext"), "SERVICE_ERROR", "Failed to generate report"),
+    (RuntimeError("boom"), "INTERNAL_ERROR", "An unexpected error occurred"),
+])
+def test_stream_reports_errors_as_result_event(client, generate, error, code, message):
+    def fake(**kwargs):
+        kwargs["event_callback"]("task_start", {"task": "researcher", "index": 0})
+        raise error
+
+    generate(fake)
+
+    events = _parse_sse(client.post("/api/weekly-report/generate/stream", json=REQUEST).text)
+
+    assert [event for event, _ in events] == ["start", "task_start", "result"]
+    result = events[-1][1]
+    assert result["status"] == "error"
+    assert result["message"] == message
+    assert result["data"] is None
+    assert result["error"]["code"] == code
+    assert result["error"]["detail"] == str(error)
+    assert result["error"]["timestamp"]
+
+
+def test_stream_sends_keep_alive_while_idle(client, generate, monkeypatch):
+    monkeypatch.setattr(router_module, "SSE_KEEPALIVE_SECONDS", 0.05)
+
+    def fake(**kwargs):
+        time.sleep(0.3)
+        return RESULT
+
+    generate(fake)
+
+    events = _parse_sse(client.post("/api/weekly-report/generate/stream", json=REQUEST).text)
+
+    assert events[0][0] == "start"
+    assert ("comment", "keep-alive") in events
+    assert events[-1][0] == "result"
+
+
+def test_disconnect_cancels_the_execution(generate):
+    registry = router_module.crew_manager.executions
+    finished = threading.Event()
+    seen = {}
+
+    def fake(execution_id, event_callback, **kwargs):
+        seen["execution_id"] = execution_id
+        registry.start(execution_id, list(WEEKLY_REPORT_STEPS))
+        event_callback("task_start", {"task": "researcher", "index": 0})
+        try:
+            # Stand-in for the crew checking for cancellation at each step
+            deadline = time.monotonic() + 5
+            while not registry.is_cancel_requested(execution_id):
+                if time.monotonic() > deadline:
+                    raise AssertionError("execution was not cancelled")
+                time.sleep(0.01)
+            registry.finish(execution_id, "cancelled")
+            raise ReportCancelledException("cancelled")
+        finally:
+            finished.set()
+
+    generate(fake)
+
+    async def run():
+        sent = []
+        first_event = asyncio.Event()
+        body = json.dumps(REQUEST).encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            # The client goes away once the first events have arrived
+            await first_event.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and b"task_start" in message.get("body", b""):
+                first_event.set()
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/weekly-report/generate/stream",
+            "raw_path": b"/api/weekly-report/generate/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json"), (b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+        while not finished.is_set():
+            await asyncio.sleep(0.01)
+        return b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+    body = asyncio.run(run()).decode()
+
+    assert "event: result" not in body
+    assert [event for event, _ in _parse_sse(body)] == ["start", "task_start"]
+    execution = registry.get(seen["execution_id"])
+    assert execution.cancel_requested
+    assert execution.status == "cancelled"
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """Fresh health monitor whose probes are counted instead of sent."""
+    fake = HealthMonitor({"screenpipe": "http://screenpipe", "minecontext": "http://minecontext"})
+    fake.probes = []
+
+    def probe(url):
+        fake.probes.append(url)
+        return True, 5.0
+
+    monkeypatch.setattr(fake, "_probe", probe)
+    monkeypatch.setattr(router_module, "health_monitor", fake)
+    return fake
+
+
+def test_health_is_served_from_the_monitor_snapshot(client, monitor):
+    monitor.record("screenpipe", True, 12.0)
+    monitor.record("minecontext", False, 3000.0)
+    monitor.record("minecontext", False, 3000.0)
+
+    response = client.get("/api/health")
+
+    assert response.status_code == 200
+    services = response.json()["services"]
+    assert monitor.probes == []
+    assert services["screenpipe"]["available"] is True
+    assert services["screenpipe"]["latency_ms"]["p50"] == 12.0
+    assert services["minecontext"]["known_down"] is True
+    assert services["minecontext"]["availability"] == 0.0
+    assert "llm" in services
+
+
+def test_health_probes_once_before_the_first_round(client, monitor):
+    first = client.get("/api/health").json()
+    second = client.get("/api/health").json()
+
+    assert sorted(monitor.probes) == ["http://minecontext", "http://screenpipe"]
+    assert first["services"]["screenpipe"]["available"] is True
+    assert second["services"]["minecontext"]["probes"] == 1
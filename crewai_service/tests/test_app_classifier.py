@@ -0,0 +1,76 @@
+"""Tests for the rule-based app/window classifier."""
+
+import pytest
+
+from utils.app_classifier import AppClassifier
+
+
+def test_builtin_rules():
+    classifier = AppClassifier()
+
+    assert classifier.classify("Visual Studio Code", "main.py") == "coding"
+    assert classifier.classify("Google Chrome", "github.com/org/repo") == "coding"
+    assert classifier.classify("Google Chrome", "Inbox - mail.google.com") == "communication"
+    assert classifier.classify("Google Chrome", "news") == "browsing"
+    assert classifier.classify("Slack", "general") == "communication"
+    assert classifier.classify("Finder", "Downloads") == "other"
+    assert classifier.classify("", "") == "other"
+
+
+def test_matching_is_case_insensitive_and_app_scoped():
+    classifier = AppClassifier()
+
+    assert classifier.classify("google chrome", "GITHUB.COM") == "coding"
+    # An app pattern must match the app name, not the window title
+    assert classifier.classify("Preview", "Slack export.pdf") == "other"
+
+
+def test_window_rules_win_within_a_group():
+    classifier = AppClassifier([
+        {"category": "reading", "app": "Preview"},
+        {"category": "billing", "app": "Preview", "window": "invoice"},
+    ])
+
+    assert classifier.classify("Preview", "invoice-42.pdf") == "billing"
+    assert classifier.classify("Preview", "paper.pdf") == "reading"
+
+
+def test_user_rules_override_builtin_rules():
+    classifier = AppClassifier([
+        {"category": "research", "app": "Chrome"},
+        {"category": "design", "app": "Figma"},
+    ])
+
+    # Even an app-only user rule beats the built-in browser window rules
+    assert classifier.classify("Google Chrome", "github.com/org/repo") == "research"
+    assert classifier.classify("Figma", "Mockups") == "design"
+    assert classifier.classify("Slack", "general") == "communication"
+
+
+def test_categories_and_default():
+    classifier = AppClassifier([{"category": "design", "app": "Figma"}], default_category="misc")
+
+    assert classifier.categories[0] == "design"
+    assert classifier.categories[-1] == "misc"
+    assert len(classifier.categories) == len(set(classifier.categories))
+    assert classifier.classify("Finder", "") == "misc"
+
+
+def test_lookups_are_memoized():
+    classifier = AppClassifier(cache_size=2)
+
+    for _ in range(3):
+        classifier.classify("Slack", "general")
+
+    info = classifier.classify.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.parametrize("rule", [
+    {"app": "Figma"},
+    {"category": "design"},
+    {"category": "design", "app": "Fig(ma"},
+])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        AppClassifier([rule])
@@ -0,0 +1,175 @@
+"""Tests for the per-service circuit breaker."""
+
+import pytest
+import requests
+
+from config import settings
+import utils.circuit_breaker as circuit_breaker
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from utils.http_client import get_http_client
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("minecontext", failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError, match=r"minecontext \(retry in 20s\)"):
+        breaker.before_call()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_circuit_open_error_is_a_connection_error():
+    assert issubclass(CircuitOpenError, requests.ConnectionError)
+
+
+def test_half_open_admits_a_single_probe(clock):
+    breaker = CircuitBreaker("screenpipe", reset_seconds=30)
+    _open(breaker)
+
+    clock.now += 30
+    breaker.before_call()
+
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    breaker = CircuitBreaker("screenpipe", reset_seconds=30)
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+
+    breaker.record_success(0.2)
+
+    assert breaker.stats()["state"] == CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_for_another_period(clock):
+    breaker = CircuitBreaker("screenpipe", failure_threshold=3, reset_seconds=30)
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+def test_released_probe_lets_another_through(clock):
+    breaker = CircuitBreaker("screenpipe", reset_seconds=30)
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+
+    breaker.release()
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+
+
+def test_adaptive_timeout_follows_p95_per_endpoint():
+    breaker = CircuitBreaker("minecontext", multiplier=3.0, min_timeout=1.0, min_samples=20)
+
+    for index in range(19):
+        breaker.record_success(0.5 + index * 0.01, "/search")
+    assert breaker.adaptive_timeout("/search") is None
+    assert breaker.timeout(10, "/search") == 10
+
+    breaker.record_success(0.7, "/search")
+    for _ in range(20):
+        breaker.record_success(0.1, "/health")
+
+    assert breaker.adaptive_timeout("/search") == pytest.approx(2.1)
+    assert breaker.timeout(10, "/search") == pytest.approx(2.1)
+    assert breaker.timeout(1.5, "/search") == 1.5
+    assert breaker.timeout(None, "/search") == pytest.approx(2.1)
+    # Fast endpoints never go below the floor
+    assert breaker.adaptive_timeout("/health") == 1.0
+    assert breaker.stats()["adaptive_timeouts"] == {"/search": 2.1, "/health": 1.0}
+
+
+def test_timeouts_grow_back_when_the_service_slows_down():
+    breaker = CircuitBreaker("minecontext", failure_threshold=100, min_samples=20, window=20)
+    for _ in range(20):
+        breaker.record_success(0.5, "/query")
+    assert breaker.timeout(30, "/query") == pytest.approx(1.5)
+
+    # Timed-out calls count at the time they waited; other failures don't
+    for _ in range(5):
+        breaker.record_failure(1.5, "/query")
+        breaker.record_failure()
+
+    assert breaker.timeout(30, "/query") == pytest.approx(4.5)
+
+
+def test_half_open_probe_gets_the_requested_timeout(clock):
+    breaker = CircuitBreaker("minecontext", reset_seconds=30, min_samples=20)
+    for _ in range(20):
+        breaker.record_success(0.5, "/query")
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+
+    assert breaker.timeout(30, "/query") == 30
+
+
+def test_http_client_opens_the_circuit_on_server_errors(http_server, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    calls = []
+
+    def handle(method, path, query, body):
+        calls.append(path)
+        return 503, {"detail": "overloaded"}
+
+    base_url = http_server(handle)
+    client = get_http_client()
+
+    assert client.get(f"{base_url}/api/search", timeout=5).status_code == 503
+    assert client.get(f"{base_url}/api/search", timeout=5).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{base_url}/api/search", timeout=5)
+
+    assert len(calls) == 2
+    assert client.stats()[base_url]["circuit"]["state"] == OPEN
+    # Health probes bypass the breaker
+    assert client.get(f"{base_url}/health", timeout=5, use_breaker=False).status_code == 503
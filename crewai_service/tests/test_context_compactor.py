@@ -0,0 +1,141 @@
+"""Tests for fitting collected data into a prompt token budget."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+pytest.importorskip("crewai_tools")
+
+from config import settings
+from crews.context_compactor import compact_collected_data
+from utils.token_counter import count_tokens
+
+
+BASE = datetime(2025, 11, 3, 9, 0, tzinfo=timezone.utc)
+APPS = [("Visual Studio Code", "main.py"), ("Google Chrome", "github.com"), ("Slack", "general")]
+
+
+def _activities(count):
+    activities = []
+    for index in range(count):
+        app, window = APPS[(index // 25) % len(APPS)]
+        activities.append({
+            "frame_id": index,
+            "timestamp": (BASE + timedelta(seconds=index * 10)).isoformat(),
+            "app": app,
+            "window": f"{window} {index // 100}",
+            "ocr_text": f"frame {index} " + "some captured screen text " * 5
+        })
+    return activities
+
+
+def _documents(count):
+    return [
+        {
+            "id": f"doc-{index}",
+            "title": f"Document {index}",
+            "created_at": "2025-11-04",
+            "score": index / count,
+            "content": f"document {index} body " * 100
+        }
+        for index in range(count)
+    ]
+
+
+def _conversations(count):
+    return [
+        {
+            "title": f"Conversation {index}",
+            "created_at": "2025-11-05",
+            "messages": [{"role": "user", "content": "question " * 30}] * (index % 5 + 1)
+        }
+        for index in range(count)
+    ]
+
+
+def _week(activities=3000, documents=200, conversations=60):
+    return {
+        "activities": _activities(activities),
+        "documents": _documents(documents),
+        "conversations": _conversations(conversations),
+        "metadata": {"total_activities": activities}
+    }
+
+
+def _tokens(compacted):
+    return count_tokens(json.dumps(compacted, ensure_ascii=False, default=str))
+
+
+@pytest.mark.parametrize("budget", [2000, 4000, 8000])
+def test_large_week_stays_under_budget(budget):
+    compacted = compact_collected_data(_week(), budget)
+    compaction = compacted["metadata"]["compaction"]
+
+    assert _tokens(compacted) <= budget
+    assert compaction["tokens_used"] <= budget
+    assert compaction["omitted"]["documents"] > 0
+    assert compacted["sessions"] and compacted["documents"] and compacted["conversations"]
+
+
+def test_small_week_is_kept_whole():
+    week = _week(activities=200, documents=3, conversations=2)
+
+    compacted = compact_collected_data(week, 6000)
+
+    assert compacted["metadata"]["compaction"]["omitted"] == {}
+    assert len(compacted["documents"]) == 3
+    assert len(compacted["conversations"]) == 2
+    assert len(compacted["sessions"]) == compacted["metadata"]["compaction"]["total_sessions"]
+    assert compacted["metadata"]["total_activities"] == 200
+
+
+def test_best_ranked_items_are_kept():
+    compacted = compact_collected_data(_week(), 3000)
+
+    kept_scores = [doc["score"] for doc in compacted["documents"]]
+    assert kept_scores == sorted(kept_scores, reverse=True)
+    assert kept_scores[0] == max(doc["score"] for doc in _documents(200))
+    assert all(len(doc["snippet"]) < len(_documents(1)[0]["content"]) for doc in compacted["documents"])
+
+    message_counts = [conv["messages"] for conv in compacted["conversations"]]
+    assert message_counts[0] == 5
+
+    # Longest sessions are selected, then shown in chronological order
+    starts = [session["start"] for session in compacted["sessions"]]
+    assert starts == sorted(starts)
+
+
+def test_budget_goes_elsewhere_without_sessions():
+    with_sessions = compact_collected_data(_week(), 3000)
+    without_sessions = compact_collected_data(_week(), 3000, include_sessions=False)
+
+    assert without_sessions["sessions"] == []
+    assert without_sessions["apps"] == with_sessions["apps"]
+    assert len(without_sessions["documents"]) > len(with_sessions["documents"])
+    assert _tokens(without_sessions) <= 3000
+
+
+def test_budget_below_fixed_summary_keeps_no_items():
+    compacted = compact_collected_data(_week(), 10)
+
+    assert compacted["sessions"] == compacted["documents"] == compacted["conversations"] == []
+    assert compacted["time_summary"]["total_hours"] > 0
+
+
+def test_empty_collection():
+    compacted = compact_collected_data({}, 1000)
+
+    assert compacted["time_summary"] == {}
+    assert compacted["apps"] == []
+    assert compacted["metadata"]["compaction"]["omitted"] == {}
+
+
+def test_snippet_length_follows_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_SNIPPET_TOKENS", 10)
+
+    compacted = compact_collected_data(_week(activities=10, documents=3, conversations=0), 6000)
+
+    assert compacted["documents"]
+    assert all(count_tokens(doc["snippet"]) <= 10 for doc in compacted["documents"])
@@ -0,0 +1,226 @@
+"""Tests for CrewManager execution tracking and cancellation."""
+
+import socket
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+pytest.importorskip("crewai_tools")
+pytest.importorskip("langchain_community")  # FakeListChatModel
+
+from crewai import Agent, Crew, Process, Task
+from langchain_community.chat_models.fake import FakeListChatModel
+
+import crews.crew_manager as crew_manager_module
+import crews.data_collector as data_collector
+import tools.minecontext_tools as minecontext_tools
+from config import settings
+from crews.crew_manager import CrewManager
+from crews.data_collector import all_sources_failed, collect_weekly_data
+from crews.execution_registry import ExecutionRegistry
+from tools.screenpipe_tools import compute_time_stats
+from utils.exceptions import ReportCancelledException
+
+
+def test_registry_tracks_steps_and_progress():
+    registry = ExecutionRegistry()
+    execution = registry.start("job_1", ["Collect", "Analyze", "Write", "Review"])
+
+    assert execution.current_step == "Collect"
+    assert execution.progress == 0
+
+    registry.step_completed("job_1")
+    registry.step_completed("job_1")
+
+    assert execution.current_step == "Write"
+    assert execution.progress == 50
+    assert execution.estimated_time_remaining() is not None
+    assert [e.execution_id for e in registry.active()] == ["job_1"]
+
+    registry.finish("job_1")
+
+    assert execution.progress == 100
+    assert registry.active() == []
+
+
+def test_registry_cancel_before_start_is_honored():
+    registry = ExecutionRegistry()
+
+    registry.request_cancel("job_1")
+    assert registry.get("job_1").status == "cancelled"
+
+    registry.start("job_1", ["Collect"])
+
+    assert registry.is_cancel_requested("job_1")
+    assert registry.get("job_1").status == "in_progress"
+    assert not registry.is_cancel_requested("job_2")
+
+
+def test_registry_evicts_oldest_finished_executions():
+    registry = ExecutionRegistry(max_finished=1)
+    for execution_id in ("job_1", "job_2"):
+        registry.start(execution_id, ["Collect"])
+        registry.finish(execution_id)
+
+    registry.start("job_3", ["Collect"])
+
+    assert registry.get("job_1") is None
+    assert registry.get("job_2") is not None
+    assert registry.get("job_3") is not None
+
+
+@pytest.fixture
+def services_down(monkeypatch, tmp_path):
+    """Point every default source at something that is not there."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    monkeypatch.setattr(settings, "SCREENPIPE_URL", dead_url)
+    monkeypatch.setattr(settings, "SCREENPIPE_BACKEND", "http")
+    monkeypatch.setattr(settings, "MINECONTEXT_URL", dead_url)
+    monkeypatch.setattr(settings, "DB_PATH", str(tmp_path / "missing.db"))
+    monkeypatch.setattr(data_collector, "get_day_cache", lambda: None)
+    monkeypatch.setattr(minecontext_tools, "get_search_cache", lambda: None)
+    monkeypatch.setattr(data_collector, "_known_down_sources", set)
+
+
+def test_fallback_report_when_all_sources_fail(services_down, monkeypatch):
+    monkeypatch.setattr(settings, "PRECOLLECT_DATA", True)
+
+    def no_crew(**kwargs):
+        raise AssertionError("crew must not run without data")
+
+    monkeypatch.setattr(crew_manager_module, "create_weekly_report_crew", no_crew)
+    manager = CrewManager()
+
+    result = manager.generate_report("2025-11-03", "2025-11-09", {"language": "en"}, "job_1")
+
+    assert result["metadata"]["is_fallback"]
+    assert result["metadata"]["unavailable_sources"] == [
+        "Screenpipe", "Conversation Database", "MineContext"
+    ]
+    assert manager.executions.get("job_1").status == "fallback"
+
+
+def test_missing_conversation_database_is_a_failed_source(services_down):
+    collected = collect_weekly_data("2025-11-03", "2025-11-09", {})
+
+    assert collected["metadata"]["requested_sources"] == ["activities", "conversations", "documents"]
+    assert "Conversation database not found" in collected["errors"]["conversations"]
+    assert all_sources_failed(collected)
+
+
+def test_report_statistics_include_tracked_time(monkeypatch):
+    # One frame per minute for two hours
+    activities = [
+        {"timestamp": f"2025-11-03T{9 + minute // 60:02d}:{minute % 60:02d}:00Z", "app": "Code"}
+        for minute in range(121)
+    ]
+    collected = {
+        "activities": activities,
+        "documents": [],
+        "conversations": [],
+        "errors": {},
+        "metadata": {"requested_sources": ["activities"], "total_activities": len(activities)}
+    }
+    monkeypatch.setattr(settings, "PRECOLLECT_DATA", True)
+    monkeypatch.setattr(settings, "MAP_REDUCE_MODE", "off")
+    monkeypatch.setattr(crew_manager_module, "collect_weekly_data", lambda *args: collected)
+
+    class ReportCrew:
+        def kickoff(self):
+            return "# Weekly report"
+
+    monkeypatch.setattr(crew_manager_module, "create_weekly_report_crew", lambda **kwargs: ReportCrew())
+
+    result = CrewManager().generate_report("2025-11-03", "2025-11-09", {"language": "en"}, "job_1")
+
+    statistics = result["statistics"]
+    assert statistics["total_activities"] == 121
+    assert statistics["total_time_hours"] == compute_time_stats(activities)["total_hours"]
+    assert statistics["total_time_hours"] >= 2
+
+
+def _fake_crew(llm, task_callback, step_callback):
+    """Two sequential tasks on a real CrewAI crew, answered by a fake LLM."""
+    agent = Agent(
+        role="Writer",
+        goal="Write",
+        backstory="Writes reports",
+        llm=llm,
+        allow_delegation=False,
+        verbose=False
+    )
+    tasks = [
+        Task(description=f"Task {index}", expected_output="Text", agent=agent)
+        for index in (1, 2)
+    ]
+    return Crew(
+        agents=[agent],
+        tasks=tasks,
+        process=Process.sequential,
+        task_callback=task_callback,
+        step_callback=step_callback
+    )
+
+
+@pytest.fixture
+def crew_with_fake_llm(monkeypatch):
+    """Patch CrewManager to run a fake two-task crew; returns the fake LLM."""
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    monkeypatch.setattr(settings, "PRECOLLECT_DATA", False)
+    llm = FakeListChatModel(responses=[
+        "Thought: I now know the final answer\nFinal Answer: first",
+        "Thought: I now know the final answer\nFinal Answer: second",
+        "Thought: I now know the final answer\nFinal Answer: unused"  # keeps .i from wrapping
+    ])
+
+    def create_crew(task_callback=None, step_callback=None, **kwargs):
+        return _fake_crew(llm, task_callback, step_callback)
+
+    monkeypatch.setattr(crew_manager_module, "create_weekly_report_crew", create_crew)
+    return llm
+
+
+def test_crew_runs_every_task_without_cancellation(crew_with_fake_llm):
+    manager = CrewManager()
+
+    result = manager.generate_report("2025-11-03", "2025-11-09", {"language": "en"}, "job_1")
+
+    assert result["content"] == "second"
+    assert crew_with_fake_llm.i == 2
+    assert manager.executions.get("job_1").status == "completed"
+
+
+def test_cancel_from_step_callback_stops_crew(crew_with_fake_llm):
+    manager = CrewManager()
+    manager.cancel("job_1")  # registered before start, picked up by start()
+
+    with pytest.raises(ReportCancelledException):
+        manager.generate_report("2025-11-03", "2025-11-09", {"language": "en"}, "job_1")
+
+    # The first agent step raised, so the second task never reached the LLM
+    assert crew_with_fake_llm.i == 1
+    assert manager.executions.get("job_1").status == "cancelled"
+    assert manager.executions.get("job_1").completed_steps == 0
+
+
+def test_cancel_from_task_callback_stops_crew(crew_with_fake_llm, monkeypatch):
+    manager = CrewManager()
+    on_task_completed = manager._on_task_completed
+
+    def cancel_after_first_task(execution_id, output, event_callback=None):
+        manager.cancel(execution_id)
+        on_task_completed(execution_id, output, event_callback)
+
+    # Steps keep running; cancellation is only seen once the task finishes
+    monkeypatch.setattr(manager, "_on_agent_step", lambda execution_id, step: None)
+    monkeypatch.setattr(manager, "_on_task_completed", cancel_after_first_task)
+
+    with pytest.raises(ReportCancelledException):
+        manager.generate_report("2025-11-03", "2025-11-09", {"language": "en"}, "job_1")
+
+    assert crew_with_fake_llm.i == 1
+    assert manager.executions.get("job_1").status == "cancelled"
+    assert manager.executions.get("job_1").completed_steps == 1
@@ -0,0 +1,173 @@
+"""Tests for per-day map-reduce summarization."""
+
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+pytest.importorskip("crewai_tools")
+
+import crews.daily_summaries as daily_summaries
+from config import settings
+from crews.daily_summaries import split_by_day, summarize_days, use_map_reduce
+from utils.day_cache import DayCache
+from utils.exceptions import ReportCancelledException
+from utils.rate_limiter import RateLimiter
+from utils.token_counter import count_tokens
+
+
+DAYS = ["2025-11-03", "2025-11-04", "2025-11-05"]
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Chat model stand-in answering with the date found in the prompt."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        prompt = messages[0].content
+        with self._lock:
+            self.prompts.append(prompt)
+        day = re.search(r"Date: (\S+)", prompt).group(1)
+        if day in self.fail_on:
+            raise RuntimeError("model overloaded")
+        return FakeResponse(f"  Summary of {day}  ")
+
+
+def _at(day, hour, minute=0):
+    # Daytime UTC keeps the local date the same in any nearby timezone
+    start = datetime.fromisoformat(day).replace(hour=hour, tzinfo=timezone.utc)
+    return (start + timedelta(minutes=minute)).isoformat()
+
+
+def _week():
+    activities = []
+    for index, day in enumerate(DAYS):
+        for minute in range(0, 60 * (index + 1), 2):
+            activities.append({
+                "timestamp": _at(day, 10, minute),
+                "app": "Visual Studio Code",
+                "window": "main.py",
+                "ocr_text": f"working on {day} " + "details " * 20
+            })
+    activities.append({"timestamp": None, "app": "Code"})
+    return {
+        "activities": activities,
+        "documents": [
+            {"id": "doc-1", "title": "Plan", "created_at": _at(DAYS[0], 12), "content": "plan"},
+            {"id": "doc-2", "title": "Undated", "content": "no date"}
+        ],
+        "conversations": [{"title": "Standup", "created_at": _at(DAYS[2], 12), "messages": []}],
+        "metadata": {}
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_day_cache(monkeypatch):
+    monkeypatch.setattr(daily_summaries, "get_day_cache", lambda: None)
+
+
+def test_split_by_day_buckets_every_source():
+    days = split_by_day(_week())
+
+    assert list(days) == DAYS
+    assert [len(days[day]["activities"]) for day in DAYS] == [30, 60, 90]
+    assert [doc["id"] for doc in days[DAYS[0]]["documents"]] == ["doc-1"]
+    assert days[DAYS[1]]["documents"] == []
+    assert [conv["title"] for conv in days[DAYS[2]]["conversations"]] == ["Standup"]
+    assert days[DAYS[0]]["metadata"] == {"date": DAYS[0]}
+
+
+@pytest.mark.parametrize("mode, activities, expected", [
+    ("on", 0, True),
+    ("off", 10, False),
+    ("auto", 9, False),
+    ("auto", 10, True),
+])
+def test_use_map_reduce(monkeypatch, mode, activities, expected):
+    monkeypatch.setattr(settings, "MAP_REDUCE_MODE", mode)
+    monkeypatch.setattr(settings, "MAP_REDUCE_MIN_ACTIVITIES", 10)
+
+    assert use_map_reduce({"activities": [{}] * activities}) is expected
+
+
+def test_each_day_is_summarized_once_in_date_order():
+    llm = FakeLLM()
+    progress = []
+
+    summaries = summarize_days(_week(), "en", progress_callback=progress.append, llm=llm)
+
+    assert [s["date"] for s in summaries] == DAYS
+    assert [s["summary"] for s in summaries] == [f"Summary of {day}" for day in DAYS]
+    assert [s["activities"] for s in summaries] == [30, 60, 90]
+    assert summaries[2]["hours"] > summaries[0]["hours"] > 0
+    assert summaries[0]["top_apps"][0]["app"] == "Visual Studio Code"
+    assert len(llm.prompts) == 3
+    assert sorted(s["date"] for s in progress) == DAYS
+    assert all("Language: en" in prompt for prompt in llm.prompts)
+
+
+def test_day_input_is_compacted_to_budget(monkeypatch):
+    monkeypatch.setattr(settings, "DAY_SUMMARY_INPUT_TOKENS", 500)
+    llm = FakeLLM()
+
+    summarize_days(_week(), "en", llm=llm)
+
+    for prompt in llm.prompts:
+        data = prompt.split("Data (JSON):\n", 1)[1]
+        assert count_tokens(data) <= 500
+
+
+def test_failed_day_keeps_top_apps():
+    summaries = summarize_days(_week(), "en", llm=FakeLLM(fail_on={DAYS[1]}))
+
+    failed = summaries[1]
+    assert failed["summary"] == ""
+    assert failed["error"] == "model overloaded"
+    assert failed["top_apps"]
+    assert "error" not in summaries[0] and "error" not in summaries[2]
+
+
+def test_cancellation_stops_remaining_days(monkeypatch):
+    # One call per minute: after the first day the others wait on the limiter
+    monkeypatch.setattr(daily_summaries, "get_rate_limiter", lambda rpm: RateLimiter(1))
+    monkeypatch.setattr(daily_summaries, "RATE_LIMIT_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "MAP_REDUCE_WORKERS", 2)
+    llm = FakeLLM()
+
+    def cancel(summary):
+        raise ReportCancelledException("cancelled")
+
+    with pytest.raises(ReportCancelledException):
+        summarize_days(_week(), "en", progress_callback=cancel, llm=llm)
+
+    assert len(llm.prompts) == 1
+
+
+def test_cached_summaries_are_reused(monkeypatch, tmp_path):
+    cache = DayCache(str(tmp_path / "day_cache.sqlite3"), retention_days=36500)
+    monkeypatch.setattr(daily_summaries, "get_day_cache", lambda: cache)
+    week = _week()
+
+    first = summarize_days(week, "en", llm=FakeLLM(fail_on={DAYS[1]}))
+    llm = FakeLLM()
+    second = summarize_days(week, "en", llm=llm)
+
+    # Only the failed day is summarized again
+    assert [re.search(r"Date: (\S+)", prompt).group(1) for prompt in llm.prompts] == [DAYS[1]]
+    assert second[0] == first[0] and second[2] == first[2]
+    assert second[1]["summary"] == f"Summary of {DAYS[1]}"
+
+    llm = FakeLLM()
+    summarize_days(week, "de", llm=llm)
+    assert len(llm.prompts) == 3
@@ -0,0 +1,180 @@
+"""Tests for the deterministic data collection stage."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+pytest.importorskip("crewai_tools")
+
+import crews.data_collector as data_collector
+from config import settings
+from crews.data_collector import all_sources_failed, collect_weekly_data
+from utils.day_cache import DayCache
+from utils.exceptions import ServiceUnavailableException
+
+
+START = "2025-11-03T00:00:00"
+END = "2025-11-09T23:59:59"
+
+ACTIVITIES = [
+    {"frame_id": 1, "timestamp": "2025-11-03T10:00:00", "app": "Code", "window": "main.py"},
+    {"frame_id": 2, "timestamp": "2025-11-04T10:00:00", "app": "Chrome", "window": "docs"}
+]
+
+DOCUMENTS = {
+    "work": [
+        {"id": "doc-1", "title": "Plan", "content": "Sprint plan", "score": 0.9},
+        {"id": "doc-2", "title": "Notes", "content": "Meeting notes", "score": 0.8}
+    ],
+    "meetings": [
+        {"id": "doc-2", "title": "Notes", "content": "Meeting notes", "score": 0.95}
+    ]
+}
+
+CONVERSATIONS = [{"id": 1, "title": "Standup"}]
+
+
+class Sources:
+    """Fake fetchers; set an entry to an exception (or callable) to change it."""
+
+    def __init__(self):
+        self.activities = ACTIVITIES
+        self.documents = dict(DOCUMENTS)
+        self.conversations = CONVERSATIONS
+        self.calls = []
+
+    def _result(self, value):
+        if isinstance(value, Exception):
+            raise value
+        return value() if callable(value) else value
+
+    def get_screenpipe_activities(self, start_date, end_date, **kwargs):
+        self.calls.append("activities")
+        return self._result(self.activities)
+
+    def search_minecontext_documents(self, query, start_date, end_date, **kwargs):
+        self.calls.append(f"documents:{query}")
+        return self._result(self.documents[query])
+
+    def get_conversations(self, start_date, end_date):
+        self.calls.append("conversations")
+        return self._result(self.conversations)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    fake = Sources()
+    monkeypatch.setattr(settings, "DOCUMENT_QUERIES", ["work", "meetings"])
+    monkeypatch.setattr(data_collector, "get_day_cache", lambda: None)
+    monkeypatch.setattr(data_collector, "_known_down_sources", set)
+    for name in ("get_screenpipe_activities", "search_minecontext_documents", "get_conversations"):
+        monkeypatch.setattr(data_collector, name, getattr(fake, name))
+    return fake
+
+
+def test_collects_every_source(sources):
+    data = collect_weekly_data(START, END, {})
+
+    assert data["activities"] == ACTIVITIES
+    assert data["conversations"] == CONVERSATIONS
+    # doc-2 was found by both queries and is ranked first, once
+    assert [doc["id"] for doc in data["documents"]] == ["doc-2", "doc-1"]
+    assert data["documents"][0]["queries"] == ["work", "meetings"]
+    assert data["errors"] == {}
+    assert data["metadata"]["requested_sources"] == ["activities", "conversations", "documents"]
+    assert data["metadata"]["partial_sources"] == []
+    assert data["metadata"]["total_documents"] == 2
+
+
+def test_excluded_sources_are_not_requested(sources):
+    data = collect_weekly_data(START, END, {"include_documents": False, "include_conversations": False})
+
+    assert sources.calls == ["activities"]
+    assert data["metadata"]["requested_sources"] == ["activities"]
+
+
+def test_failed_query_keeps_other_documents(sources):
+    sources.documents["meetings"] = RuntimeError("MineContext 500")
+
+    data = collect_weekly_data(START, END, {})
+
+    assert [doc["id"] for doc in data["documents"]] == ["doc-1", "doc-2"]
+    assert "documents" not in data["errors"]
+    assert data["metadata"]["partial_sources"] == ["documents"]
+
+
+def test_failed_source_is_reported_and_others_returned(sources):
+    sources.activities = ServiceUnavailableException("Screenpipe")
+    sources.documents = {query: RuntimeError("down") for query in DOCUMENTS}
+
+    data = collect_weekly_data(START, END, {})
+
+    assert data["activities"] == []
+    assert data["documents"] == []
+    assert data["conversations"] == CONVERSATIONS
+    assert data["errors"]["activities"] == "Screenpipe service is unavailable"
+    assert data["errors"]["documents"] == "down; down"
+    assert not all_sources_failed(data)
+
+
+def test_all_sources_failed(sources):
+    sources.activities = ServiceUnavailableException("Screenpipe")
+    sources.documents = {query: RuntimeError("down") for query in DOCUMENTS}
+    sources.conversations = RuntimeError("locked")
+
+    data = collect_weekly_data(START, END, {})
+
+    assert sorted(data["errors"]) == ["activities", "conversations", "documents"]
+    assert all_sources_failed(data)
+
+
+def test_deadline_bounds_collection_time(sources, monkeypatch):
+    monkeypatch.setattr(settings, "COLLECTION_DEADLINE_SECONDS", 0.2)
+    release = threading.Event()
+    sources.conversations = lambda: release.wait(5) and CONVERSATIONS
+    sources.documents["meetings"] = lambda: release.wait(5) and DOCUMENTS["meetings"]
+
+    started = time.monotonic()
+    try:
+        data = collect_weekly_data(START, END, {})
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 2
+    assert data["activities"] == ACTIVITIES
+    assert data["errors"] == {"conversations": "deadline of 0.2s exceeded"}
+    assert data["metadata"]["partial_sources"] == ["documents"]
+    assert [doc["id"] for doc in data["documents"]] == ["doc-1", "doc-2"]
+
+
+def test_known_down_source_is_skipped(sources, monkeypatch):
+    monkeypatch.setattr(data_collector, "_known_down_sources", lambda: {"documents"})
+
+    data = collect_weekly_data(START, END, {})
+
+    assert not any(call.startswith("documents") for call in sources.calls)
+    assert data["errors"] == {"documents": "MineContext is down (health monitor)"}
+    assert "documents" in data["metadata"]["requested_sources"]
+    assert data["activities"] == ACTIVITIES
+
+
+def test_cached_days_are_not_fetched_again(sources, monkeypatch, tmp_path):
+    cache = DayCache(str(tmp_path / "day_cache.sqlite3"), retention_days=36500)
+    monkeypatch.setattr(data_collector, "get_day_cache", lambda: cache)
+    starts = []
+
+    def get_screenpipe_activities(start_date, end_date, **kwargs):
+        starts.append(start_date)
+        return ACTIVITIES if len(starts) == 1 else []
+
+    monkeypatch.setattr(data_collector, "get_screenpipe_activities", get_screenpipe_activities)
+
+    first = collect_weekly_data(START, END, {})
+    second = collect_weekly_data(START, END, {})
+
+    # The 9th ends after END, so it is never complete and always fetched
+    assert starts == [START, "2025-11-09T00:00:00"]
+    assert first["activities"] == second["activities"] == ACTIVITIES
+    assert second["metadata"]["requested_sources"] == ["activities", "conversations", "documents"]
@@ -0,0 +1,92 @@
+"""Tests for the per-day data and summary cache."""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from utils.day_cache import DayCache, content_key
+
+
+ACTIVITIES = [
+    {"frame_id": 1, "timestamp": "2025-11-03T10:00:00", "app": "Code", "ocr_text": "naïve ✓"},
+    {"frame_id": 2, "timestamp": "2025-11-03T11:00:00", "app": "Chrome", "ocr_text": ""}
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DayCache(str(tmp_path / "cache" / "day_cache.sqlite3"), retention_days=36500)
+
+
+def test_day_data_round_trip(cache):
+    cache.put_day_data("activities", "2025-11-03", "fp-1", ACTIVITIES)
+    cache.put_day_data("activities", "2025-11-04", "fp-1", [])
+
+    assert cache.get_day_data("activities", "2025-11-03", "fp-1") == ACTIVITIES
+    # An empty day is a hit, not a miss
+    assert cache.get_day_data("activities", "2025-11-04", "fp-1") == []
+    assert cache.get_day_data("activities", "2025-11-05", "fp-1") is None
+    assert cache.get_day_data("activities", "2025-11-03", "fp-2") is None
+    assert cache.get_day_data("documents", "2025-11-03", "fp-1") is None
+
+
+def test_day_data_is_replaced(cache):
+    cache.put_day_data("activities", "2025-11-03", "fp-1", ACTIVITIES)
+    cache.put_day_data("activities", "2025-11-03", "fp-1", ACTIVITIES[:1])
+
+    assert cache.get_day_data("activities", "2025-11-03", "fp-1") == ACTIVITIES[:1]
+
+
+def test_summary_round_trip(cache):
+    summary = {"date": "2025-11-03", "summary": "Worked on the parser", "hours": 5.5}
+    key = content_key("day_summary", "2025-11-03", ACTIVITIES)
+
+    cache.put_summary(key, "2025-11-03", summary)
+
+    assert cache.get_summary(key) == summary
+    assert cache.get_summary(content_key("day_summary", "2025-11-03", ACTIVITIES[:1])) is None
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "day_cache.sqlite3")
+    DayCache(path, retention_days=36500).put_day_data("activities", "2025-11-03", "fp", ACTIVITIES)
+
+    reopened = DayCache(path, retention_days=36500)
+
+    assert reopened.get_day_data("activities", "2025-11-03", "fp") == ACTIVITIES
+
+
+def test_old_days_are_pruned_on_open(tmp_path):
+    path = str(tmp_path / "day_cache.sqlite3")
+    recent = date.today().isoformat()
+    old = (date.today() - timedelta(days=10)).isoformat()
+    cache = DayCache(path, retention_days=36500)
+    for day in (recent, old):
+        cache.put_day_data("activities", day, "fp", ACTIVITIES)
+        cache.put_summary(f"key-{day}", day, {"date": day})
+
+    reopened = DayCache(path, retention_days=5)
+
+    assert reopened.get_day_data("activities", recent, "fp") == ACTIVITIES
+    assert reopened.get_summary(f"key-{recent}") == {"date": recent}
+    assert reopened.get_day_data("activities", old, "fp") is None
+    assert reopened.get_summary(f"key-{old}") is None
+
+
+def test_payloads_are_compressed(cache):
+    items = [{"ocr_text": "the same line of text " * 50}] * 20
+
+    cache.put_day_data("activities", "2025-11-03", "fp", items)
+
+    with sqlite3.connect(cache.path) as conn:
+        stored, payload = conn.execute("SELECT items, payload FROM day_data").fetchone()
+    assert stored == 20
+    assert len(payload) < len(str(items)) / 10
+
+
+def test_content_key():
+    assert content_key("a", {"x": 1, "y": 2}) == content_key("a", {"y": 2, "x": 1})
+    assert content_key("a", [1, 2]) != content_key("a", [2, 1])
+    assert content_key("a", "b") != content_key("ab")
+    assert len(content_key()) == 64
@@ -0,0 +1,108 @@
+"""Tests for the background service health monitor."""
+
+import asyncio
+
+import pytest
+
+import utils.health_monitor as health_monitor_module
+from utils.health_monitor import HealthMonitor, _percentile
+
+
+SERVICES = {"screenpipe": "http://screenpipe", "minecontext": "http://minecontext"}
+
+
+@pytest.fixture
+def monitor():
+    return HealthMonitor(SERVICES, interval_seconds=15, window=10, down_after_failures=2)
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert _percentile(values, 50) == 50.0
+    assert _percentile(values, 95) == 95.0
+    assert _percentile(values, 99) == 99.0
+    assert _percentile([7.0], 99) == 7.0
+    assert _percentile([], 50) is None
+
+
+def test_snapshot_summarizes_the_probe_window(monitor):
+    for latency in range(1, 21):
+        monitor.record("screenpipe", True, float(latency))
+    monitor.record("screenpipe", False, 3000.0)
+
+    status = monitor.snapshot()["screenpipe"]
+
+    # The window keeps the last 10 probes: latencies 12..20 and one failure
+    assert status["probes"] == 10
+    assert status["availability"] == 0.9
+    assert status["latency_ms"] == {"p50": 16.0, "p95": 20.0, "p99": 20.0}
+    assert status["available"] is False
+    assert status["response_time_ms"] == 3000.0
+    assert status["url"] == "http://screenpipe"
+    assert status["consecutive_failures"] == 1
+    assert not status["known_down"]
+    assert "minecontext" not in monitor.snapshot()
+
+
+def test_failed_probes_have_no_latency_percentiles(monitor):
+    monitor.record("minecontext", False, 3000.0)
+
+    status = monitor.snapshot()["minecontext"]
+
+    assert status["availability"] == 0.0
+    assert status["latency_ms"] == {"p50": None, "p95": None, "p99": None}
+
+
+def test_known_down_after_consecutive_failures(monitor):
+    monitor.record("minecontext", True, 10.0)
+    monitor.record("minecontext", False, 3000.0)
+    assert not monitor.is_known_down("minecontext")
+
+    monitor.record("minecontext", False, 3000.0)
+    assert monitor.is_known_down("minecontext")
+    assert monitor.known_down() == {"minecontext"}
+
+    monitor.record("minecontext", True, 12.0)
+    assert not monitor.is_known_down("minecontext")
+    assert monitor.known_down() == set()
+
+
+def test_stale_results_never_count_as_down(monitor, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(health_monitor_module.time, "time", lambda: now[0])
+    monitor.record("screenpipe", False, 3000.0)
+    monitor.record("screenpipe", False, 3000.0)
+
+    now[0] += 3 * 15
+    assert monitor.is_known_down("screenpipe")
+
+    # The monitor stopped probing: its last verdict no longer holds
+    now[0] += 1
+    assert not monitor.is_known_down("screenpipe")
+    assert monitor.snapshot()["screenpipe"]["known_down"]
+    assert not monitor.is_known_down("unknown")
+
+
+def test_snapshot_is_a_copy(monitor):
+    monitor.record("screenpipe", True, 10.0)
+
+    monitor.snapshot()["screenpipe"]["available"] = False
+
+    assert monitor.snapshot()["screenpipe"]["available"] is True
+
+
+def test_probe_all_probes_every_service(http_server):
+    def handle(method, path, query, body):
+        return (200, {"status": "ok"}) if path == "/health" else (404, {})
+
+    healthy = http_server(handle)
+    broken = http_server(lambda *args: (503, {"status": "down"}))
+    monitor = HealthMonitor({"screenpipe": healthy, "minecontext": broken}, timeout=2)
+
+    asyncio.run(monitor.probe_all())
+
+    snapshot = monitor.snapshot()
+    assert snapshot["screenpipe"]["available"] is True
+    assert snapshot["screenpipe"]["latency_ms"]["p50"] is not None
+    assert snapshot["minecontext"]["available"] is False
@@ -0,0 +1,110 @@
+"""Tests for the shared keep-alive HTTP client pool."""
+
+import socket
+import threading
+
+import pytest
+import requests
+
+from utils.http_client import HttpClientPool, close_http_clients, get_http_client
+
+
+def _ok(method, path, query, body):
+    return 200, {"path": path}
+
+
+@pytest.fixture
+def pool():
+    client = HttpClientPool(pool_maxsize=4)
+    yield client
+    client.close()
+
+
+def test_repeated_calls_reuse_one_connection(pool, http_server):
+    base_url = http_server(_ok)
+
+    for path in ("/a", "/b", "/c"):
+        assert pool.get(f"{base_url}{path}", timeout=5).json() == {"path": path}
+    pool.post(f"{base_url}/d", json={"x": 1}, timeout=5)
+
+    stats = pool.stats()[base_url]
+    assert stats["requests"] == 4
+    assert stats["errors"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 3
+    assert stats["idle_connections"] == 1
+    assert stats["avg_ms"] > 0
+
+
+def test_hosts_get_separate_pools(pool, http_server):
+    first = http_server(_ok)
+    second = http_server(_ok)
+
+    pool.get(f"{first}/a", timeout=5)
+    pool.get(f"{first}/b", timeout=5)
+    pool.get(f"{second}/a", timeout=5)
+
+    stats = pool.stats()
+    assert (stats[first]["requests"], stats[first]["connections_opened"]) == (2, 1)
+    assert (stats[second]["requests"], stats[second]["connections_opened"]) == (1, 1)
+
+
+def test_concurrent_calls_open_at_most_pool_size_connections(pool, http_server):
+    base_url = http_server(_ok)
+    barrier = threading.Barrier(4)
+
+    def call():
+        barrier.wait()
+        for _ in range(5):
+            pool.get(f"{base_url}/a", timeout=5)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()[base_url]
+    assert stats["requests"] == 20
+    assert 1 <= stats["connections_opened"] <= 4
+    assert stats["connections_reused"] == 20 - stats["connections_opened"]
+
+
+def test_failed_connections_are_counted(pool):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    with pytest.raises(requests.ConnectionError):
+        pool.get(f"{dead_url}/a", timeout=5, use_breaker=False)
+
+    stats = pool.stats()[dead_url]
+    assert (stats["requests"], stats["errors"], stats["in_flight"]) == (1, 1, 0)
+    assert stats["connections_reused"] == 0
+
+
+def test_error_responses_are_requests_not_errors(pool, http_server):
+    base_url = http_server(lambda *args: (500, {"detail": "boom"}))
+
+    assert pool.get(f"{base_url}/a", timeout=5, use_breaker=False).status_code == 500
+
+    stats = pool.stats()[base_url]
+    assert (stats["requests"], stats["errors"]) == (1, 0)
+
+
+def test_close_drops_sessions_and_metrics(pool, http_server):
+    base_url = http_server(_ok)
+    pool.get(f"{base_url}/a", timeout=5)
+
+    pool.close()
+
+    assert pool.stats() == {}
+
+
+def test_shared_client_is_reused_until_closed():
+    client = get_http_client()
+
+    assert get_http_client() is client
+    close_http_clients()
+    assert get_http_client() is not client
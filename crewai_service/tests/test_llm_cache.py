@@ -0,0 +1,158 @@
+"""Tests for the on-disk LLM response cache."""
+
+import json
+import time
+
+import pytest
+
+pytest.importorskip("langchain_community")  # FakeListChatModel
+
+from langchain_community.chat_models.fake import FakeListChatModel
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from config import settings
+import utils.llm_cache as llm_cache
+from utils.llm_cache import SQLiteLLMCache, get_response_cache
+
+
+MODEL = json.dumps({"kwargs": {"model_name": "gpt-4o", "temperature": 0.2, "api_key": "one"}})
+CALL = "[('stop', None), ('n', 1)]"
+
+
+def _prompt(*contents):
+    return json.dumps([
+        {"id": ["langchain", "schema", "messages", "HumanMessage"],
+         "kwargs": {"content": content, "id": str(index)}}
+        for index, content in enumerate(contents)
+    ])
+
+
+def _llm_string(model=MODEL, call=CALL):
+    return f"{model}---{call}"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteLLMCache(str(tmp_path / "llm" / "cache.sqlite3"))
+
+
+def test_round_trip(cache):
+    generations = [Generation(text="plain", generation_info={"finish_reason": "stop"})]
+
+    assert cache.lookup(_prompt("hello"), _llm_string()) is None
+    cache.update(_prompt("hello"), _llm_string(), generations)
+
+    assert cache.lookup(_prompt("hello"), _llm_string()) == generations
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_chat_generations_keep_their_message(cache):
+    generation = ChatGeneration(message=AIMessage(content="Weekly report"))
+
+    cache.update(_prompt("hello"), _llm_string(), [generation])
+    cached = cache.lookup(_prompt("hello"), _llm_string())[0]
+
+    assert isinstance(cached, ChatGeneration)
+    assert isinstance(cached.message, AIMessage)
+    assert cached.text == "Weekly report"
+
+
+def test_key_ignores_formatting_and_irrelevant_parameters(cache):
+    cache.update(_prompt("line one\nline two"), _llm_string(), [Generation(text="x")])
+    other_key = json.dumps({"kwargs": {"model_name": "gpt-4o", "temperature": 0.2, "api_key": "two"}})
+
+    # Trailing whitespace, message ids, the API key and parameter order do not change the key
+    assert cache.lookup(_prompt("line one   \nline two\n"), _llm_string(model=other_key))
+    assert cache.lookup(_prompt("line one\nline two"), _llm_string(call="[('n', 1), ('stop', None)]"))
+
+
+@pytest.mark.parametrize("prompt, llm_string", [
+    (_prompt("line one\nline three"), _llm_string()),
+    (_prompt("line one", "line two"), _llm_string()),
+    (_prompt("line one\nline two"), _llm_string(model=MODEL.replace("0.2", "0.7"))),
+    (_prompt("line one\nline two"), _llm_string(call="[('stop', ['Observation'])]")),
+])
+def test_key_follows_response_relevant_changes(cache, prompt, llm_string):
+    cache.update(_prompt("line one\nline two"), _llm_string(), [Generation(text="x")])
+
+    assert cache.lookup(prompt, llm_string) is None
+
+
+def test_unstructured_prompts_and_llm_strings(cache):
+    cache.update(" raw prompt ", "custom model", [Generation(text="x")])
+
+    assert cache.lookup("raw prompt", "custom model")
+    assert cache.lookup("raw prompt", "other model") is None
+
+
+def test_entries_expire(cache, monkeypatch):
+    cache.ttl_seconds = 60
+    cache.update(_prompt("hello"), _llm_string(), [Generation(text="x")])
+
+    later = time.time() + 61
+    monkeypatch.setattr(llm_cache.time, "time", lambda: later)
+
+    assert cache.lookup(_prompt("hello"), _llm_string()) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    cache = SQLiteLLMCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(llm_cache.time, "time", lambda: next(clock))
+
+    cache.update(_prompt("a"), _llm_string(), [Generation(text="a")])
+    cache.update(_prompt("b"), _llm_string(), [Generation(text="b")])
+    cache.lookup(_prompt("a"), _llm_string())
+    cache.update(_prompt("c"), _llm_string(), [Generation(text="c")])
+
+    assert cache.lookup(_prompt("b"), _llm_string()) is None
+    assert cache.lookup(_prompt("a"), _llm_string())
+    assert cache.lookup(_prompt("c"), _llm_string())
+    assert cache.stats()["entries"] == 2
+
+
+def test_clear(cache):
+    cache.update(_prompt("hello"), _llm_string(), [Generation(text="x")])
+
+    cache.clear()
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteLLMCache(path).update(_prompt("hello"), _llm_string(), [Generation(text="x")])
+
+    assert SQLiteLLMCache(path).lookup(_prompt("hello"), _llm_string())[0].text == "x"
+
+
+@pytest.fixture
+def global_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    previous = get_llm_cache()
+    get_response_cache.cache_clear()
+    yield
+    get_response_cache.cache_clear()
+    set_llm_cache(previous)
+
+
+def test_chat_model_calls_are_served_from_cache(global_cache, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    cache = get_response_cache()
+    llm = FakeListChatModel(responses=["first", "second"])
+
+    answers = [llm.invoke([HumanMessage(content="Summarize the week")]).content for _ in range(2)]
+
+    assert get_llm_cache() is cache
+    assert answers == ["first", "first"]
+    assert cache.stats()["hits"] == 1
+    assert llm.invoke([HumanMessage(content="Another prompt")]).content == "second"
+
+
+def test_disabled_cache_is_not_registered(global_cache, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+    assert get_response_cache() is None
@@ -0,0 +1,214 @@
+"""Tests for the background report job queue."""
+
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+pytest.importorskip("crewai")  # crews/__init__ builds the CrewAI workflow
+
+from crews.execution_registry import ExecutionRegistry
+from crews.report_jobs import (
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_FALLBACK,
+    JOB_IN_PROGRESS,
+    JOB_PENDING,
+    ReportJobQueue
+)
+from utils.exceptions import ReportCancelledException
+
+
+class FakeCrewManager:
+    """Stands in for CrewManager; ``run`` decides what each report does."""
+
+    def __init__(self, run):
+        self.executions = ExecutionRegistry()
+        self.run = run
+        self.generated = []
+        self.cancelled = []
+
+    def generate_report(self, start_date, end_date, options, execution_id):
+        self.generated.append(execution_id)
+        self.executions.start(execution_id, steps=["Collect", "Analyze"])
+        return self.run(self, execution_id)
+
+    def cancel(self, execution_id):
+        self.cancelled.append(execution_id)
+        self.executions.request_cancel(execution_id)
+
+
+def _report(manager, execution_id):
+    manager.executions.finish(execution_id)
+    return {"report_id": execution_id, "content": "# Report", "metadata": {}}
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_queue():
+    queues = []
+
+    def build(run, **kwargs):
+        manager = FakeCrewManager(run)
+        queue = ReportJobQueue(manager, **kwargs)
+        queues.append(queue)
+        return queue, manager
+
+    yield build
+
+    for queue in queues:
+        queue.shutdown()
+
+
+def test_job_completes_with_result(make_queue):
+    queue, manager = make_queue(_report)
+
+    job = queue.submit("2025-11-03", "2025-11-09", {"language": "en"})
+    job.future.result(timeout=5)
+
+    status = queue.status(job)
+    assert status["status"] == JOB_COMPLETED
+    assert status["progress"] == 100
+    assert status["result"]["report_id"] == job.job_id
+    assert manager.generated == [job.job_id]
+
+
+def test_failed_job_reports_error(make_queue):
+    def run(manager, execution_id):
+        raise RuntimeError("boom")
+
+    queue, _ = make_queue(run)
+
+    job = queue.submit("2025-11-03", "2025-11-09", {})
+    job.future.result(timeout=5)
+
+    assert job.status == JOB_FAILED
+    assert job.error["code"] == "SERVICE_ERROR"
+    assert job.error["detail"] == "boom"
+
+
+def test_fallback_result_finishes_as_fallback(make_queue):
+    def run(manager, execution_id):
+        manager.executions.finish(execution_id, "fallback")
+        return {
+            "report_id": "fallback_1",
+            "content": "# Fallback",
+            "metadata": {"is_fallback": True, "error": "Screenpipe (timeout)"}
+        }
+
+    queue, _ = make_queue(run)
+
+    job = queue.submit("2025-11-03", "2025-11-09", {})
+    job.future.result(timeout=5)
+
+    status = queue.status(job)
+    assert status["status"] == JOB_FALLBACK
+    assert status["progress"] == 0
+    assert status["result"]["content"] == "# Fallback"
+    assert status["error"]["code"] == "SERVICE_UNAVAILABLE"
+    assert status["error"]["detail"] == "Screenpipe (timeout)"
+
+
+def test_cancel_pending_job_never_runs(make_queue):
+    release = threading.Event()
+
+    def run(manager, execution_id):
+        release.wait(5)
+        return _report(manager, execution_id)
+
+    queue, manager = make_queue(run, max_workers=1)
+    running = queue.submit("2025-11-03", "2025-11-09", {})
+    pending = queue.submit("2025-11-10", "2025-11-16", {})
+    assert pending.status == JOB_PENDING
+
+    assert queue.cancel(pending.job_id) is pending
+    assert pending.status == JOB_CANCELLED
+    assert manager.cancelled == []
+
+    release.set()
+    running.future.result(timeout=5)
+    wait([pending.future], timeout=5)
+
+    assert running.status == JOB_COMPLETED
+    assert pending.status == JOB_CANCELLED
+    assert manager.generated == [running.job_id]
+
+
+def test_cancel_running_job_stops_at_next_step(make_queue):
+    started = threading.Event()
+
+    def run(manager, execution_id):
+        # Mimics the crew's step callback polling for cancellation
+        started.set()
+        _wait_until(lambda: manager.executions.is_cancel_requested(execution_id))
+        manager.executions.finish(execution_id, "cancelled")
+        raise ReportCancelledException(execution_id)
+
+    queue, manager = make_queue(run)
+    job = queue.submit("2025-11-03", "2025-11-09", {})
+    assert started.wait(5)
+    assert job.status == JOB_IN_PROGRESS
+
+    queue.cancel(job.job_id)
+    assert queue.status(job)["current_step"] == "Cancellation requested"
+
+    job.future.result(timeout=5)
+
+    assert job.status == JOB_CANCELLED
+    assert job.result is None
+    assert manager.cancelled == [job.job_id]
+
+
+def test_cancel_after_report_finished_discards_result(make_queue):
+    finishing = threading.Event()
+    release = threading.Event()
+
+    def run(manager, execution_id):
+        finishing.set()
+        release.wait(5)
+        return _report(manager, execution_id)
+
+    queue, _ = make_queue(run)
+    job = queue.submit("2025-11-03", "2025-11-09", {})
+    assert finishing.wait(5)
+
+    queue.cancel(job.job_id)
+    release.set()
+    job.future.result(timeout=5)
+
+    assert job.status == JOB_CANCELLED
+    assert job.result is None
+
+
+def test_cancel_finished_or_unknown_job(make_queue):
+    queue, manager = make_queue(_report)
+    job = queue.submit("2025-11-03", "2025-11-09", {})
+    job.future.result(timeout=5)
+
+    assert queue.cancel(job.job_id) is job
+    assert job.status == JOB_COMPLETED
+    assert manager.cancelled == []
+    assert queue.cancel("job_unknown") is None
+
+
+def test_finished_jobs_are_evicted_beyond_limit(make_queue):
+    queue, _ = make_queue(_report, max_finished_jobs=1)
+
+    jobs = []
+    for _ in range(3):
+        job = queue.submit("2025-11-03", "2025-11-09", {})
+        job.future.result(timeout=5)
+        jobs.append(job)
+
+    # Eviction happens on submit, so the latest two are still known
+    assert queue.get(jobs[0].job_id) is None
+    assert queue.get(jobs[1].job_id) is jobs[1]
+    assert queue.get(jobs[2].job_id) is jobs[2]
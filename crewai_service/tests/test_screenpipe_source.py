@@ -0,0 +1,174 @@
+"""Tests for the Screenpipe HTTP and SQLite sources."""
+
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("crewai_tools")  # the tools package registers CrewAI tools
+
+from config import settings
+from tools.screenpipe_source import (
+    HttpScreenpipeSource,
+    ScreenpipeSource,
+    SqliteScreenpipeSource,
+    get_screenpipe_source,
+    normalize_activity
+)
+from utils.exceptions import DataCollectionException, ServiceUnavailableException
+
+
+# RFC 3339 text, as Screenpipe stores it, around the range boundaries
+FRAMES = [
+    (1, "2025-11-02T23:59:59.500000+00:00", "Code", "main.py", "before range"),
+    (2, "2025-11-03T05:59:59.999000+00:00", "Code", "main.py", "first day, too early"),
+    (3, "2025-11-03T06:00:00+00:00", "Code", "main.py", "range start"),
+    (4, "2025-11-03T12:30:00.123456789+00:00", "Chrome", "github.com", "first day"),
+    (5, "2025-11-04T09:00:00+00:00", "Slack", "general", None),
+    (6, "2025-11-05T17:59:59+00:00", "Code", "test.py", "last day"),
+    (7, "2025-11-05T18:00:00+00:00", "Code", "test.py", "range end"),
+    (8, "2025-11-05T18:00:01+00:00", "Code", "test.py", "after range"),
+    (9, "2025-11-06T08:00:00+00:00", "Code", "test.py", "next day"),
+]
+
+START = "2025-11-03T06:00:00+00:00"
+END = "2025-11-05T18:00:00+00:00"
+
+
+def _epoch(timestamp: str) -> float:
+    return datetime.fromisoformat(timestamp.replace("123456789", "123456")).timestamp()
+
+
+def _search_api(frames):
+    """Fake Screenpipe /search: epoch-second range filter with limit/offset paging."""
+    def handle(method, path, query, body):
+        if path != "/search":
+            return 404, {}
+        start, end = int(query["start_time"][0]), int(query["end_time"][0])
+        limit, offset = int(query["limit"][0]), int(query["offset"][0])
+        matching = [frame for frame in frames if start <= _epoch(frame[1]) <= end]
+        page = matching[offset:offset + limit]
+        return 200, {
+            "data": [
+                {
+                    "type": "OCR",
+                    "content": {
+                        "frame_id": frame_id,
+                        "timestamp": timestamp,
+                        "app_name": app,
+                        "window_name": window,
+                        "text": text or ""
+                    }
+                }
+                for frame_id, timestamp, app, window, text in page
+            ],
+            "pagination": {"total": len(matching)}
+        }
+    return handle
+
+
+def _frame_ids(source, start=START, end=END, batch_size=2):
+    return [
+        activity["frame_id"]
+        for batch in source.iter_activities(start, end, batch_size, timeout=5)
+        for activity in batch
+    ]
+
+
+def test_sqlite_source_matches_rfc3339_timestamps(screenpipe_db):
+    source = SqliteScreenpipeSource(screenpipe_db(FRAMES))
+
+    assert _frame_ids(source) == [3, 4, 5, 6, 7]
+
+
+def test_sqlite_and_http_sources_return_the_same_frames(screenpipe_db, http_server, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENPIPE_URL", http_server(_search_api(FRAMES)))
+    sqlite_source = SqliteScreenpipeSource(screenpipe_db(FRAMES))
+    http_source = HttpScreenpipeSource()
+
+    for start, end in [(START, END), ("2025-11-04T00:00:00+00:00", "2025-11-04T23:59:59+00:00")]:
+        assert _frame_ids(sqlite_source, start, end) == _frame_ids(http_source, start, end)
+
+
+def test_sqlite_source_rows_are_flat_activities(screenpipe_db):
+    source = SqliteScreenpipeSource(screenpipe_db(FRAMES))
+    batches = list(source.iter_activities(START, END, 10, timeout=5))
+
+    assert len(batches) == 1
+    assert batches[0][0] == {
+        "type": "OCR",
+        "frame_id": 3,
+        "timestamp": "2025-11-03T06:00:00+00:00",
+        "app": "Code",
+        "window": "main.py",
+        "ocr_text": "range start"
+    }
+    assert batches[0][2]["ocr_text"] == ""
+
+
+def test_sqlite_source_missing_database(tmp_path):
+    source = SqliteScreenpipeSource(str(tmp_path / "missing.sqlite"))
+
+    with pytest.raises(ServiceUnavailableException):
+        list(source.iter_activities(START, END, 10, timeout=5))
+
+
+def test_http_source_unreachable(monkeypatch):
+    monkeypatch.setattr(settings, "SCREENPIPE_URL", "http://127.0.0.1:9")
+
+    with pytest.raises(ServiceUnavailableException):
+        list(HttpScreenpipeSource().iter_activities(START, END, 10, timeout=1))
+
+
+def test_sqlite_source_stops_at_deadline(screenpipe_db):
+    source = SqliteScreenpipeSource(screenpipe_db(FRAMES))
+
+    with pytest.raises(DataCollectionException):
+        list(source.iter_activities(START, END, 2, timeout=5, deadline=time.time() - 1))
+
+
+def test_backend_selection(tmp_path, screenpipe_db, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENPIPE_DB_PATH", str(tmp_path / "missing.sqlite"))
+    monkeypatch.setattr(settings, "SCREENPIPE_BACKEND", "auto")
+    assert get_screenpipe_source().name == "http"
+
+    monkeypatch.setattr(settings, "SCREENPIPE_DB_PATH", screenpipe_db(FRAMES))
+    assert get_screenpipe_source().name == "sqlite"
+
+    monkeypatch.setattr(settings, "SCREENPIPE_BACKEND", "http")
+    assert get_screenpipe_source().name == "http"
+
+    monkeypatch.setattr(settings, "SCREENPIPE_BACKEND", "sqlite")
+    assert get_screenpipe_source().name == "sqlite"
+
+
+def test_incomplete_backend_fails_on_construction():
+    class IncompleteSource(ScreenpipeSource):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="iter_activities"):
+        IncompleteSource()
+
+
+def test_normalize_activity_flattens_search_results():
+    item = {
+        "type": "OCR",
+        "content": {
+            "frame_id": 1,
+            "timestamp": "2025-11-03T10:00:00Z",
+            "app_name": "Code",
+            "window_name": "main.py",
+            "text": "hello"
+        }
+    }
+    flat = {"frame_id": 1, "app": "Code"}
+
+    assert normalize_activity(item) == {
+        "type": "OCR",
+        "frame_id": 1,
+        "timestamp": "2025-11-03T10:00:00Z",
+        "app": "Code",
+        "window": "main.py",
+        "ocr_text": "hello"
+    }
+    assert normalize_activity(flat) is flat
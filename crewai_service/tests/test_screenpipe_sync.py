@@ -0,0 +1,369 @@
+"""Tests for the Screenpipe -> MineContext sync script."""
+
+import importlib.util
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import utils.app_classifier
+import utils.sessions
+from tests.conftest import write_screenpipe_db
+
+
+SYNC_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "screenpipe" / "screenpipe_sync.py"
+
+INGEST_PATH = "/api/ingest/document/write"
+
+
+def _load_sync_script():
+    spec = importlib.util.spec_from_file_location("screenpipe_sync", SYNC_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+screenpipe_sync = _load_sync_script()
+
+
+def _ago(seconds):
+    """RFC 3339 UTC timestamp, as Screenpipe stores it."""
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+
+def _text(label):
+    return f"{label}: " + "lorem ipsum dolor sit amet " * 3
+
+
+# Three finished sessions, well past the idle gap
+FRAMES = [
+    (1, _ago(3000), "Code", "main.py", _text("editing main")),
+    (2, _ago(2990), "Code", "main.py", _text("editing main more")),
+    (3, _ago(2980), "Chrome", "docs", _text("reading docs")),
+    (4, _ago(2970), "Chrome", "docs", _text("reading more docs")),
+    (5, _ago(2960), "Slack", "general", _text("chatting")),
+]
+
+
+class MineContext:
+    """Fake ingest endpoint; ``status`` maps document id prefixes to HTTP codes."""
+
+    def __init__(self):
+        self.documents = []
+        self.status = {}
+
+    def handle(self, method, path, query, body):
+        if method != "POST" or path != INGEST_PATH:
+            return 404, {}
+        for prefix, status in self.status.items():
+            if body["documentId"].startswith(prefix):
+                return status, {"detail": "rejected"}
+        self.documents.append(body)
+        return 200, {"ok": True}
+
+    @property
+    def ids(self):
+        return sorted(doc["documentId"] for doc in self.documents)
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    """The sync script pointed at a temp database, state files and fake MineContext."""
+    monkeypatch.setattr(screenpipe_sync, "SCREENPIPE_DB", str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr(screenpipe_sync, "SYNC_STATE_FILE", str(tmp_path / "state.json"))
+    monkeypatch.setattr(screenpipe_sync, "REJECTED_FILE", str(tmp_path / "rejected.jsonl"))
+    monkeypatch.setattr(screenpipe_sync, "INGEST_RETRIES", 0)
+    monkeypatch.setattr(screenpipe_sync, "_session", None)
+    yield screenpipe_sync
+    if screenpipe_sync._session is not None:
+        screenpipe_sync._session.close()
+
+
+@pytest.fixture
+def minecontext(sync, http_server, monkeypatch):
+    fake = MineContext()
+    monkeypatch.setattr(sync, "MINECONTEXT_API", http_server(fake.handle))
+    return fake
+
+
+def _state(sync):
+    with open(sync.SYNC_STATE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_initial_watermark_starts_at_lookback(sync):
+    write_screenpipe_db(sync.SCREENPIPE_DB, [
+        (1, _ago(3 * 3600), "Code", "main.py", None),
+        (2, _ago(1800), "Code", "main.py", None),
+        (3, _ago(600), "Code", "main.py", None),
+    ])
+    conn = sqlite3.connect(sync.SCREENPIPE_DB)
+
+    assert sync.initial_watermark(conn, hours=1) == 1
+    # Nothing within the lookback: start after the newest frame
+    assert sync.initial_watermark(conn, hours=0.05) == 3
+    conn.close()
+
+
+def test_recent_frames_wait_to_settle(sync):
+    write_screenpipe_db(sync.SCREENPIPE_DB, [
+        (1, _ago(120), "Code", "main.py", "a"),
+        (2, _ago(1), "Code", "main.py", "b"),
+    ])
+    conn = sync.connect_screenpipe_db()
+
+    assert [row[0] for row in sync.fetch_activities_after(conn, 0)] == [1]
+    conn.close()
+
+
+def test_sync_advances_watermark_and_is_idempotent(sync, minecontext):
+    write_screenpipe_db(sync.SCREENPIPE_DB, FRAMES)
+    sync.save_sync_state(0, None)
+
+    assert sync.sync_once() == (3, 0)
+    assert minecontext.ids == ["screenpipe_Chrome_3", "screenpipe_Code_1", "screenpipe_Slack_5"]
+    state = _state(sync)
+    assert state["last_frame_id"] == 5
+    assert state["last_timestamp"] == FRAMES[-1][1]
+    assert state["open_session_frame_id"] is None
+
+    assert sync.sync_once() == (0, 0)
+    assert len(minecontext.documents) == 3
+
+
+def test_sync_reads_in_batches(sync, minecontext, monkeypatch):
+    monkeypatch.setattr(sync, "BATCH_SIZE", 2)
+    write_screenpipe_db(sync.SCREENPIPE_DB, FRAMES)
+    sync.save_sync_state(0, None)
+
+    assert sync.sync_once() == (3, 0)
+    assert minecontext.ids == ["screenpipe_Chrome_3", "screenpipe_Code_1", "screenpipe_Slack_5"]
+    assert _state(sync)["last_frame_id"] == 5
+
+
+def test_retryable_failure_holds_watermark(sync, minecontext):
+    write_screenpipe_db(sync.SCREENPIPE_DB, FRAMES)
+    sync.save_sync_state(0, None)
+    minecontext.status = {"screenpipe_Chrome": 503}
+
+    assert sync.sync_once() == (2, 1)
+    assert _state(sync)["last_frame_id"] == 0
+
+    # The whole batch is retried; fixed document ids make it idempotent
+    minecontext.status = {}
+    assert sync.sync_once() == (3, 0)
+    assert _state(sync)["last_frame_id"] == 5
+    assert "screenpipe_Chrome_3" in minecontext.ids
+
+
+def test_rejected_document_does_not_pin_watermark(sync, minecontext):
+    write_screenpipe_db(sync.SCREENPIPE_DB, FRAMES)
+    sync.save_sync_state(0, None)
+    minecontext.status = {"screenpipe_Chrome": 422}
+
+    assert sync.sync_once() == (2, 0)
+    assert _state(sync)["last_frame_id"] == 5
+
+    with open(sync.REJECTED_FILE, encoding="utf-8") as f:
+        rejected = [json.loads(line) for line in f]
+    assert len(rejected) == 1
+    assert rejected[0]["documentId"] == "screenpipe_Chrome_3"
+    assert rejected[0]["error"] == "失败: 422"
+    assert (rejected[0]["first_frame_id"], rejected[0]["last_frame_id"]) == (3, 4)
+
+    # Rejected documents are not retried
+    assert sync.sync_once() == (0, 0)
+
+
+def _contexts(count):
+    contexts = []
+    for index in range(count):
+        contexts.append({
+            "app": "Code",
+            "window": f"file_{index}.py",
+            "start_time": _ago(600),
+            "end_time": _ago(590),
+            "first_frame_id": index * 10 + 1,
+            "last_frame_id": index * 10 + 2,
+            "frame_count": 2,
+            "duration_seconds": 10.0,
+            "merged_content": _text(f"context {index}")
+        })
+    return contexts
+
+
+def test_ingest_posts_concurrently(sync, http_server, monkeypatch):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+    received = []
+
+    def handle(method, path, query, body):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.1)
+        with lock:
+            in_flight["now"] -= 1
+            received.append(body["documentId"])
+        return 200, {}
+
+    monkeypatch.setattr(sync, "MINECONTEXT_API", http_server(handle))
+    monkeypatch.setattr(sync, "INGEST_CONCURRENCY", 4)
+
+    stats = sync.ingest_to_minecontext(_contexts(8))
+
+    assert stats["success"] == 8
+    assert stats["fail"] == stats["rejected"] == 0
+    assert stats["bytes"] > 0
+    assert sorted(received) == sorted(f"screenpipe_Code_{i * 10 + 1}" for i in range(8))
+    assert 1 < in_flight["max"] <= 4
+
+
+def test_ingest_reuses_one_pooled_session(sync, minecontext):
+    sync.ingest_to_minecontext(_contexts(2))
+    session = sync.get_session()
+    sync.ingest_to_minecontext(_contexts(2))
+
+    assert sync.get_session() is session
+    assert len(minecontext.documents) == 4
+
+
+def test_documents_carry_session_metadata(sync):
+    context = dict(_contexts(1)[0], app="Chrome", window="github.com/org/repo")
+    document = sync.build_document(context)
+
+    assert document["documentId"] == "screenpipe_Chrome_1"
+    assert document["title"] == "Chrome - github.com/org/repo"
+    assert document["metadata"]["category"] == "coding"
+    assert document["metadata"]["frame_count"] == 2
+
+
+def _page(seed, words=200):
+    """A long OCR-like text of distinct words."""
+    return " ".join(f"word{(seed * 7919 + index * 104729) % 100003}" for index in range(words))
+
+
+def test_exact_duplicates_after_whitespace_normalization(sync):
+    dedup = sync.TextDeduplicator(near_dup=False)
+
+    assert dedup.add(sync.normalize_text("  build   passed\n\nall tests "))
+    assert not dedup.add(sync.normalize_text("build passed all tests"))
+    assert dedup.add(sync.normalize_text("build failed"))
+    assert dedup.duplicates == 1
+
+
+def test_near_duplicates_are_dropped(sync):
+    text = _page(1)
+    jittered = text.replace("word", "w0rd", 1)  # one OCR character differs
+    dedup = sync.TextDeduplicator(near_dup=True)
+
+    assert dedup.add(text)
+    assert not dedup.add(jittered)
+    assert dedup.add(_page(2))
+    assert dedup.duplicates == 1
+
+    exact_only = sync.TextDeduplicator(near_dup=False)
+    exact_only.add(text)
+    assert exact_only.add(jittered)
+
+
+def test_near_duplicate_window_is_bounded(sync):
+    text = _page(1)
+    dedup = sync.TextDeduplicator(near_dup=True)
+    dedup.add(text)
+    for seed in range(2, 2 + sync.NEAR_DUP_WINDOW):
+        assert dedup.add(_page(seed))
+
+    # The first fingerprint has left the window; only exact repeats still match
+    assert dedup.add(text.replace("word", "w0rd", 1))
+    assert not dedup.add(text)
+
+
+def test_sessions_deduplicate_their_own_texts(sync):
+    repeated = sync.normalize_text(_text("static screen"))
+    new_output = sync.normalize_text(_text("new output"))
+    activities = [
+        (1, _ago(900), "Code", "main.py", repeated),
+        (2, _ago(898), "Code", "main.py", "  " + repeated),
+        (3, _ago(896), "Code", "main.py", new_output),
+        (4, _ago(894), "Chrome", "docs", repeated),
+    ]
+
+    sessions, open_session = sync.split_into_sessions(activities)
+
+    assert open_session is None
+    assert [s["duplicate_texts"] for s in sessions] == [1, 0]
+    assert sessions[0]["texts"] == [repeated, new_output]
+    # Dedup state is per session, so the same text counts again in a new one
+    assert sessions[1]["texts"] == [repeated]
+
+
+def _add_frames(sync, frames):
+    conn = sqlite3.connect(sync.SCREENPIPE_DB)
+    for frame_id, timestamp, app, window, text in frames:
+        conn.execute("INSERT INTO frames VALUES (?, ?, ?, ?)", (frame_id, timestamp, app, window))
+        conn.execute("INSERT INTO ocr_text VALUES (?, ?)", (frame_id, text))
+    conn.commit()
+    conn.close()
+
+
+def test_open_session_is_carried_across_cycles(sync, minecontext):
+    write_screenpipe_db(sync.SCREENPIPE_DB, [
+        (1, _ago(200), "Code", "main.py", _text("editing")),
+        (2, _ago(190), "Code", "main.py", _text("editing more")),
+        (3, _ago(150), "Chrome", "docs", _text("reading docs")),
+    ])
+    sync.save_sync_state(0, None)
+
+    # The Chrome session may still be going on, so it is held back
+    assert sync.sync_once() == (1, 0)
+    assert minecontext.ids == ["screenpipe_Code_1"]
+    assert _state(sync)["last_frame_id"] == 3
+    assert _state(sync)["open_session_frame_id"] == 3
+
+    _add_frames(sync, [(4, _ago(120), "Chrome", "docs", _text("reading more docs"))])
+    assert sync.sync_once() == (0, 0)
+    assert _state(sync)["last_frame_id"] == 4
+    assert _state(sync)["open_session_frame_id"] == 3
+
+    # Switching apps ends it; it is ingested once, with all of its frames
+    _add_frames(sync, [(5, _ago(90), "Slack", "general", _text("chatting"))])
+    assert sync.sync_once() == (1, 0)
+    chrome = [doc for doc in minecontext.documents if doc["documentId"] == "screenpipe_Chrome_3"]
+    assert len(chrome) == 1
+    assert chrome[0]["metadata"]["frame_count"] == 2
+    assert chrome[0]["metadata"]["last_frame_id"] == 4
+    assert _state(sync)["open_session_frame_id"] == 5
+
+
+def test_last_session_closes_when_idle_or_batch_is_full(sync):
+    activities = [
+        (1, _ago(100), "Code", "main.py", _text("editing")),
+        (2, _ago(90), "Code", "main.py", _text("editing more")),
+    ]
+
+    sessions, open_session = sync.split_into_sessions(activities)
+    assert sessions == []
+    assert open_session["first_frame_id"] == 1
+
+    # Idle for longer than the gap: the session is over
+    later = datetime.now(timezone.utc).timestamp() + sync.SESSION_IDLE_GAP
+    sessions, open_session = sync.split_into_sessions(activities, now=later)
+    assert [s["first_frame_id"] for s in sessions] == [1]
+    assert open_session is None
+
+    # A full batch holding a single session is flushed so sync keeps moving
+    sessions, open_session = sync.split_into_sessions(activities, batch_full=True)
+    assert [s["first_frame_id"] for s in sessions] == [1]
+    assert open_session is None
+
+
+def test_shared_modules_are_imported_through_the_package():
+    assert screenpipe_sync.Sessionizer is utils.sessions.Sessionizer
+    assert screenpipe_sync.AppClassifier is utils.app_classifier.AppClassifier
+    assert "sessions" not in sys.modules and "app_classifier" not in sys.modules
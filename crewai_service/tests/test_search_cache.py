@@ -0,0 +1,154 @@
+"""Tests for the MineContext search result cache."""
+
+import json
+import os
+
+import pytest
+
+import utils.search_cache as search_cache
+from utils.search_cache import SearchCache, search_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(search_cache.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    path = tmp_path / "sync_state.json"
+    stamp = [1_000_000_000_000_000_000]
+
+    def write(last_frame_id):
+        path.write_text(json.dumps({"last_frame_id": last_frame_id, "updated_at": "now"}))
+        # Distinct mtimes even on filesystems with coarse timestamps
+        stamp[0] += 1_000_000_000
+        os.utime(path, ns=(stamp[0], stamp[0]))
+
+    write.path = str(path)
+    return write
+
+
+def test_round_trip_and_stats():
+    cache = SearchCache()
+    key = search_key("vector", "work", 50, "2025-11-03", "2025-11-09")
+
+    assert cache.get(key) is None
+    cache.put(key, [{"id": "doc-1"}])
+
+    assert cache.get(key) == [{"id": "doc-1"}]
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "entries": 1,
+        "invalidations": 0,
+        "watermark": None
+    }
+
+
+def test_search_key():
+    assert search_key("vector", "  work  ", 50, "a", "b") == ("vector", "work", 50, "a", "b")
+    assert search_key("vector", "work", 50) != search_key("context", "work", 50)
+    assert search_key("vector", "work", 50) != search_key("vector", "work", 20)
+
+
+def test_entries_expire(clock):
+    cache = SearchCache(ttl_seconds=60)
+    cache.put("key", ["result"])
+
+    clock.now += 60
+    assert cache.get("key") == ["result"]
+    clock.now += 1
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_are_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_watermark_move_clears_the_cache(state_file):
+    state_file(100)
+    cache = SearchCache(watermark_path=state_file.path)
+    cache.put("key", ["result"])
+
+    # The first read of the watermark is not an invalidation
+    assert cache.get("key") == ["result"]
+    assert cache.stats()["watermark"] == 100
+    assert cache.stats()["invalidations"] == 0
+
+    state_file(150)
+
+    assert cache.get("key") is None
+    assert cache.stats()["watermark"] == 150
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_rewritten_state_with_same_watermark_keeps_entries(state_file):
+    state_file(100)
+    cache = SearchCache(watermark_path=state_file.path)
+    cache.put("key", ["result"])
+
+    state_file(100)
+
+    assert cache.get("key") == ["result"]
+    assert cache.stats()["invalidations"] == 0
+
+
+def test_state_file_is_only_parsed_when_rewritten(state_file, monkeypatch):
+    reads = []
+    read_watermark = search_cache._read_watermark
+
+    def counting_read(path):
+        reads.append(path)
+        return read_watermark(path)
+
+    monkeypatch.setattr(search_cache, "_read_watermark", counting_read)
+    state_file(100)
+    cache = SearchCache(watermark_path=state_file.path)
+
+    cache.put("key", ["result"])
+    for _ in range(5):
+        cache.get("key")
+    assert len(reads) == 1
+
+    state_file(200)
+    cache.get("key")
+    assert len(reads) == 2
+
+
+def test_missing_or_broken_state_file(state_file, tmp_path):
+    cache = SearchCache(watermark_path=str(tmp_path / "missing.json"))
+    cache.put("key", ["result"])
+    assert cache.get("key") == ["result"]
+
+    state_file(100)
+    cache = SearchCache(watermark_path=state_file.path)
+    cache.put("key", ["result"])
+    with open(state_file.path, "w") as f:
+        f.write("{not json")
+    os.utime(state_file.path, ns=(1, 1))
+
+    # An unreadable watermark counts as a move: results may be stale
+    assert cache.get("key") is None
+    assert cache.stats()["watermark"] is None
@@ -0,0 +1,130 @@
+"""Tests for session segmentation of Screenpipe frames."""
+
+from datetime import datetime, timezone
+
+from utils.sessions import Sessionizer, sessionize, sort_by_timestamp, to_epoch_seconds
+
+
+BASE = datetime(2025, 11, 3, 9, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _frame(offset, app="Code", window="main.py", text=None, frame_id=None):
+    return {
+        "timestamp": datetime.fromtimestamp(BASE + offset, timezone.utc).isoformat(),
+        "app": app,
+        "window": window,
+        "ocr_text": text,
+        "frame_id": frame_id if frame_id is not None else offset
+    }
+
+
+def _summary(sessions):
+    return [(s["app"], s["window"], s["frame_count"], s["duration_seconds"]) for s in sessions]
+
+
+def test_switch_closes_session_at_the_switch():
+    frames = [
+        _frame(0),
+        _frame(10),
+        _frame(20, app="Chrome", window="docs"),
+        _frame(30, app="Chrome", window="docs")
+    ]
+
+    sessions = list(sessionize(frames))
+
+    # Each frame is credited until the next one; the last gets the tail
+    assert _summary(sessions) == [("Code", "main.py", 2, 20.0), ("Chrome", "docs", 2, 12.0)]
+    assert (sessions[0]["first_frame_id"], sessions[0]["last_frame_id"]) == (0, 10)
+    assert sessions[0]["end_ts"] == sessions[1]["start_ts"]
+
+
+def test_idle_gap_splits_and_is_not_counted():
+    frames = [_frame(0), _frame(60), _frame(60 + 301)]
+
+    sessions = list(sessionize(frames, idle_gap_seconds=300, tail_seconds=2))
+
+    assert _summary(sessions) == [("Code", "main.py", 2, 62.0), ("Code", "main.py", 1, 2.0)]
+
+
+def test_window_changes_can_stay_in_one_session():
+    frames = [_frame(0, window="a.py"), _frame(10, window="b.py"), _frame(20, window="c.py")]
+
+    assert len(list(sessionize(frames))) == 3
+    merged = list(sessionize(frames, split_on_window=False))
+    assert _summary(merged) == [("Code", "a.py", 3, 22.0)]
+
+
+def test_frames_without_app_or_timestamp_are_skipped():
+    frames = [_frame(0), {"timestamp": "not a date", "app": "Code"}, _frame(10, app=""), _frame(20)]
+
+    assert _summary(list(sessionize(frames))) == [("Code", "main.py", 2, 22.0)]
+
+
+def test_screenpipe_field_names_are_accepted():
+    frames = [{"timestamp": BASE, "app_name": "Slack", "window_name": "general"}]
+
+    assert _summary(list(sessionize(frames))) == [("Slack", "general", 1, 2.0)]
+
+
+def test_text_filter_collects_kept_texts():
+    class Unique:
+        def __init__(self):
+            self.seen = set()
+
+        def add(self, text):
+            if text in self.seen:
+                return False
+            self.seen.add(text)
+            return True
+
+    frames = [
+        _frame(0, text="a"),
+        _frame(2, text="a"),
+        _frame(4, text="b"),
+        _frame(6, app="Chrome", text="a")
+    ]
+
+    sessions = list(sessionize(frames, text_filter_factory=Unique))
+
+    assert [s["texts"] for s in sessions] == [["a", "b"], ["a"]]
+    assert [s["duplicate_texts"] for s in sessions] == [1, 0]
+
+
+def test_streaming_matches_batch():
+    frames = [
+        _frame(offset, app="Code" if offset % 40 < 20 else "Chrome")
+        for offset in range(0, 200, 5)
+    ]
+    sessionizer = Sessionizer()
+
+    streamed = []
+    for frame in frames:
+        closed = sessionizer.add(frame["timestamp"], frame["app"], frame["window"])
+        if closed is not None:
+            streamed.append(closed)
+    streamed.append(sessionizer.flush())
+
+    assert _summary(streamed) == _summary(sessionize(frames))
+    assert sessionizer.flush() is None
+
+
+def test_timestamp_formats():
+    expected = BASE + 0.123456
+
+    assert to_epoch_seconds("2025-11-03T09:00:00.123456Z") == expected
+    assert to_epoch_seconds("2025-11-03T09:00:00.123456789+00:00") == expected
+    assert to_epoch_seconds("2025-11-03 09:00:00.123456") == expected  # naive is UTC
+    assert to_epoch_seconds("2025-11-03T10:00:00.123456+01:00") == expected
+    assert to_epoch_seconds(BASE) == BASE
+    assert to_epoch_seconds(BASE * 1000) == BASE  # milliseconds
+    assert to_epoch_seconds("") is None
+    assert to_epoch_seconds("yesterday") is None
+    assert to_epoch_seconds(None) is None
+
+
+def test_sort_by_timestamp_orders_and_drops_unparseable():
+    frames = [_frame(20), {"timestamp": None}, _frame(0), {"timestamp": "2025-11-03T09:00:10+00:00"}]
+
+    ordered = sort_by_timestamp(frames)
+
+    assert [to_epoch_seconds(f["timestamp"]) - BASE for f in ordered] == [0, 10, 20]
@@ -0,0 +1,149 @@
+"""Tests for the vectorized time-accounting engine."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.sessions import sessionize
+from utils.time_accounting import compute_time_accounting
+
+
+BASE = datetime(2025, 11, 3, 9, 0, tzinfo=timezone.utc)
+
+
+def _frame(minutes, app="Code", window="main.py", fmt="{}Z"):
+    timestamp = (BASE + timedelta(minutes=minutes)).replace(tzinfo=None).isoformat()
+    return {"timestamp": fmt.format(timestamp), "app": app, "window": window}
+
+
+def _accounting(activities, **kwargs):
+    kwargs.setdefault("utc_offset_seconds", 0)
+    return compute_time_accounting(activities, **kwargs)
+
+
+def test_durations_follow_frame_gaps():
+    activities = [_frame(0), _frame(1), _frame(3, app="Chrome"), _frame(4, app="Chrome")]
+
+    result = _accounting(activities, tail_seconds=2)
+
+    assert result["frames"] == 4
+    assert result["by_application"] == {"Code": 180.0, "Chrome": 62.0}
+    assert result["total_seconds"] == 242.0
+    assert result["sessions"] == 2
+    assert result["longest_session_seconds"] == 180.0
+
+
+def test_idle_gaps_are_not_counted():
+    activities = [_frame(0), _frame(1), _frame(30), _frame(31)]
+
+    result = _accounting(activities, idle_gap_seconds=300, tail_seconds=2)
+
+    assert result["total_seconds"] == 60 + 2 + 60 + 2
+    assert result["sessions"] == 2
+
+
+def test_matches_sessionizer_without_window_splits():
+    apps = ["Code", "Code", "Chrome", "Code", "Slack", "Slack", "Code"]
+    minutes = [0, 2, 3, 20, 21, 40, 41]
+    activities = [_frame(m, app=a, fmt="{}+00:00") for m, a in zip(minutes, apps)]
+
+    result = _accounting(activities)
+    sessions = list(sessionize(activities, split_on_window=False))
+
+    assert result["sessions"] == len(sessions)
+    assert result["total_seconds"] == pytest.approx(sum(s["duration_seconds"] for s in sessions))
+    assert result["longest_session_seconds"] == pytest.approx(
+        max(s["duration_seconds"] for s in sessions)
+    )
+
+
+def test_unsorted_and_unparseable_frames():
+    activities = [_frame(2), {"timestamp": "bad", "app": "Code"}, _frame(0), {"app": "Code"}]
+
+    result = _accounting(activities, tail_seconds=2)
+
+    assert result["frames"] == 2
+    assert result["total_seconds"] == 122.0
+
+
+def test_mixed_timestamp_formats_fall_back_to_per_value_parsing():
+    activities = [
+        _frame(0, fmt="{}Z"),
+        {"timestamp": "2025-11-03T10:01:00+01:00", "app": "Code"},  # 09:01 UTC
+        _frame(2, fmt="{}+00:00")
+    ]
+
+    result = _accounting(activities, tail_seconds=0)
+
+    assert result["total_seconds"] == 120.0
+
+
+def test_categories_are_resolved_once_per_pair():
+    calls = []
+
+    def categorize(app, window):
+        calls.append((app, window))
+        return "coding" if app == "Code" else "browsing"
+
+    activities = [_frame(m, app="Code" if m < 5 else "Chrome") for m in range(10)]
+
+    result = _accounting(activities, categorize=categorize, tail_seconds=60)
+
+    assert sorted(calls) == [("Chrome", "main.py"), ("Code", "main.py")]
+    assert result["by_category"] == {"coding": 300.0, "browsing": 300.0}
+
+
+def test_focus_sessions():
+    activities = (
+        [_frame(m) for m in range(0, 40, 2)]
+        + [_frame(m, app="Slack") for m in range(40, 50, 2)]
+    )
+
+    result = _accounting(activities, focus_session_seconds=1800, tail_seconds=0)
+
+    assert result["sessions"] == 2
+    assert result["focus_sessions"] == 1
+
+
+def test_hour_histogram_uses_offset():
+    activities = [_frame(0), _frame(30), _frame(60)]
+
+    utc = _accounting(activities, idle_gap_seconds=3600, tail_seconds=0)
+    shifted = _accounting(
+        activities, idle_gap_seconds=3600, tail_seconds=0, utc_offset_seconds=8 * 3600
+    )
+
+    assert utc["by_hour"][9] == 3600.0
+    assert shifted["by_hour"][17] == 3600.0
+    assert sum(shifted["by_hour"]) == 3600.0
+
+
+def test_most_productive_window():
+    morning = [_frame(m) for m in range(0, 180, 2)]
+    assert _accounting(morning)["most_productive_time"] == "09:00-12:00"
+
+    # Activity in a single hour is not stretched over idle hours
+    single_hour = [_frame(60 + m) for m in range(0, 30, 2)]
+    assert _accounting(single_hour)["most_productive_time"] == "10:00-11:00"
+
+
+def test_tied_windows_prefer_the_busiest_hour():
+    # 30 minutes at 09:00 tie with 20 + 10 minutes at 14:00 and 15:00
+    activities = (
+        [_frame(m) for m in range(0, 31, 2)]
+        + [_frame(300 + m) for m in range(0, 21, 2)]
+        + [_frame(360 + m) for m in range(0, 11, 2)]
+    )
+
+    result = _accounting(activities, tail_seconds=0)
+
+    assert result["by_hour"][9] == result["by_hour"][14] + result["by_hour"][15]
+    assert result["most_productive_time"] == "09:00-10:00"
+
+
+def test_empty_input():
+    result = _accounting([])
+
+    assert result["frames"] == 0
+    assert result["most_productive_time"] == "N/A"
+    assert result["by_hour"] == [0.0] * 24
@@ -0,0 +1,272 @@
+"""Tests for the Screenpipe and MineContext tool helpers."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("crewai_tools")  # the tools package registers CrewAI tools
+
+import tools.minecontext_tools as minecontext_tools
+import tools.screenpipe_tools as screenpipe_tools
+from config import settings
+from tools.database_tools import get_conversations
+from tools.minecontext_tools import RRF_K, fuse_document_results, search_minecontext_documents
+from tools.screenpipe_tools import get_screenpipe_activities, iter_screenpipe_activities
+from utils.exceptions import DataCollectionException, ServiceUnavailableException
+from utils.search_cache import SearchCache
+from utils.token_counter import count_tokens
+
+
+class FakeSource:
+    """Screenpipe source returning fixed pages."""
+
+    name = "fake"
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def iter_activities(self, start_date, end_date, batch_size, timeout=None, deadline=None):
+        self.requests.append((start_date, end_date, batch_size, timeout, deadline))
+        yield from self.pages
+
+
+def _frame(frame_id, app="Code", text="hello"):
+    return {"frame_id": frame_id, "app": app, "window": "main.py", "ocr_text": text}
+
+
+@pytest.fixture
+def screenpipe(monkeypatch):
+    """Install a fake source built from the given pages."""
+    monkeypatch.setattr(settings, "FILTER_WORKERS", 0)
+    monkeypatch.setattr(settings, "SENSITIVE_KEYWORDS", ["password"])
+    monkeypatch.setattr(settings, "EXCLUDED_APPS", ["1Password"])
+
+    def install(pages):
+        source = FakeSource(pages)
+        monkeypatch.setattr(screenpipe_tools, "get_screenpipe_source", lambda: source)
+        return source
+
+    return install
+
+
+def _ids(batches):
+    return [[activity["frame_id"] for activity in batch] for batch in batches]
+
+
+def test_pages_are_filtered_batch_by_batch(screenpipe):
+    source = screenpipe([
+        [_frame(1), _frame(2, text="my password is hunter2")],
+        [_frame(3, app="1Password"), _frame(4)]
+    ])
+
+    batches = list(iter_screenpipe_activities("2025-11-03", "2025-11-09", page_size=2, timeout=5))
+
+    assert _ids(batches) == [[1, 2], [4]]
+    assert batches[0][1]["ocr_text"] == "my [REDACTED] is hunter2"
+    assert source.requests == [("2025-11-03", "2025-11-09", 2, 5, None)]
+
+
+def test_frames_repeated_across_pages_are_dropped(screenpipe):
+    # Rows shifting between pages repeat the previous page's last frames
+    screenpipe([
+        [_frame(1), _frame(2)],
+        [_frame(2), _frame(3)],
+        [_frame(3), _frame(4)]
+    ])
+
+    batches = list(iter_screenpipe_activities("2025-11-03", "2025-11-09", page_size=2))
+
+    assert _ids(batches) == [[1, 2], [3], [4]]
+
+
+def test_empty_batches_are_not_yielded(screenpipe):
+    screenpipe([
+        [_frame(1, app="1Password")],
+        [_frame(1, app="1Password"), _frame(2)]
+    ])
+
+    batches = list(iter_screenpipe_activities("2025-11-03", "2025-11-09", page_size=2))
+
+    assert _ids(batches) == [[2]]
+
+
+def test_dedup_only_remembers_recent_frames(screenpipe):
+    # The window covers two pages; older ids are forgotten
+    screenpipe([
+        [_frame(1), _frame(2)],
+        [_frame(3), _frame(4)],
+        [_frame(5), _frame(6)],
+        [_frame(1), _frame(6)]
+    ])
+
+    batches = list(iter_screenpipe_activities("2025-11-03", "2025-11-09", page_size=2))
+
+    assert _ids(batches) == [[1, 2], [3, 4], [5, 6], [1]]
+
+
+def test_frames_without_id_are_kept(screenpipe):
+    screenpipe([[{"app": "Code", "ocr_text": "a"}, {"app": "Code", "ocr_text": "a"}]])
+
+    activities = get_screenpipe_activities("2025-11-03", "2025-11-09")
+
+    assert len(activities) == 2
+
+
+def _doc(doc_id, score, content="body", title=None):
+    return {"id": doc_id, "title": title or f"Title {doc_id}", "content": content, "score": score}
+
+
+def test_documents_found_by_several_queries_rank_first():
+    results = {
+        "work": [_doc("a", 0.9), _doc("b", 0.8), _doc("c", 0.7)],
+        "meetings": [_doc("c", 0.4), _doc("d", 0.3)]
+    }
+
+    documents = fuse_document_results(results, include_content=True)
+
+    assert [doc["id"] for doc in documents] == ["c", "a", "b", "d"]
+    fused = documents[0]
+    assert fused["score"] == round(1 / (RRF_K + 3) + 1 / (RRF_K + 1), 6)
+    assert fused["queries"] == ["work", "meetings"]
+    # The vector score of the first query that found it, not a sum
+    assert fused["search_score"] == 0.7
+    assert fused["content"] == "body"
+
+
+def test_documents_without_id_are_merged_by_title():
+    results = {
+        "work": [{"title": "Roadmap", "content": "x"}, {"content": "untitled"}],
+        "planning": [{"title": "Roadmap", "content": "x"}, {"content": "untitled"}]
+    }
+
+    documents = fuse_document_results(results)
+
+    assert [doc.get("title") for doc in documents] == ["Roadmap", None, None]
+    assert documents[0]["queries"] == ["work", "planning"]
+
+
+def test_top_k_and_snippets(monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_SNIPPET_TOKENS", 5)
+    original = _doc("a", 0.9, content="word " * 100)
+    results = {"work": [original, _doc("b", 0.8), _doc("c", 0.7)]}
+
+    documents = fuse_document_results(results, top_k=2)
+
+    assert [doc["id"] for doc in documents] == ["a", "b"]
+    assert "content" not in documents[0]
+    assert count_tokens(documents[0]["snippet"]) <= 5
+    assert documents[1]["snippet"] == "body"
+    assert original["content"] == "word " * 100 and original["score"] == 0.9
+
+
+def test_fusing_nothing():
+    assert fuse_document_results({}) == []
+    assert fuse_document_results({"work": []}) == []
+
+
+def test_repeated_searches_are_served_from_cache(http_server, monkeypatch, tmp_path):
+    state = tmp_path / "sync_state.json"
+    state.write_text(json.dumps({"last_frame_id": 100}))
+    cache = SearchCache(watermark_path=str(state))
+    monkeypatch.setattr(minecontext_tools, "get_search_cache", lambda: cache)
+    calls = []
+
+    def handle(method, path, query, body):
+        calls.append(body["query"])
+        return 200, {"results": [_doc("a", 0.9)]}
+
+    monkeypatch.setattr(settings, "MINECONTEXT_URL", http_server(handle))
+
+    first = search_minecontext_documents(" work ", "2025-11-03", "2025-11-09")
+    first[0]["title"] = "changed by the caller"
+    second = search_minecontext_documents("work", "2025-11-03", "2025-11-09")
+    search_minecontext_documents("work", "2025-11-04", "2025-11-09")
+
+    assert calls == [" work ", "work"]
+    assert second == [_doc("a", 0.9)]
+
+    # New ingestion moves the watermark
+    state.write_text(json.dumps({"last_frame_id": 150}))
+    os.utime(state, ns=(1, 1))
+    search_minecontext_documents("work", "2025-11-03", "2025-11-09")
+
+    assert len(calls) == 3
+
+
+def test_minecontext_errors_raise(http_server, monkeypatch):
+    monkeypatch.setattr(minecontext_tools, "get_search_cache", lambda: None)
+    responses = iter([(500, {"detail": "boom"}), (200, "not an object")])
+    monkeypatch.setattr(settings, "MINECONTEXT_URL", http_server(lambda *args: next(responses)))
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailableException):
+            search_minecontext_documents("work", "2025-11-03", "2025-11-09")
+
+
+def _conversation_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE conversations (id TEXT, title TEXT, created_at INTEGER);
+        CREATE TABLE messages (conversation_id TEXT, role TEXT, content TEXT, timestamp INTEGER);
+    """)
+    day_ms = int(datetime(2025, 11, 4, 12).timestamp() * 1000)
+    conn.execute("INSERT INTO conversations VALUES ('c1', 'Standup', ?)", (day_ms,))
+    conn.executemany(
+        "INSERT INTO messages VALUES ('c1', ?, ?, ?)",
+        [("user", "hi", day_ms), ("assistant", "hello", day_ms + 1000), ("user", "old", 0)]
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_get_conversations(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DB_PATH", _conversation_db(tmp_path / "conversations.db"))
+
+    conversations = get_conversations("2025-11-03", "2025-11-09")
+
+    assert [c["title"] for c in conversations] == ["Standup"]
+    assert [m["content"] for m in conversations[0]["messages"]] == ["hi", "hello"]
+
+
+def test_unreadable_conversation_database_raises(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DB_PATH", str(tmp_path / "missing.db"))
+    with pytest.raises(DataCollectionException, match="not found"):
+        get_conversations("2025-11-03", "2025-11-09")
+
+    empty = tmp_path / "empty.db"
+    sqlite3.connect(empty).close()
+    monkeypatch.setattr(settings, "DB_PATH", str(empty))
+    with pytest.raises(DataCollectionException, match="no such table"):
+        get_conversations("2025-11-03", "2025-11-09")
+
+
+def test_max_activities_caps_a_fetch(screenpipe, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_ACTIVITIES_PER_REQUEST", 3)
+    read = []
+
+    def pages():
+        for start in (1, 3, 5):
+            read.append(start)
+            yield [_frame(start), _frame(start + 1)]
+
+    screenpipe(pages())
+
+    batches = list(iter_screenpipe_activities("2025-11-03", "2025-11-09", page_size=2))
+
+    assert _ids(batches) == [[1, 2], [3]]
+    # Paging stops at the cap
+    assert read == [1, 3]
+
+
+def test_page_size_setting_is_the_default_batch_size(screenpipe, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENPIPE_PAGE_SIZE", 7)
+    source = screenpipe([[_frame(1)]])
+
+    get_screenpipe_activities("2025-11-03", "2025-11-09")
+
+    assert source.requests[0][2] == 7
@@ -1,8 +1,28 @@
 """Tools package for CrewAI agents."""
 
-from .screenpipe_tools import fetch_screenpipe_activities, calculate_time_stats
-from .minecontext_tools import search_documents, get_context
-from .database_tools import fetch_conversations, get_conversation_summary
+from .screenpipe_tools import (
+    fetch_screenpipe_activities,
+    calculate_time_stats,
+    get_screenpipe_activities,
+    iter_screenpipe_activities,
+    compute_time_stats,
+    get_app_classifier
+)
+from .screenpipe_source import (
+    ScreenpipeSource,
+    HttpScreenpipeSource,
+    SqliteScreenpipeSource,
+    get_screenpipe_source
+)
+from .minecontext_tools import (
+    search_documents,
+    search_documents_multi,
+    get_context,
+    search_minecontext_documents,
+    search_minecontext_documents_multi,
+    fuse_document_results
+)
+from .database_tools import fetch_conversations, get_conversation_summary, get_conversations
 from .export_tools import save_markdown, save_metadata
 
 __all__ = [
@@ -14,5 +34,18 @@ __all__ = [
     'get_conversation_summary',
     'save_markdown',
     'save_metadata',
+    'get_screenpipe_activities',
+    'iter_screenpipe_activities',
+    'compute_time_stats',
+    'get_app_classifier',
+    'ScreenpipeSource',
+    'HttpScreenpipeSource',
+    'SqliteScreenpipeSource',
+    'get_screenpipe_source',
+    'search_minecontext_documents',
+    'search_documents_multi',
+    'search_minecontext_documents_multi',
+    'fuse_document_results',
+    'get_conversations',
 ]
 
@@ -7,9 +7,86 @@ from typing import List, Dict, Any
 from datetime import datetime
 
 from config import settings
+from utils.exceptions import DataCollectionException
 from utils.logger import logger
 
 
+def get_conversations(start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """
+    Load conversations with messages in a date range from SQLite.
+    
+    Plain-function counterpart of the ``fetch_conversations`` tool, used by
+    the data collection stage without an agent round-trip.
+    
+    Args:
+        start_date: ISO 8601 date string
+        end_date: ISO 8601 date string
+    
+    Returns:
+        List of conversations with their messages
+    
+    Raises:
+        DataCollectionException: If the database is missing or cannot be read
+    """
+    # Expand user path
+    db_path = os.path.expanduser(settings.DB_PATH)
+    
+    # Check if database exists
+    if not os.path.exists(db_path):
+        logger.warning(f"Database not found at {db_path}")
+        raise DataCollectionException(f"Conversation database not found at {db_path}")
+    
+    logger.info(f"Fetching conversations from {db_path}")
+    
+    # Convert ISO dates to timestamps (milliseconds)
+    start_ts = int(datetime.fromisoformat(start_date).timestamp() * 1000)
+    end_ts = int(datetime.fromisoformat(end_date).timestamp() * 1000)
+    
+    # Query conversations and messages
+    query = """
+    SELECT c.id, c.title, c.created_at, m.role, m.content, m.timestamp
+    FROM conversations c
+    JOIN messages m ON c.id = m.conversation_id
+    WHERE m.timestamp >= ? AND m.timestamp <= ?
+    ORDER BY m.timestamp ASC
+    """
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(query, (start_ts, end_ts)).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.error(f"Database error: {e}")
+        raise DataCollectionException(f"Conversation database error: {e}")
+    
+    # Group messages by conversation
+    conversations_dict = {}
+    for row in rows:
+        conv_id, title, created_at, role, content, timestamp = row
+        
+        if conv_id not in conversations_dict:
+            conversations_dict[conv_id] = {
+                "id": conv_id,
+                "title": title,
+                "created_at": created_at,
+                "messages": []
+            }
+        
+        conversations_dict[conv_id]["messages"].append({
+            "role": role,
+            "content": content,
+            "timestamp": timestamp
+        })
+    
+    conversations = list(conversations_dict.values())
+    
+    logger.info(f"Fetched {len(conversations)} conversations with messages")
+    
+    return conversations
+
+
 @tool("Fetch Conversations from Database")
 def fetch_conversations(
     start_date: str,
@@ -49,67 +126,7 @@ def fetch_conversations(
         ]
     """
     try:
-        # Expand user path
-        db_path = os.path.expanduser(settings.DB_PATH)
-        
-        # Check if database exists
-        if not os.path.exists(db_path):
-            logger.warning(f"Database not found at {db_path}")
-            return []
-        
-        logger.info(f"Fetching conversations from {db_path}")
-        
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Convert ISO dates to timestamps (milliseconds)
-        start_ts = int(datetime.fromisoformat(start_date).timestamp() * 1000)
-        end_ts = int(datetime.fromisoformat(end_date).timestamp() * 1000)
-        
-        # Query conversations and messages
-        query = """
-        SELECT c.id, c.title, c.created_at, m.role, m.content, m.timestamp
-        FROM conversations c
-        JOIN messages m ON c.id = m.conversation_id
-        WHERE m.timestamp >= ? AND m.timestamp <= ?
-        ORDER BY m.timestamp ASC
-        """
-        
-        cursor.execute(query, (start_ts, end_ts))
-        rows = cursor.fetchall()
-        
-        # Group messages by conversation
-        conversations_dict = {}
-        for row in rows:
-            conv_id, title, created_at, role, content, timestamp = row
-            
-            if conv_id not in conversations_dict:
-                conversations_dict[conv_id] = {
-                    "id": conv_id,
-                    "title": title,
-                    "created_at": created_at,
-                    "messages": []
-                }
-            
-            conversations_dict[conv_id]["messages"].append({
-                "role": role,
-                "content": content,
-                "timestamp": timestamp
-            })
-        
-        conn.close()
-        
-        conversations = list(conversations_dict.values())
-        
-        logger.info(f"Fetched {len(conversations)} conversations with messages")
-        
-        return conversations
-    
-    except sqlite3.Error as e:
-        logger.error(f"Database error: {e}")
-        return []
-    
+        return get_conversations(start_date, end_date)
     except Exception as e:
         logger.error(f"Error fetching conversations: {e}")
         return []
@@ -1,50 +1,64 @@
 """MineContext integration tools for CrewAI agents."""
 
+from concurrent.futures import ThreadPoolExecutor
 from crewai_tools import tool
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from config import settings
+from utils.http_client import get_http_client
 from utils.logger import logger
+from utils.search_cache import get_search_cache, search_key
 from utils.exceptions import ServiceUnavailableException
+from utils.token_counter import truncate_to_tokens
 
 
-@tool("Search Documents in MineContext")
-def search_documents(
+# Reciprocal-rank fusion constant: a document at rank r in one query's
+# results scores 1 / (RRF_K + r); 60 is the value from the original paper
+RRF_K = 60
+
+
+def search_minecontext_documents(
     query: str,
     start_date: str,
     end_date: str,
-    top_k: int = 50
+    top_k: int = 50,
+    timeout: Optional[float] = None
 ) -> List[Dict[str, Any]]:
     """
-    Search documents in MineContext RAG system.
+    Run a vector search against MineContext.
     
-    This tool performs semantic search on documents that the user has
-    created or edited during the specified time period.
+    Plain-function counterpart of the ``search_documents`` tool, used by
+    the data collection stage without an agent round-trip. Results are
+    served from the search cache (see utils.search_cache) when the same
+    query, top_k and dates were searched since the last ingestion.
     
     Args:
-        query: Search query (e.g., "work progress", "project documents")
+        query: Search query
         start_date: Filter documents created after this date (ISO 8601)
         end_date: Filter documents created before this date (ISO 8601)
-        top_k: Number of results to return (default: 50)
+        top_k: Number of results to return
+        timeout: Request timeout in seconds (default: settings.REQUEST_TIMEOUT)
     
     Returns:
-        List of relevant documents with content and metadata:
-        [
-            {
-                "id": "doc_123",
-                "title": "Document title",
-                "content": "Document content...",
-                "created_at": "2025-11-01T10:00:00Z",
-                "score": 0.95
-            },
-            ...
-        ]
+        List of matching documents
+    
+    Raises:
+        ServiceUnavailableException: If MineContext cannot be reached or
+            returns an error or an invalid response
     """
+    cache = get_search_cache()
+    key = search_key("vector", query, top_k, start_date, end_date)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"MineContext search cache hit: query='{query}', top_k={top_k}")
+            return [dict(doc) for doc in cached]
+    
     try:
         logger.info(f"Searching MineContext: query='{query}', top_k={top_k}")
         
-        response = requests.post(
+        response = get_http_client().post(
             f"{settings.MINECONTEXT_URL}/api/search/vector",
             json={
                 "query": query,
@@ -56,7 +70,7 @@ def search_documents(
                     }
                 }
             },
-            timeout=settings.REQUEST_TIMEOUT
+            timeout=timeout or settings.REQUEST_TIMEOUT
         )
         
         if response.status_code != 200:
@@ -64,19 +78,217 @@ def search_documents(
             raise ServiceUnavailableException("MineContext")
         
         data = response.json()
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a JSON object, got {type(data).__name__}")
         results = data.get("results", [])
         
         logger.info(f"Found {len(results)} documents in MineContext")
         
+        if cache is not None:
+            cache.put(key, [dict(doc) for doc in results])
+        
         return results
     
     except requests.RequestException as e:
         logger.error(f"MineContext connection failed: {e}")
         raise ServiceUnavailableException("MineContext")
     
-    except Exception as e:
-        logger.error(f"Error searching MineContext: {e}")
+    except ValueError as e:
+        logger.error(f"Invalid MineContext response: {e}")
+        raise ServiceUnavailableException("MineContext")
+
+
+def search_minecontext_documents_multi(
+    queries: List[str],
+    start_date: str,
+    end_date: str,
+    top_k: int = 50,
+    include_content: bool = False,
+    timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run several vector searches concurrently and fuse their rankings.
+    
+    The queries go out in parallel over the shared MineContext connection
+    pool, so wall time is that of the slowest query instead of the sum.
+    Results are merged with fuse_document_results.
+    
+    Args:
+        queries: Search queries (duplicates are searched once)
+        start_date: Filter documents created after this date (ISO 8601)
+        end_date: Filter documents created before this date (ISO 8601)
+        top_k: Results per query and of the fused list
+        include_content: Return full document content instead of snippets
+        timeout: Per-request timeout in seconds (default: settings.REQUEST_TIMEOUT)
+    
+    Returns:
+        Fused documents, best first
+    
+    Raises:
+        ServiceUnavailableException: If every query failed to reach MineContext
+    """
+    queries = list(dict.fromkeys(query for query in queries if query))
+    if not queries:
         return []
+    
+    with ThreadPoolExecutor(
+        max_workers=min(len(queries), settings.HTTP_POOL_MAXSIZE),
+        thread_name_prefix="minecontext"
+    ) as executor:
+        futures = {
+            query: executor.submit(
+                search_minecontext_documents, query, start_date, end_date, top_k, timeout
+            )
+            for query in queries
+        }
+    
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    failed = []
+    for query, future in futures.items():
+        try:
+            results[query] = future.result()
+        except ServiceUnavailableException:
+            failed.append(query)
+    
+    if not results:
+        raise ServiceUnavailableException("MineContext")
+    if failed:
+        logger.warning(f"MineContext queries failed: {', '.join(failed)}")
+    
+    return fuse_document_results(results, top_k=top_k, include_content=include_content)
+
+
+def fuse_document_results(
+    results_by_query: Dict[str, List[Dict[str, Any]]],
+    top_k: Optional[int] = None,
+    include_content: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-query search results with reciprocal-rank fusion.
+    
+    Documents are deduplicated by id (title when there is none). Each
+    scores the sum of 1 / (RRF_K + rank) over the queries that found it,
+    so documents ranked well by several queries come first; vector
+    scores of different queries are not comparable and are not summed.
+    
+    Args:
+        results_by_query: Ranked results of each query, in query order
+        top_k: Keep only the best fused documents (None keeps all)
+        include_content: Keep full content; otherwise it is replaced by a
+            ``snippet`` of settings.DOCUMENT_SNIPPET_TOKENS tokens
+    
+    Returns:
+        Documents by descending fused ``score``, each with the ``queries``
+        that matched it and its original ``search_score``
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    
+    for query, results in results_by_query.items():
+        for rank, doc in enumerate(results, 1):
+            doc_id = doc.get("id") or doc.get("title") or f"{query}#{rank}"
+            entry = fused.get(doc_id)
+            if entry is None:
+                entry = fused[doc_id] = {
+                    **doc,
+                    "score": 0.0,
+                    "search_score": doc.get("score"),
+                    "queries": []
+                }
+            entry["score"] += 1.0 / (RRF_K + rank)
+            entry["queries"].append(query)
+    
+    documents = sorted(fused.values(), key=lambda doc: doc["score"], reverse=True)
+    if top_k is not None:
+        documents = documents[:top_k]
+    
+    for doc in documents:
+        doc["score"] = round(doc["score"], 6)
+        if not include_content:
+            content = doc.pop("content", None)
+            doc["snippet"] = truncate_to_tokens(
+                str(content or ""), settings.DOCUMENT_SNIPPET_TOKENS
+            )
+    
+    return documents
+
+
+@tool("Search Documents in MineContext")
+def search_documents(
+    query: str,
+    start_date: str,
+    end_date: str,
+    top_k: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Search documents in MineContext RAG system.
+    
+    This tool performs semantic search on documents that the user has
+    created or edited during the specified time period.
+    
+    Args:
+        query: Search query (e.g., "work progress", "project documents")
+        start_date: Filter documents created after this date (ISO 8601)
+        end_date: Filter documents created before this date (ISO 8601)
+        top_k: Number of results to return (default: 50)
+    
+    Returns:
+        List of relevant documents with content and metadata:
+        [
+            {
+                "id": "doc_123",
+                "title": "Document title",
+                "content": "Document content...",
+                "created_at": "2025-11-01T10:00:00Z",
+                "score": 0.95
+            },
+            ...
+        ]
+    """
+    return search_minecontext_documents(query, start_date, end_date, top_k)
+
+
+@tool("Search Documents in MineContext (Multiple Queries)")
+def search_documents_multi(
+    queries: List[str],
+    start_date: str,
+    end_date: str,
+    top_k: int = 30,
+    include_content: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Search MineContext with several queries at once.
+    
+    Prefer this over calling search_documents once per query: the
+    queries run in parallel, documents found by several queries are
+    returned once, and results are ranked by how well they matched
+    across all queries. Documents come with a short snippet; call again
+    with include_content=True only when the full text is needed.
+    
+    Args:
+        queries: Search queries (e.g., ["work", "project", "document"])
+        start_date: Filter documents created after this date (ISO 8601)
+        end_date: Filter documents created before this date (ISO 8601)
+        top_k: Number of documents to return (default: 30)
+        include_content: Return full content instead of snippets
+    
+    Returns:
+        List of documents, best first:
+        [
+            {
+                "id": "doc_123",
+                "title": "Document title",
+                "snippet": "Beginning of the document...",
+                "created_at": "2025-11-01T10:00:00Z",
+                "score": 0.0325,
+                "search_score": 0.95,
+                "queries": ["work", "project"]
+            },
+            ...
+        ]
+    """
+    return search_minecontext_documents_multi(
+        queries, start_date, end_date, top_k, include_content=include_content
+    )
 
 
 @tool("Get Context from MineContext")
@@ -94,10 +306,18 @@ def get_context(topic: str, max_results: int = 10) -> str:
     Returns:
         Concatenated context string with relevant information
     """
+    cache = get_search_cache()
+    key = search_key("context", topic, max_results)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"MineContext context cache hit: {topic}")
+            return cached
+    
     try:
         logger.info(f"Getting context for topic: {topic}")
         
-        response = requests.post(
+        response = get_http_client().post(
             f"{settings.MINECONTEXT_URL}/api/query",
             json={
                 "query": f"What is {topic}? What work was done on {topic}?",
@@ -114,15 +334,18 @@ def get_context(topic: str, max_results: int = 10) -> str:
         context_items = data.get("results", [])
         
         if not context_items:
-            return f"No context found for {topic}"
-        
-        # Concatenate context
-        context_text = f"Context about '{topic}':\n\n"
-        for i, item in enumerate(context_items, 1):
-            content = item.get("content", "")
-            context_text += f"{i}. {content}\n\n"
+            context_text = f"No context found for {topic}"
+        else:
+            # Concatenate context
+            context_text = f"Context about '{topic}':\n\n"
+            for i, item in enumerate(context_items, 1):
+                content = item.get("content", "")
+                context_text += f"{i}. {content}\n\n"
+            
+            logger.info(f"Retrieved context: {len(context_items)} items")
         
-        logger.info(f"Retrieved context: {len(context_items)} items")
+        if cache is not None:
+            cache.put(key, context_text)
         
         return context_text
     
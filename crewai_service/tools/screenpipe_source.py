@@ -0,0 +1,261 @@
+"""Screenpipe data sources - HTTP API or direct read-only SQLite access."""
+
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from config import settings
+from utils.http_client import get_http_client
+from utils.logger import logger
+from utils.exceptions import ServiceUnavailableException, DataCollectionException
+
+
+class ScreenpipeSource(ABC):
+    """Base class for backends that stream raw Screenpipe activities."""
+
+    name = "base"
+
+    @abstractmethod
+    def iter_activities(
+        self,
+        start_date: str,
+        end_date: str,
+        batch_size: int,
+        timeout: float,
+        deadline: Optional[float] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream normalized (unfiltered) activity records in batches.
+
+        Args:
+            start_date: ISO 8601 date string
+            end_date: ISO 8601 date string
+            batch_size: Records per batch
+            timeout: Per-operation timeout in seconds
+            deadline: Optional absolute ``time.time()`` after which to stop
+
+        Yields:
+            Lists of flat activity dicts (frame_id, timestamp, app, window, ocr_text)
+        """
+
+    def _remaining(self, timeout: float, deadline: Optional[float], position: str) -> float:
+        """Return the time budget for the next operation, enforcing the deadline."""
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise DataCollectionException(
+                f"Screenpipe {self.name} read stopped at {position}: deadline exceeded"
+            )
+        return min(timeout, remaining)
+
+
+class HttpScreenpipeSource(ScreenpipeSource):
+    """Reads activities through the Screenpipe ``/search`` HTTP API."""
+
+    name = "http"
+
+    def iter_activities(self, start_date, end_date, batch_size, timeout, deadline=None):
+        """Page through ``/search`` with ``limit``/``offset``."""
+        # Convert dates to Unix timestamps
+        start_ts = int(datetime.fromisoformat(start_date).timestamp())
+        end_ts = int(datetime.fromisoformat(end_date).timestamp())
+
+        offset = 0
+
+        client = get_http_client()
+
+        while True:
+            request_timeout = self._remaining(timeout, deadline, f"offset {offset}")
+
+            try:
+                response = client.get(
+                    f"{settings.SCREENPIPE_URL}/search",
+                    params={
+                        "start_time": start_ts,
+                        "end_time": end_ts,
+                        "limit": batch_size,
+                        "offset": offset
+                    },
+                    timeout=request_timeout
+                )
+            except requests.RequestException as e:
+                logger.error(f"Screenpipe connection failed: {e}")
+                raise ServiceUnavailableException("Screenpipe")
+
+            if response.status_code != 200:
+                logger.error(f"Screenpipe API error: HTTP {response.status_code}")
+                raise ServiceUnavailableException("Screenpipe")
+
+            data = response.json()
+            page = data.get("data", [])
+            if page:
+                yield [normalize_activity(item) for item in page]
+
+            offset += len(page)
+            total = (data.get("pagination") or {}).get("total")
+            if len(page) < batch_size or (total is not None and offset >= total):
+                break
+
+
+class SqliteScreenpipeSource(ScreenpipeSource):
+    """
+    Reads activities straight from Screenpipe's SQLite database.
+
+    The database is opened read-only (``mode=ro`` + ``query_only``), so it
+    never takes write locks and, with Screenpipe's WAL journal, never
+    blocks the recorder. Rows are streamed from a single cursor with
+    ``fetchmany`` so memory stays bounded, and no HTTP/JSON serialization
+    is involved. Works when the Screenpipe HTTP server is not running.
+
+    Screenpipe stores timestamps as RFC 3339 text
+    (``2025-11-03T10:00:00.123+00:00``), which does not compare correctly
+    with other text formats, so the range is matched on
+    ``julianday(f.timestamp)``. A coarse text
+    comparison on the date prefix, widened by a day on both ends, comes
+    first so SQLite can still use the timestamp index (rows are ordered
+    by the stored text, which Screenpipe writes in a single format).
+    """
+
+    name = "sqlite"
+
+    QUERY = """
+    SELECT
+        f.id,
+        f.timestamp,
+        f.app_name,
+        f.window_name,
+        o.text
+    FROM frames f
+    LEFT JOIN ocr_text o ON f.id = o.frame_id
+    WHERE f.timestamp >= ? AND f.timestamp < ?
+      AND julianday(f.timestamp) BETWEEN julianday(?) AND julianday(?)
+    ORDER BY f.timestamp ASC, f.id ASC
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize source.
+
+        Args:
+            db_path: Path to Screenpipe's db.sqlite (default: settings.SCREENPIPE_DB_PATH)
+        """
+        self.db_path = os.path.expanduser(db_path or settings.SCREENPIPE_DB_PATH)
+
+    def iter_activities(self, start_date, end_date, batch_size, timeout, deadline=None):
+        """Stream frames joined with OCR text in timestamp order."""
+        if not os.path.exists(self.db_path):
+            logger.error(f"Screenpipe database not found at {self.db_path}")
+            raise ServiceUnavailableException("Screenpipe")
+
+        # Date-prefix bounds for the index, then exact UTC bounds
+        start_ts = _to_utc(start_date)
+        end_ts = _to_utc(end_date)
+        params = (
+            (start_ts - timedelta(days=1)).strftime("%Y-%m-%d"),
+            (end_ts + timedelta(days=2)).strftime("%Y-%m-%d"),
+            start_ts.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            end_ts.strftime("%Y-%m-%d %H:%M:%S.%f")
+        )
+
+        try:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                timeout=self._remaining(timeout, deadline, "connect")
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Cannot open Screenpipe database: {e}")
+            raise ServiceUnavailableException("Screenpipe")
+
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            cursor = conn.execute(self.QUERY, params)
+            read = 0
+
+            while True:
+                self._remaining(timeout, deadline, f"row {read}")
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                read += len(rows)
+
+                yield [
+                    {
+                        "type": "OCR",
+                        "frame_id": frame_id,
+                        "timestamp": timestamp,
+                        "app": app or "",
+                        "window": window or "",
+                        "ocr_text": text or ""
+                    }
+                    for frame_id, timestamp, app, window, text in rows
+                ]
+
+        except sqlite3.Error as e:
+            logger.error(f"Screenpipe database query failed: {e}")
+            raise ServiceUnavailableException("Screenpipe")
+
+        finally:
+            conn.close()
+
+
+def get_screenpipe_source() -> ScreenpipeSource:
+    """
+    Get the Screenpipe backend selected by ``settings.SCREENPIPE_BACKEND``.
+
+    ``http`` uses the REST API, ``sqlite`` reads the local database, and
+    ``auto`` prefers the database when it exists.
+
+    Returns:
+        ScreenpipeSource instance
+    """
+    backend = settings.SCREENPIPE_BACKEND.lower()
+
+    if backend == "sqlite":
+        return SqliteScreenpipeSource()
+
+    if backend == "auto":
+        source = SqliteScreenpipeSource()
+        if os.path.exists(source.db_path):
+            return source
+
+    return HttpScreenpipeSource()
+
+
+def normalize_activity(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a Screenpipe search result into a flat activity record.
+
+    Screenpipe returns ``{"type": "OCR", "content": {...}}`` entries; the
+    rest of the service works with flat ``app``/``window``/``ocr_text``
+    records. Already-flat records are returned unchanged.
+
+    Args:
+        item: Raw search result entry
+
+    Returns:
+        Activity dict with frame_id, timestamp, app, window and ocr_text
+    """
+    content = item.get("content")
+    if not isinstance(content, dict):
+        return item
+
+    return {
+        "type": item.get("type", "OCR"),
+        "frame_id": content.get("frame_id"),
+        "timestamp": content.get("timestamp"),
+        "app": content.get("app_name", ""),
+        "window": content.get("window_name", ""),
+        "ocr_text": content.get("text", "")
+    }
+
+
+def _to_utc(date_str: str) -> datetime:
+    """Convert an ISO 8601 date (local time if naive) to an aware UTC datetime."""
+    return datetime.fromisoformat(date_str).astimezone(timezone.utc)
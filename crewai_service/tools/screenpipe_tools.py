@@ -1,14 +1,145 @@
 """Screenpipe integration tools for CrewAI agents."""
 
 from crewai_tools import tool
-import requests
-from datetime import datetime
-from typing import List, Dict, Any
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Iterator, List, Dict, Any, Optional
 
 from config import settings
 from utils.logger import logger
-from utils.exceptions import ServiceUnavailableException
-from utils.data_filter import filter_sensitive_activity
+from utils.data_filter import filter_sensitive_batches
+from utils.time_accounting import compute_time_accounting
+from utils.app_classifier import AppClassifier
+from tools.screenpipe_source import get_screenpipe_source
+
+
+def iter_screenpipe_activities(
+    start_date: str,
+    end_date: str,
+    page_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream filtered Screenpipe activities batch by batch.
+    
+    Reads from the backend selected by ``settings.SCREENPIPE_BACKEND``
+    (HTTP ``/search`` paging or the local SQLite database) and filters each
+    batch before yielding it. Only a bounded number of batches is held in
+    memory at a time (one, or two per worker with parallel redaction), so
+    a busy week of OCR frames is processed in bounded memory and nothing
+    is truncated unless ``settings.MAX_ACTIVITIES_PER_REQUEST`` sets a cap.
+    Frames repeated across page boundaries are dropped by checking the
+    last two pages' frame ids only, so deduplication is bounded too.
+    
+    Args:
+        start_date: ISO 8601 date string (e.g., "2025-10-28")
+        end_date: ISO 8601 date string (e.g., "2025-11-04")
+        page_size: Rows per batch (default: settings.SCREENPIPE_PAGE_SIZE)
+        timeout: Per-request timeout in seconds (default: settings.REQUEST_TIMEOUT)
+        deadline: Optional absolute ``time.time()`` after which reading stops
+    
+    Yields:
+        Lists of filtered activity records, one per batch
+    
+    Raises:
+        ServiceUnavailableException: If Screenpipe cannot be reached
+        DataCollectionException: If the deadline passes before the last batch
+    """
+    page_size = page_size or settings.SCREENPIPE_PAGE_SIZE
+    limit = settings.MAX_ACTIVITIES_PER_REQUEST
+    timeout = timeout or settings.REQUEST_TIMEOUT
+    source = get_screenpipe_source()
+    
+    logger.info(
+        f"Fetching Screenpipe activities via {source.name}: "
+        f"{start_date} to {end_date} (batch size {page_size})"
+    )
+    
+    counts = {"raw": 0, "kept": 0}
+    # Recently seen frame ids; repeats only happen near a page boundary
+    dedup_window = 2 * page_size
+    recent_frames: Deque[Any] = deque()
+    seen_frames = set()
+    
+    def unique_pages():
+        for page in source.iter_activities(start_date, end_date, page_size, timeout, deadline):
+            counts["raw"] += len(page)
+            
+            unique = []
+            for activity in page:
+                # Rows can shift between HTTP pages while Screenpipe is recording
+                frame_id = activity.get("frame_id")
+                if frame_id is not None:
+                    if frame_id in seen_frames:
+                        continue
+                    seen_frames.add(frame_id)
+                    recent_frames.append(frame_id)
+                    if len(recent_frames) > dedup_window:
+                        seen_frames.discard(recent_frames.popleft())
+                unique.append(activity)
+            yield unique
+    
+    # Excluded apps are dropped; with FILTER_WORKERS > 1 redaction runs in
+    # worker processes while the next page is fetched
+    batches = filter_sensitive_batches(unique_pages())
+    try:
+        for batch in batches:
+            if limit and counts["kept"] + len(batch) >= limit:
+                batch = batch[:limit - counts["kept"]]
+                counts["kept"] += len(batch)
+                if batch:
+                    yield batch
+                logger.warning(
+                    f"Stopped at MAX_ACTIVITIES_PER_REQUEST={limit} activities; "
+                    f"later activities in the range are not included"
+                )
+                break
+            counts["kept"] += len(batch)
+            if batch:
+                yield batch
+    finally:
+        batches.close()
+    
+    logger.info(
+        f"Fetched {counts['raw']} raw activities from Screenpipe, "
+        f"{counts['kept']} after filtering sensitive data"
+    )
+
+
+def get_screenpipe_activities(
+    start_date: str,
+    end_date: str,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch and filter all Screenpipe activities for a date range.
+    
+    Plain-function counterpart of the ``fetch_screenpipe_activities`` tool,
+    used by the data collection stage without an agent round-trip.
+    
+    Unlike iter_screenpipe_activities this holds every activity of the
+    range in one list, so memory grows with the range; stream with
+    iter_screenpipe_activities where the consumer can work batch by batch.
+    
+    Args:
+        start_date: ISO 8601 date string (e.g., "2025-10-28")
+        end_date: ISO 8601 date string (e.g., "2025-11-04")
+        timeout: Per-request timeout in seconds (default: settings.REQUEST_TIMEOUT)
+        deadline: Optional absolute ``time.time()`` after which paging stops
+    
+    Returns:
+        List of filtered activity records
+    
+    Raises:
+        ServiceUnavailableException: If Screenpipe cannot be reached
+        DataCollectionException: If the deadline passes before the last page
+    """
+    activities = []
+    for batch in iter_screenpipe_activities(start_date, end_date, timeout=timeout, deadline=deadline):
+        activities.extend(batch)
+    return activities
 
 
 @tool("Fetch Screenpipe Activities")
@@ -29,60 +160,33 @@ def fetch_screenpipe_activities(start_date: str, end_date: str) -> List[Dict[str
     
     Returns:
         List of activity records with timestamps, apps, windows, and OCR text.
-        Returns empty list if service is unavailable.
-    """
-    try:
-        # Convert dates to Unix timestamps
-        start_ts = int(datetime.fromisoformat(start_date).timestamp())
-        end_ts = int(datetime.fromisoformat(end_date).timestamp())
-        
-        logger.info(f"Fetching Screenpipe activities: {start_date} to {end_date}")
-        
-        # Call Screenpipe API
-        response = requests.get(
-            f"{settings.SCREENPIPE_URL}/search",
-            params={
-                "start_time": start_ts,
-                "end_time": end_ts,
-                "limit": settings.MAX_ACTIVITIES_PER_REQUEST
-            },
-            timeout=settings.REQUEST_TIMEOUT
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Screenpipe API error: HTTP {response.status_code}")
-            raise ServiceUnavailableException("Screenpipe")
-        
-        data = response.json()
-        activities = data.get("data", [])
-        
-        logger.info(f"Fetched {len(activities)} raw activities from Screenpipe")
-        
-        # Filter sensitive data
-        filtered = []
-        for activity in activities:
-            filtered_activity = filter_sensitive_activity(activity)
-            if filtered_activity:  # None means excluded
-                filtered.append(filtered_activity)
-        
-        logger.info(f"Filtered to {len(filtered)} activities (removed sensitive data)")
-        
-        return filtered
     
-    except requests.RequestException as e:
-        logger.error(f"Screenpipe connection failed: {e}")
-        raise ServiceUnavailableException("Screenpipe")
-    
-    except Exception as e:
-        logger.error(f"Error fetching Screenpipe activities: {e}")
-        return []
+    Raises:
+        ServiceUnavailableException: If Screenpipe cannot be reached
+        DataCollectionException: If reading Screenpipe fails part way
+    """
+    return get_screenpipe_activities(start_date, end_date)
 
 
-@tool("Calculate Activity Statistics")
-def calculate_time_stats(activities: List[Dict]) -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def get_app_classifier() -> AppClassifier:
+    """Build the category classifier from settings once per process."""
+    return AppClassifier(settings.CATEGORY_RULES)
+
+
+def compute_time_stats(activities: List[Dict]) -> Dict[str, Any]:
     """
     Calculate time distribution statistics from activities.
     
+    Plain-function counterpart of the ``calculate_time_stats`` tool, also
+    used to precompute the time summary for the analysis prompt.
+    
+    Durations come from consecutive frame timestamps (idle gaps capped at
+    ``settings.IDLE_GAP_SECONDS``) and are computed with the vectorized
+    engine in utils.time_accounting. Categories follow
+    ``settings.CATEGORY_RULES`` plus the built-in rules in
+    utils.app_classifier, including window-title rules.
+    
     Analyzes activity data to compute:
     - Total time by application
     - Time by category (coding, meetings, documentation, etc.)
@@ -98,8 +202,10 @@ def calculate_time_stats(activities: List[Dict]) -> Dict[str, Any]:
             "total_hours": float,
             "by_application": {"app_name": hours, ...},
             "by_category": {"coding": hours, "meetings": hours, ...},
+            "by_hour": {"09": hours, ...},
             "most_productive_time": "09:00-12:00",
-            "focus_sessions": int
+            "focus_sessions": int,
+            "longest_session_hours": float
         }
     """
     if not activities:
@@ -112,59 +218,40 @@ def calculate_time_stats(activities: List[Dict]) -> Dict[str, Any]:
         }
     
     try:
-        # Group by application
-        app_times = {}
-        for activity in activities:
-            app = activity.get('app', 'Unknown')
-            duration = activity.get('duration_seconds', 0)
-            
-            if app in app_times:
-                app_times[app] += duration
-            else:
-                app_times[app] = duration
+        stats = compute_time_accounting(
+            activities,
+            idle_gap_seconds=settings.IDLE_GAP_SECONDS,
+            focus_session_seconds=settings.FOCUS_SESSION_SECONDS,
+            categorize=get_app_classifier().classify
+        )
         
         # Convert seconds to hours
-        app_hours = {app: round(seconds / 3600, 2) for app, seconds in app_times.items()}
-        
-        # Calculate total hours
-        total_seconds = sum(app_times.values())
-        total_hours = round(total_seconds / 3600, 2)
+        app_hours = {app: round(seconds / 3600, 2) for app, seconds in stats["by_application"].items()}
+        total_hours = round(stats["total_seconds"] / 3600, 2)
         
-        # Categorize applications
-        coding_apps = ['Visual Studio Code', 'VS Code', 'PyCharm', 'Xcode', 'Cursor', 'Terminal', 'iTerm']
-        browser_apps = ['Chrome', 'Safari', 'Firefox', 'Edge']
-        communication_apps = ['Slack', 'Teams', 'Zoom', 'WeChat', 'DingTalk']
+        category_times = {category: 0 for category in get_app_classifier().categories}
+        for category, seconds in stats["by_category"].items():
+            category_times[category] = round(seconds / 3600, 2)
         
-        category_times = {
-            "coding": 0,
-            "browsing": 0,
-            "communication": 0,
-            "other": 0
+        hourly = {
+            f"{hour:02d}": round(seconds / 3600, 2)
+            for hour, seconds in enumerate(stats["by_hour"])
+            if seconds > 0
         }
         
-        for app, hours in app_hours.items():
-            if any(coding_app.lower() in app.lower() for coding_app in coding_apps):
-                category_times["coding"] += hours
-            elif any(browser_app.lower() in app.lower() for browser_app in browser_apps):
-                category_times["browsing"] += hours
-            elif any(comm_app.lower() in app.lower() for comm_app in communication_apps):
-                category_times["communication"] += hours
-            else:
-                category_times["other"] += hours
-        
-        # Analyze time patterns (simplified for now)
-        # TODO: Implement more sophisticated time pattern analysis
-        most_productive_time = "09:00-12:00"  # Default assumption
-        focus_sessions = len([a for a in activities if a.get('duration_seconds', 0) > 1800])  # 30+ min sessions
-        
-        logger.info(f"Calculated time stats: {total_hours} hours across {len(app_hours)} apps")
+        logger.info(
+            f"Calculated time stats: {total_hours} hours across {len(app_hours)} apps "
+            f"from {stats['frames']} frames"
+        )
         
         return {
             "total_hours": total_hours,
             "by_application": dict(sorted(app_hours.items(), key=lambda x: x[1], reverse=True)),
             "by_category": category_times,
-            "most_productive_time": most_productive_time,
-            "focus_sessions": focus_sessions
+            "by_hour": hourly,
+            "most_productive_time": stats["most_productive_time"],
+            "focus_sessions": stats["focus_sessions"],
+            "longest_session_hours": round(stats["longest_session_seconds"] / 3600, 2)
         }
     
     except Exception as e:
@@ -176,3 +263,23 @@ def calculate_time_stats(activities: List[Dict]) -> Dict[str, Any]:
             "error": str(e)
         }
 
+
+@tool("Calculate Activity Statistics")
+def calculate_time_stats(activities: List[Dict]) -> Dict[str, Any]:
+    """
+    Calculate time distribution statistics from activities.
+    
+    Analyzes activity data to compute:
+    - Total time by application
+    - Time by category (coding, meetings, documentation, etc.)
+    - Most productive hours
+    - Focus session patterns
+    
+    Args:
+        activities: List of activity records from fetch_screenpipe_activities
+    
+    Returns:
+        Dictionary with total_hours, by_application, by_category, by_hour,
+        most_productive_time, focus_sessions and longest_session_hours
+    """
+    return compute_time_stats(activities)
@@ -6,6 +6,7 @@ from .exceptions import (
     ServiceUnavailableException,
     DataCollectionException,
     ReportGenerationException,
+    ReportCancelledException,
     LLMException,
     ConfigurationException,
     ValidationException
@@ -18,6 +19,7 @@ __all__ = [
     'ServiceUnavailableException',
     'DataCollectionException',
     'ReportGenerationException',
+    'ReportCancelledException',
     'LLMException',
     'ConfigurationException',
     'ValidationException',
@@ -0,0 +1,199 @@
+"""Circuit breaker with latency-adaptive timeouts for external services."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import requests
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised instead of calling a service whose circuit is open.
+
+    A ``requests.ConnectionError`` so existing handlers treat it like the
+    service being unreachable.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-service circuit breaker.
+
+    After ``failure_threshold`` consecutive failures (connection errors,
+    timeouts, HTTP 5xx) the circuit opens and calls fail immediately. Once
+    ``reset_seconds`` have passed it turns half-open and lets a single
+    probe call through: success closes the circuit, failure reopens it for
+    another period. A degraded service therefore costs one timeout per
+    reset period instead of one per call.
+
+    Timeouts also adapt to observed latency: with at least ``min_samples``
+    calls to an endpoint, its timeout is ``multiplier`` times their p95
+    latency (never below ``min_timeout`` nor above the caller's timeout).
+    Latency is tracked per endpoint because one service's endpoints can
+    differ by orders of magnitude (vector search vs. LLM-backed query).
+    Timed-out calls count as samples at the time they waited, so the
+    timeout grows again when the service gets slower, and the half-open
+    probe always gets the caller's full timeout; otherwise a service whose
+    latency rose above the adaptive timeout could never close the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30,
+        multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        min_samples: int = 20,
+        window: int = 100
+    ):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Service name (for errors and metrics)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a probe
+            multiplier: Adaptive timeout as a multiple of the latency p95
+            min_timeout: Lower bound of the adaptive timeout in seconds
+            min_samples: Successful calls needed before adapting
+            window: Latency samples kept per endpoint
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Admit or reject a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with the
+                probe call already in flight
+        """
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+        raise CircuitOpenError(f"Circuit open for {self.name} (retry in {retry_in:.0f}s)")
+
+    def record_success(self, latency_seconds: float, endpoint: str = ""):
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._sample(latency_seconds, endpoint)
+            self.failures = 0
+            self._probing = False
+            self.state = CLOSED
+
+    def record_failure(self, latency_seconds: Optional[float] = None, endpoint: str = ""):
+        """
+        Record a failed call; opens the circuit at the threshold or on a failed probe.
+
+        Args:
+            latency_seconds: Time a timed-out call waited, kept as a latency
+                sample (None for failures that say nothing about latency)
+            endpoint: Endpoint the call went to
+        """
+        with self._lock:
+            if latency_seconds is not None:
+                self._sample(latency_seconds, endpoint)
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        """End an admitted call that failed for reasons unrelated to the service."""
+        with self._lock:
+            self._probing = False
+
+    def timeout(self, requested: Optional[float], endpoint: str = "") -> Optional[float]:
+        """
+        Timeout for the next call.
+
+        Args:
+            requested: Caller's timeout in seconds (None for no limit)
+            endpoint: Endpoint the call goes to (e.g. the URL path)
+
+        Returns:
+            The adaptive timeout, capped at the requested one; the
+            requested one for the half-open probe
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                return requested
+        adaptive = self.adaptive_timeout(endpoint)
+        if adaptive is None:
+            return requested
+        if requested is None:
+            return adaptive
+        return min(requested, adaptive)
+
+    def adaptive_timeout(self, endpoint: str = "") -> Optional[float]:
+        """Latency-derived timeout of an endpoint, or None until enough samples exist."""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            latencies = sorted(samples)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return max(self.min_timeout, p95 * self.multiplier)
+
+    def _sample(self, latency_seconds: float, endpoint: str):
+        """Add a latency sample. Caller must hold the lock."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = deque(maxlen=self._window)
+        latencies.append(latency_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and counters.
+
+        Returns:
+            Dictionary with state, consecutive_failures, rejected and
+            adaptive_timeouts (seconds per endpoint, None while learning)
+        """
+        with self._lock:
+            endpoints = list(self._latencies)
+        timeouts = {}
+        for endpoint in endpoints:
+            adaptive = self.adaptive_timeout(endpoint)
+            timeouts[endpoint] = round(adaptive, 3) if adaptive is not None else None
+
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected": self.rejected,
+                "adaptive_timeouts": timeouts
+            }
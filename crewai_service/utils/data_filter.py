@@ -1,11 +1,26 @@
 """Data filtering utilities for sensitive information."""
 
+import multiprocessing
 import re
-from typing import Dict, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from config import settings
 from utils.logger import logger
 
 
+REDACTED = "[REDACTED]"
+
+# Text fields of an activity that may contain sensitive content
+TEXT_FIELDS = ('ocr_text', 'window', 'window_name')
+
+# Process pool for parallel redaction (see settings.FILTER_WORKERS)
+_filter_pool: Optional[ProcessPoolExecutor] = None
+_filter_pool_lock = threading.Lock()
+
+
 def filter_sensitive_activity(activity: Dict) -> Optional[Dict]:
     """
     Filter sensitive information from activity data.
@@ -19,32 +34,96 @@ def filter_sensitive_activity(activity: Dict) -> Optional[Dict]:
     if not activity:
         return None
     
-    filtered = activity.copy()
+    redactor = _get_text_redactor()
+    excluded = _excluded_apps(tuple(settings.EXCLUDED_APPS))
+    return _filter_activity(activity, redactor, excluded)
+
+
+def filter_sensitive_activities(activities: Iterable[Dict]) -> List[Dict]:
+    """
+    Filter a batch of activities.
     
-    # Exclude activities from sensitive apps
-    app_name = filtered.get('app', '')
-    if app_name in settings.EXCLUDED_APPS:
-        logger.debug(f"Excluding activity from sensitive app: {app_name}")
-        return None
+    Same result as calling filter_sensitive_activity on each item, but the
+    redactor and excluded-app set are resolved once per batch. With
+    ``settings.FILTER_WORKERS > 1``, batches of at least
+    ``settings.FILTER_PARALLEL_MIN_ITEMS`` are sharded across a process
+    pool.
+    
+    Activities without sensitive content are returned as-is rather than
+    copied, so callers must not mutate the results in place.
+    
+    Args:
+        activities: Activity records from Screenpipe
+        
+    Returns:
+        Filtered activities, with excluded ones dropped
+    """
+    activities = [activity for activity in activities if activity]
     
-    # Filter OCR text
-    if 'ocr_text' in filtered and filtered['ocr_text']:
-        filtered['ocr_text'] = filter_sensitive_text(filtered['ocr_text'])
+    pool = _get_filter_pool()
+    if pool is not None and len(activities) >= settings.FILTER_PARALLEL_MIN_ITEMS:
+        return _collect_chunks(activities, _submit_chunks(pool, activities))
     
-    # Filter window titles
-    if 'window' in filtered and filtered['window']:
-        filtered['window'] = filter_sensitive_text(filtered['window'])
+    redactor = _get_text_redactor()
+    excluded = _excluded_apps(tuple(settings.EXCLUDED_APPS))
     
-    # Filter window names (alternative field)
-    if 'window_name' in filtered and filtered['window_name']:
-        filtered['window_name'] = filter_sensitive_text(filtered['window_name'])
+    filtered = []
+    for activity in activities:
+        result = _filter_activity(activity, redactor, excluded)
+        if result is not None:
+            filtered.append(result)
     
     return filtered
 
 
+def filter_sensitive_batches(batches: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+    """
+    Filter a stream of activity batches, preserving order.
+    
+    With the process pool enabled, each batch is submitted as soon as it
+    arrives and up to two batches per worker are in flight, so redaction
+    overlaps with fetching the next page. Otherwise batches are filtered
+    in-process one by one.
+    
+    Args:
+        batches: Iterable of activity lists (e.g. Screenpipe pages)
+        
+    Yields:
+        Filtered activity lists, one per input batch
+    """
+    pool = _get_filter_pool()
+    if pool is None:
+        for batch in batches:
+            yield filter_sensitive_activities(batch)
+        return
+    
+    pending = deque()
+    for batch in batches:
+        batch = [activity for activity in batch if activity]
+        pending.append((batch, _submit_chunks(pool, batch)))
+        while len(pending) > settings.FILTER_WORKERS * 2:
+            yield _collect_chunks(*pending.popleft())
+    
+    while pending:
+        yield _collect_chunks(*pending.popleft())
+
+
+def shutdown_filter_pool():
+    """Stop the filter process pool, if one was started."""
+    global _filter_pool
+    with _filter_pool_lock:
+        if _filter_pool is not None:
+            _filter_pool.shutdown(wait=False, cancel_futures=True)
+            _filter_pool = None
+
+
 def filter_sensitive_text(text: str) -> str:
     """
-    Replace sensitive keywords with [REDACTED].
+    Replace sensitive keywords and secret values with [REDACTED].
+    
+    Secret detectors from ``settings.SECRET_DETECTORS`` run first (see
+    SecretDetector), then all keywords are matched case-insensitively in a
+    single pass of one precompiled alternation (see KeywordRedactor).
     
     Args:
         text: Original text
@@ -55,18 +134,438 @@ def filter_sensitive_text(text: str) -> str:
     if not text:
         return text
     
-    filtered = text
+    return _get_text_redactor().redact(text)
+
+
+class KeywordRedactor:
+    """
+    Single-pass, case-insensitive keyword redaction.
+    
+    Keywords are compiled once into one alternation, longest first so
+    overlapping keywords (``pass`` / ``password``) redact the longest
+    match. Python's regex engine tries every alternative at every
+    position, which is slower than plain substring search, so each text
+    is lowercased once and checked with ``in`` (C-speed) first; the
+    pattern only runs on the few texts that contain a keyword.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize redactor.
+        
+        Args:
+            keywords: Sensitive keywords
+        """
+        unique = sorted({keyword for keyword in keywords if keyword}, key=len, reverse=True)
+        self.keywords = tuple(unique)
+        self._lowered = tuple(dict.fromkeys(keyword.lower() for keyword in unique))
+        self._pattern = (
+            re.compile("|".join(re.escape(keyword) for keyword in unique), re.IGNORECASE)
+            if unique else None
+        )
+    
+    def redact(self, text: str, lowered: Optional[str] = None) -> str:
+        """
+        Replace keywords with [REDACTED].
+        
+        Args:
+            text: Original text
+            lowered: ``text.lower()`` if the caller already computed it
+            
+        Returns:
+            Redacted text (the same object if nothing matched)
+        """
+        if self._pattern is None or not text:
+            return text
+        
+        if lowered is None:
+            lowered = text.lower()
+        if not any(keyword in lowered for keyword in self._lowered):
+            return text
+        
+        return self._pattern.sub(REDACTED, text)
+
+
+class SecretDetector:
+    """
+    Detects one kind of secret value (API key, token, card number...).
+    
+    Running many full regexes over every OCR frame would dominate
+    filtering cost, so each detector has a cheap prefilter:
+    
+    - ``anchors``: literal prefixes the secret must start with. Their
+      positions are found with ``str.find`` (C-speed) and the pattern is
+      only matched, anchored, at those positions.
+    - ``charset``/``min_count``: a character-count gate (``str.count``,
+      C-speed) for secrets without a fixed prefix, e.g. at least 13
+      digits for a card number.
+    - ``gate``: a simple character class pattern that yields candidate
+      spans; the full ``pattern`` and ``validator`` only run inside them.
+    
+    Texts that fail the prefilter cost a few substring scans per detector,
+    so filtering cost per MB stays bounded no matter how many detectors
+    are enabled.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        anchors: Tuple[str, ...] = (),
+        gate: Optional[str] = None,
+        charset: str = "",
+        min_count: int = 0,
+        validator: Optional[Callable[[str], bool]] = None,
+        ignore_case: bool = False
+    ):
+        """
+        Initialize detector.
+        
+        Args:
+            name: Detector name used in ``settings.SECRET_DETECTORS``
+            pattern: Regex for the secret; only the ``secret`` group is
+                redacted if the pattern defines one
+            anchors: Literal prefixes where a match can start
+            gate: Cheap regex producing candidate spans (when no anchors)
+            charset: Characters counted by the prefilter
+            min_count: Minimum number of ``charset`` characters in a text
+            validator: Optional check on the matched secret (e.g. Luhn)
+            ignore_case: Match anchors and pattern case-insensitively
+        """
+        self.name = name
+        self.anchors = tuple(anchor.lower() for anchor in anchors) if ignore_case else tuple(anchors)
+        self.ignore_case = ignore_case
+        self.charset = charset
+        self.min_count = min_count
+        self.validator = validator
+        flags = re.IGNORECASE | re.DOTALL if ignore_case else re.DOTALL
+        self._pattern = re.compile(pattern, flags)
+        self._gate = re.compile(gate) if gate else None
+        self._group = "secret" if "secret" in self._pattern.groupindex else 0
+    
+    def find(self, text: str, lowered: Optional[str] = None) -> List[Tuple[int, int]]:
+        """
+        Find secret spans in a text.
+        
+        Args:
+            text: Text to scan
+            lowered: ``text.lower()`` if already computed
+            
+        Returns:
+            Sorted list of (start, end) spans to redact
+        """
+        spans = []
+        
+        if self.charset and sum(map(text.count, self.charset)) < self.min_count:
+            return spans
+        
+        if self.anchors:
+            haystack = text
+            if self.ignore_case:
+                haystack = lowered if lowered is not None else text.lower()
+                if len(haystack) != len(text):
+                    # Case mapping changed the length; positions don't line up
+                    return [m.span(self._group) for m in self._pattern.finditer(text) if self._valid(m)]
+            
+            for anchor in self.anchors:
+                position = haystack.find(anchor)
+                while position != -1:
+                    match = self._pattern.match(text, position)
+                    if match and self._valid(match):
+                        spans.append(match.span(self._group))
+                    position = haystack.find(anchor, match.end() if match else position + 1)
+        
+        elif self._gate is not None:
+            for candidate in self._gate.finditer(text):
+                for match in self._pattern.finditer(text, candidate.start(), candidate.end()):
+                    if self._valid(match):
+                        spans.append(match.span(self._group))
+        
+        else:
+            spans = [m.span(self._group) for m in self._pattern.finditer(text) if self._valid(m)]
+        
+        return sorted(spans)
+    
+    def _valid(self, match: "re.Match") -> bool:
+        """Apply the validator to a match."""
+        return self.validator is None or self.validator(match.group(self._group))
+
+
+class TextRedactor:
+    """Secret detectors followed by keyword redaction."""
+    
+    def __init__(self, keywords: KeywordRedactor, detectors: Iterable[SecretDetector] = ()):
+        """
+        Initialize redactor.
+        
+        Args:
+            keywords: Keyword redactor
+            detectors: Enabled secret detectors
+        """
+        self.keywords = keywords
+        self.detectors = tuple(detectors)
+    
+    def redact(self, text: str) -> str:
+        """
+        Redact secrets and keywords.
+        
+        Args:
+            text: Original text
+            
+        Returns:
+            Redacted text (the same object if nothing matched)
+        """
+        if not text:
+            return text
+        
+        lowered = text.lower()
+        spans = []
+        for detector in self.detectors:
+            spans.extend(detector.find(text, lowered))
+        
+        if spans:
+            text = _replace_spans(text, spans)
+            lowered = None
+        
+        return self.keywords.redact(text, lowered)
+
+
+def _replace_spans(text: str, spans: List[Tuple[int, int]]) -> str:
+    """Replace (possibly overlapping) spans with [REDACTED]."""
+    parts = []
+    cursor = 0
+    for start, end in sorted(spans):
+        if end <= cursor:
+            continue
+        start = max(start, cursor)
+        parts.append(text[cursor:start])
+        parts.append(REDACTED)
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts)
+
+
+def _luhn_valid(number: str) -> bool:
+    """Luhn checksum for card numbers (separators ignored)."""
+    digits = [int(ch) for ch in number if ch.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        if index % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+# Built-in detectors, enabled by name through settings.SECRET_DETECTORS
+SECRET_DETECTORS: Dict[str, SecretDetector] = {
+    detector.name: detector for detector in [
+        SecretDetector(
+            "aws_access_key",
+            r"(?:AKIA|ASIA)[0-9A-Z]{16}(?![0-9A-Za-z])",
+            anchors=("AKIA", "ASIA")
+        ),
+        SecretDetector(
+            "github_token",
+            r"(?:gh[pousr]_[A-Za-z0-9]{36,}|github_pat_[A-Za-z0-9_]{40,})",
+            anchors=("gh", "github_pat_")
+        ),
+        SecretDetector(
+            "jwt",
+            r"eyJ[A-Za-z0-9_-]{8,}\.eyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}",
+            anchors=("eyJ",)
+        ),
+        SecretDetector(
+            "bearer_token",
+            r"bearer\s+(?P<secret>[A-Za-z0-9._~+/-]{16,}=*)",
+            anchors=("bearer",),
+            ignore_case=True
+        ),
+        SecretDetector(
+            "private_key",
+            r"-----BEGIN [A-Z ]*PRIVATE KEY-----.*?(?:-----END [A-Z ]*PRIVATE KEY-----|\Z)",
+            anchors=("-----BEGIN",)
+        ),
+        SecretDetector(
+            "credit_card",
+            r"(?<![0-9])[0-9](?:[ -]?[0-9]){12,18}(?![0-9])",
+            gate=r"[0-9][0-9 -]{11,}[0-9]",
+            charset="0123456789",
+            min_count=13,
+            validator=_luhn_valid
+        ),
+    ]
+}
+
+
+def register_secret_detector(detector: SecretDetector):
+    """
+    Add or replace a secret detector.
+    
+    The detector is used once its name is listed in
+    ``settings.SECRET_DETECTORS``.
+    
+    Args:
+        detector: Detector to register
+    """
+    SECRET_DETECTORS[detector.name] = detector
+    _text_redactor.cache_clear()
+
+
+def _filter_activity(
+    activity: Dict,
+    redactor: "TextRedactor",
+    excluded: frozenset
+) -> Optional[Dict]:
+    """Filter one activity with a resolved redactor and excluded-app set."""
+    changes = _field_changes(
+        activity.get('app', ''),
+        [activity.get(field) for field in TEXT_FIELDS],
+        redactor,
+        excluded
+    )
+    return _apply_changes(activity, changes)
+
+
+def _field_changes(app_name: str, values: List[Any], redactor: "TextRedactor", excluded: frozenset):
+    """
+    Redact the text fields of one activity.
+    
+    Returns:
+        False if the app is excluded, None if nothing changed, otherwise a
+        dict of the redacted fields
+    """
+    # Exclude activities from sensitive apps
+    if app_name in excluded:
+        return False
+    
+    # Filter OCR text and window titles
+    changes = None
+    for field, value in zip(TEXT_FIELDS, values):
+        if value:
+            redacted = redactor.redact(value)
+            if redacted != value:
+                if changes is None:
+                    changes = {}
+                changes[field] = redacted
+    
+    return changes
+
+
+def _apply_changes(activity: Dict, changes) -> Optional[Dict]:
+    """Build the filtered activity, copying it only when a field changed."""
+    if changes is False:
+        logger.debug(f"Excluding activity from sensitive app: {activity.get('app', '')}")
+        return None
+    if not changes:
+        return activity
+    
+    filtered = activity.copy()
+    filtered.update(changes)
+    return filtered
+
+
+def _get_filter_pool() -> Optional[ProcessPoolExecutor]:
+    """Lazily start the filter process pool when ``FILTER_WORKERS > 1``."""
+    global _filter_pool
+    if settings.FILTER_WORKERS <= 1:
+        return None
+    
+    with _filter_pool_lock:
+        if _filter_pool is None:
+            # spawn: forking a process that runs threads is unsafe
+            _filter_pool = ProcessPoolExecutor(
+                max_workers=settings.FILTER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Started redaction process pool with {settings.FILTER_WORKERS} workers")
+        return _filter_pool
+
+
+def _submit_chunks(pool: ProcessPoolExecutor, activities: List[Dict]) -> List[Future]:
+    """
+    Submit activities to the pool in chunks of ``settings.FILTER_CHUNK_SIZE``.
+    
+    Only the app name and text fields are pickled, and workers send back
+    just the changed fields, so IPC stays small compared to whole dicts.
+    """
+    config = (
+        tuple(settings.SENSITIVE_KEYWORDS),
+        tuple(settings.SECRET_DETECTORS),
+        tuple(settings.EXCLUDED_APPS)
+    )
+    size = max(1, settings.FILTER_CHUNK_SIZE)
     
-    # Check each sensitive keyword
-    for keyword in settings.SENSITIVE_KEYWORDS:
-        if keyword.lower() in filtered.lower():
-            # Case-insensitive replacement
-            pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-            filtered = pattern.sub("[REDACTED]", filtered)
+    futures = []
+    for start in range(0, len(activities), size):
+        rows = [
+            (activity.get('app', ''),) + tuple(activity.get(field) for field in TEXT_FIELDS)
+            for activity in activities[start:start + size]
+        ]
+        futures.append(pool.submit(_filter_chunk, rows, *config))
+    
+    return futures
+
+
+def _collect_chunks(activities: List[Dict], futures: List[Future]) -> List[Dict]:
+    """Apply chunk results from the pool in submission order."""
+    filtered = []
+    position = 0
+    
+    for future in futures:
+        for changes in future.result():
+            result = _apply_changes(activities[position], changes)
+            if result is not None:
+                filtered.append(result)
+            position += 1
     
     return filtered
 
 
+def _filter_chunk(
+    rows: List[Tuple],
+    keywords: Tuple[str, ...],
+    detector_names: Tuple[str, ...],
+    excluded_apps: Tuple[str, ...]
+) -> List[Any]:
+    """
+    Worker entry point: redact a chunk of (app, *text fields) rows.
+    
+    Runs in a pool process, so detectors added at runtime in the parent
+    with register_secret_detector are not available here.
+    """
+    redactor = _text_redactor(keywords, detector_names)
+    excluded = _excluded_apps(excluded_apps)
+    return [_field_changes(row[0], row[1:], redactor, excluded) for row in rows]
+
+
+def _get_text_redactor() -> "TextRedactor":
+    """Redactor for the current keyword and detector settings."""
+    return _text_redactor(
+        tuple(settings.SENSITIVE_KEYWORDS),
+        tuple(settings.SECRET_DETECTORS)
+    )
+
+
+@lru_cache(maxsize=8)
+def _text_redactor(keywords: Tuple[str, ...], detector_names: Tuple[str, ...]) -> "TextRedactor":
+    """Redactor for a configuration, built once per distinct keyword/detector tuple."""
+    unknown = [name for name in detector_names if name not in SECRET_DETECTORS]
+    if unknown:
+        logger.warning(f"Ignoring unknown secret detectors: {', '.join(unknown)}")
+    detectors = [SECRET_DETECTORS[name] for name in detector_names if name in SECRET_DETECTORS]
+    return TextRedactor(KeywordRedactor(keywords), detectors)
+
+
+@lru_cache(maxsize=8)
+def _excluded_apps(apps: Tuple[str, ...]) -> frozenset:
+    """Excluded app names as a set for O(1) lookups."""
+    return frozenset(apps)
+
+
 def sanitize_for_llm(data: Dict) -> Dict:
     """
     Additional sanitization for data sent to LLM.
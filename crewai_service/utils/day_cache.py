@@ -0,0 +1,187 @@
+"""Day Cache - Persistent per-day cache of collected data and daily summaries."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from config import settings
+from utils.logger import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_data (
+    source TEXT NOT NULL,
+    day TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    items INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (source, day, fingerprint)
+);
+CREATE TABLE IF NOT EXISTS day_summaries (
+    key TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_day_summaries_day ON day_summaries (day);
+"""
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Hash JSON-serializable parts into a stable cache key.
+
+    Args:
+        parts: Values identifying the cached content
+
+    Returns:
+        SHA-256 hex digest
+    """
+    serialized = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class DayCache:
+    """
+    SQLite cache of per-day data, so reports covering overlapping weeks
+    only fetch and summarize the days they have not seen.
+
+    ``day_data`` holds the collected items of one source for one day under
+    a source fingerprint (service location and filter settings); only
+    complete, past days should be stored. ``day_summaries`` is
+    content-addressed: the key hashes the day's data together with the
+    model and prompt version, so changed data or prompts simply miss.
+    Payloads are zlib-compressed JSON.
+    """
+
+    def __init__(self, path: str, retention_days: int = 60):
+        """
+        Open (and create) the cache database.
+
+        Args:
+            path: SQLite file path
+            retention_days: Days older than this are pruned on open
+        """
+        self.path = os.path.expanduser(path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.prune()
+
+    def get_day_data(self, source: str, day: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load the cached items of a source for one day.
+
+        Args:
+            source: Data source name (e.g. "activities")
+            day: ISO date
+            fingerprint: Source fingerprint
+
+        Returns:
+            Cached items, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM day_data WHERE source = ? AND day = ? AND fingerprint = ?",
+                (source, day, fingerprint)
+            ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def put_day_data(self, source: str, day: str, fingerprint: str, items: List[Dict[str, Any]]):
+        """
+        Store the items of a source for one complete day.
+
+        Args:
+            source: Data source name
+            day: ISO date
+            fingerprint: Source fingerprint
+            items: All items of that day (may be empty)
+        """
+        payload = _encode(items)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO day_data VALUES (?, ?, ?, ?, ?, ?)",
+                (source, day, fingerprint, len(items), payload, time.time())
+            )
+
+    def get_summary(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached daily summary.
+
+        Args:
+            key: Content key (see content_key)
+
+        Returns:
+            Cached summary, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM day_summaries WHERE key = ?", (key,)
+            ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def put_summary(self, key: str, day: str, summary: Dict[str, Any]):
+        """
+        Store a daily summary.
+
+        Args:
+            key: Content key (see content_key)
+            day: ISO date the summary covers
+            summary: Summary dictionary
+        """
+        payload = _encode(summary)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO day_summaries VALUES (?, ?, ?, ?)",
+                (key, day, payload, time.time())
+            )
+
+    def prune(self):
+        """Delete entries for days older than the retention period."""
+        cutoff = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM day_data WHERE day < ?", (cutoff,)).rowcount
+            removed += self._conn.execute("DELETE FROM day_summaries WHERE day < ?", (cutoff,)).rowcount
+        if removed:
+            logger.info(f"Pruned {removed} day cache entries before {cutoff}")
+
+
+@lru_cache(maxsize=1)
+def get_day_cache() -> Optional[DayCache]:
+    """
+    Get the shared day cache under ``settings.REPORTS_DIR``.
+
+    Returns:
+        DayCache instance, or None if disabled or it cannot be opened
+    """
+    if not settings.DAY_CACHE_ENABLED:
+        return None
+
+    path = os.path.join(os.path.expanduser(settings.REPORTS_DIR), "day_cache.sqlite3")
+    try:
+        return DayCache(path, settings.DAY_CACHE_RETENTION_DAYS)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Day cache unavailable at {path}: {e}")
+        return None
+
+
+def _encode(value: Any) -> bytes:
+    """Compress a JSON-serializable value."""
+    return zlib.compress(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def _decode(payload: bytes) -> Any:
+    """Inverse of _encode."""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
@@ -24,6 +24,11 @@ class ReportGenerationException(CrewAIServiceException):
     pass
 
 
+class ReportCancelledException(CrewAIServiceException):
+    """Report generation was cancelled by the client."""
+    pass
+
+
 class LLMException(CrewAIServiceException):
     """LLM API call failed."""
     pass
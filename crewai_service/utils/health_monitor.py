@@ -0,0 +1,205 @@
+"""Health Monitor - Background probing of external services."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from utils.http_client import get_http_client
+from utils.logger import logger
+
+
+class HealthMonitor:
+    """
+    Probes external services on an interval and keeps their status in memory.
+
+    Every ``interval_seconds`` all services are probed concurrently. Each
+    keeps a rolling window of the last ``window`` probes, from which
+    availability and latency percentiles are computed once per round, so
+    readers (``/api/health``, the data collector) only copy a prepared
+    snapshot. A service whose last ``down_after_failures`` probes failed is
+    "known down" until a probe succeeds again.
+    """
+
+    def __init__(
+        self,
+        services: Dict[str, str],
+        interval_seconds: float = 15,
+        timeout: float = 3,
+        window: int = 40,
+        down_after_failures: int = 2
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            services: Mapping of service name -> base URL (probed at /health)
+            interval_seconds: Seconds between probe rounds
+            timeout: Per-probe timeout in seconds
+            window: Probes kept per service
+            down_after_failures: Consecutive failures that mark a service down
+        """
+        self.services = services
+        self.interval_seconds = interval_seconds
+        self.timeout = timeout
+        self.down_after_failures = down_after_failures
+        self._samples: Dict[str, Deque[Tuple[float, bool, float]]] = {
+            name: deque(maxlen=window) for name in services
+        }
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background probe loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Health monitor started for {', '.join(self.services)} "
+                f"(every {self.interval_seconds}s)"
+            )
+
+    async def stop(self):
+        """Stop the background probe loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe_all(self):
+        """Probe every service once, concurrently, and refresh the snapshot."""
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._probe, url) for url in self.services.values()
+        ))
+        for name, (ok, latency_ms) in zip(self.services, results):
+            self.record(name, ok, latency_ms)
+
+    def record(self, name: str, ok: bool, latency_ms: float):
+        """
+        Add a probe result and refresh the service's snapshot.
+
+        Args:
+            name: Service name
+            ok: Whether the probe succeeded
+            latency_ms: Probe latency in milliseconds
+        """
+        with self._lock:
+            samples = self._samples[name]
+            was_down = self._snapshot.get(name, {}).get("known_down", False)
+            samples.append((time.time(), ok, latency_ms))
+            self._snapshot[name] = self._summarize(name, samples)
+            is_down = self._snapshot[name]["known_down"]
+
+        if is_down != was_down:
+            if is_down:
+                logger.warning(f"{name} marked down after {self.down_after_failures} failed probes")
+            else:
+                logger.info(f"{name} is reachable again")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest status of every probed service.
+
+        Returns:
+            Mapping of service name -> status (empty before the first probe)
+        """
+        with self._lock:
+            return {name: dict(status) for name, status in self._snapshot.items()}
+
+    def is_known_down(self, name: str) -> bool:
+        """
+        Check whether recent probes found a service down.
+
+        Stale results (older than three intervals, e.g. when the monitor
+        is not running) never count as down.
+
+        Args:
+            name: Service name
+
+        Returns:
+            True if the service should be skipped
+        """
+        with self._lock:
+            status = self._snapshot.get(name)
+        if status is None or not status["known_down"]:
+            return False
+        return time.time() - status["checked_at"] <= 3 * self.interval_seconds
+
+    def known_down(self) -> Set[str]:
+        """Names of services currently known down."""
+        return {name for name in self.services if self.is_known_down(name)}
+
+    async def _run(self):
+        """Probe loop."""
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def _probe(self, url: str) -> Tuple[bool, float]:
+        """Probe a service's /health endpoint (runs in a worker thread)."""
+        started = time.perf_counter()
+        try:
+            # Probes bypass the circuit breakers so they keep measuring
+            response = get_http_client().get(
+                f"{url}/health", use_breaker=False, timeout=self.timeout
+            )
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        return ok, (time.perf_counter() - started) * 1000
+
+    def _summarize(self, name: str, samples: Deque[Tuple[float, bool, float]]) -> Dict[str, Any]:
+        """Status of a service from its probe window."""
+        checked_at, ok, latency_ms = samples[-1]
+        latencies = sorted(latency for _, success, latency in samples if success)
+
+        failures = 0
+        for _, success, _ in reversed(samples):
+            if success:
+                break
+            failures += 1
+
+        return {
+            "available": ok,
+            "url": self.services[name],
+            "response_time_ms": round(latency_ms, 2),
+            "checked_at": checked_at,
+            "availability": round(sum(1 for _, success, _ in samples if success) / len(samples), 3),
+            "latency_ms": {
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "p99": _percentile(latencies, 99)
+            },
+            "probes": len(samples),
+            "consecutive_failures": failures,
+            "known_down": failures >= self.down_after_failures
+        }
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values (None if empty)."""
+    if not values:
+        return None
+    rank = max(0, -(-len(values) * percent // 100) - 1)
+    return round(values[int(rank)], 2)
+
+
+# Shared monitor of the services the collector depends on; started with the app
+health_monitor = HealthMonitor(
+    {
+        "screenpipe": settings.SCREENPIPE_URL,
+        "minecontext": settings.MINECONTEXT_URL
+    },
+    interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    window=settings.HEALTH_WINDOW_SAMPLES,
+    down_after_failures=settings.HEALTH_DOWN_AFTER_FAILURES
+)
@@ -0,0 +1,255 @@
+"""Shared HTTP clients - one keep-alive session per service host."""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import settings
+from utils.circuit_breaker import CircuitBreaker
+from utils.logger import logger
+
+
+class HttpClientPool:
+    """
+    Keep-alive ``requests.Session`` per host with bounded connection pools.
+
+    Tools previously called ``requests.get/post`` directly, opening a new
+    TCP connection per call. Sessions here are shared by all threads; the
+    underlying urllib3 pools are thread-safe and keep up to
+    ``pool_maxsize`` idle connections per host for reuse.
+
+    Every host also gets a circuit breaker (see utils.circuit_breaker)
+    that rejects calls while the service is failing and shortens timeouts
+    to its observed latency.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, pool_block: bool = False):
+        """
+        Initialize client pool.
+
+        Args:
+            pool_maxsize: Connections kept per host
+            pool_block: Wait for a free connection instead of opening an
+                extra, non-pooled one when all are busy
+        """
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._sessions: Dict[str, requests.Session] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        use_breaker: bool = True,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request through the session of the URL's host.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            use_breaker: Go through the host's circuit breaker and adaptive
+                timeout (health probes opt out)
+            **kwargs: Passed to ``requests.Session.request``
+
+        Returns:
+            Response
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+            requests.RequestException: On connection errors and timeouts
+        """
+        session, metrics, breaker = self._session(_host_of(url))
+        endpoint = urlsplit(url).path
+
+        if use_breaker:
+            breaker.before_call()
+            timeout = kwargs.get("timeout")
+            if timeout is None or isinstance(timeout, (int, float)):
+                kwargs["timeout"] = breaker.timeout(timeout, endpoint)
+
+        started = time.perf_counter()
+        with self._lock:
+            metrics["in_flight"] += 1
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            with self._lock:
+                metrics["errors"] += 1
+            if use_breaker:
+                # A timeout tells how long the call took at least
+                waited = time.perf_counter() - started if isinstance(e, requests.Timeout) else None
+                breaker.record_failure(waited, endpoint)
+            raise
+        except BaseException:
+            if use_breaker:
+                breaker.release()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                metrics["in_flight"] -= 1
+                metrics["requests"] += 1
+                metrics["total_seconds"] += elapsed
+
+        if use_breaker:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success(elapsed, endpoint)
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request (see request)."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request (see request)."""
+        return self.request("POST", url, **kwargs)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Circuit breaker of a URL's host."""
+        return self._session(_host_of(url))[2]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-host pool metrics.
+
+        Returns:
+            Mapping of host -> requests, errors, in_flight, avg_ms,
+            connections_opened, connections_reused, idle_connections and
+            circuit (breaker state)
+        """
+        with self._lock:
+            hosts = {
+                host: (self._sessions[host], dict(metrics), self._breakers[host])
+                for host, metrics in self._metrics.items()
+            }
+
+        stats = {}
+        for host, (session, metrics, breaker) in hosts.items():
+            opened, served, idle = _pool_counters(session)
+            stats[host] = {
+                "requests": int(metrics["requests"]),
+                "errors": int(metrics["errors"]),
+                "in_flight": int(metrics["in_flight"]),
+                "avg_ms": round(metrics["total_seconds"] / metrics["requests"] * 1000, 2)
+                if metrics["requests"] else 0.0,
+                "connections_opened": opened,
+                "connections_reused": max(0, served - opened),
+                "idle_connections": idle,
+                "circuit": breaker.stats()
+            }
+        return stats
+
+    def close(self):
+        """Close all sessions and their pooled connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._metrics.clear()
+            self._breakers.clear()
+        for session in sessions:
+            session.close()
+
+    def _session(self, host: str) -> Tuple[requests.Session, Dict[str, float], CircuitBreaker]:
+        """Get or create the session of a host, its metrics and breaker."""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_maxsize,
+                    pool_block=self.pool_block
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._metrics[host] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "in_flight": 0,
+                    "total_seconds": 0.0
+                }
+                self._breakers[host] = CircuitBreaker(
+                    host,
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+                    multiplier=settings.ADAPTIVE_TIMEOUT_MULTIPLIER,
+                    min_timeout=settings.ADAPTIVE_TIMEOUT_MIN_SECONDS
+                )
+            return session, self._metrics[host], self._breakers[host]
+
+
+_client: Optional[HttpClientPool] = None
+_client_lock = threading.Lock()
+
+
+def init_http_clients() -> HttpClientPool:
+    """
+    Create the shared client pool (called at application startup).
+
+    Returns:
+        HttpClientPool instance
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClientPool(
+                pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                pool_block=settings.HTTP_POOL_BLOCK
+            )
+            logger.info(f"HTTP client pool ready ({settings.HTTP_POOL_MAXSIZE} connections per host)")
+        return _client
+
+
+def get_http_client() -> HttpClientPool:
+    """
+    Get the shared client pool, creating it on first use outside the app.
+
+    Returns:
+        HttpClientPool instance
+    """
+    return _client or init_http_clients()
+
+
+def close_http_clients():
+    """Close the shared client pool (called at application shutdown)."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+def _host_of(url: str) -> str:
+    """scheme://host[:port] of a URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _pool_counters(session: requests.Session) -> Tuple[int, int, int]:
+    """(connections opened, requests served, idle connections) from urllib3 pools."""
+    opened = served = idle = 0
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            served += pool.num_requests
+            if pool.pool is not None:
+                # The queue is pre-filled with None placeholders
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return opened, served, idle
@@ -0,0 +1,250 @@
+"""LLM Cache - On-disk cache of LLM responses for unchanged prompts."""
+
+import ast
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from config import settings
+from utils.day_cache import content_key
+from utils.logger import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    generations TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at);
+"""
+
+# Model parameters that change the response; everything else in the
+# serialized model (callbacks, streaming, API key) is ignored
+_MODEL_PARAMS = ("model_name", "model", "temperature", "max_tokens")
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LangChain cache storing LLM responses in SQLite.
+
+    Entries are keyed on the normalized prompt messages, the model name,
+    temperature and max tokens, and the call parameters (e.g. stop
+    sequences), so a rerun with unchanged inputs (a retried report, the
+    review and export stages of a regenerated one) skips the API call.
+    Entries expire after ``ttl_seconds``; beyond ``max_entries`` the least
+    recently used are evicted.
+
+    Streaming callbacks receive no tokens for cached responses; the
+    complete output is returned at once.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 0, max_entries: int = 0):
+        """
+        Open (and create) the cache database.
+
+        Args:
+            path: SQLite file path
+            ttl_seconds: Entry lifetime (0 keeps entries until evicted)
+            max_entries: Maximum stored responses (0 for no limit)
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Return cached generations for a prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key)
+                )
+
+        return [_decode_generation(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]):
+        """Store the generations of a prompt."""
+        key = self._key(prompt, llm_string)
+        generations = json.dumps([_encode_generation(generation) for generation in return_val])
+        now = time.time()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                (key, generations, now, now)
+            )
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self, **kwargs: Any):
+        """Delete all cached responses."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries
+            }
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        """Cache key from the normalized prompt and the response-relevant parameters."""
+        return content_key(_normalize_prompt(prompt), *_parse_llm_string(llm_string))
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> Optional[SQLiteLLMCache]:
+    """
+    Get the shared LLM response cache (``settings.LLM_CACHE_PATH``).
+
+    The pinned langchain-core only consults the global LLM cache (a
+    model's ``cache`` field is a flag), so the cache is registered with
+    ``set_llm_cache`` when first opened.
+
+    Returns:
+        SQLiteLLMCache instance, or None if disabled or it cannot be opened
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+
+    try:
+        cache = SQLiteLLMCache(
+            settings.LLM_CACHE_PATH,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"LLM cache unavailable at {settings.LLM_CACHE_PATH}: {e}")
+        return None
+
+    set_llm_cache(cache)
+    logger.info(f"LLM response cache enabled at {cache.path}")
+    return cache
+
+
+def _normalize_prompt(prompt: str) -> Any:
+    """
+    Reduce serialized chat messages to (type, content) pairs.
+
+    Message ids and other metadata are dropped and trailing whitespace is
+    stripped from every line, so formatting noise does not defeat the
+    cache. Prompts that are not serialized messages are used as-is.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt.strip()
+
+    if not isinstance(messages, list):
+        return prompt.strip()
+
+    normalized: List[Any] = []
+    for message in messages:
+        if not isinstance(message, dict):
+            normalized.append(message)
+            continue
+        if "kwargs" in message:
+            # Serialized message: class path in "id", fields in "kwargs"
+            kind, content = message.get("id", [""])[-1], message["kwargs"].get("content")
+        else:
+            kind, content = message.get("type"), message.get("content")
+        if isinstance(content, str):
+            content = "\n".join(line.rstrip() for line in content.strip().splitlines())
+        normalized.append([kind, content])
+    return normalized
+
+
+def _parse_llm_string(llm_string: str) -> List[Any]:
+    """
+    Extract model parameters and call parameters from LangChain's llm_string.
+
+    For serializable models the string is ``<model JSON>---<call params>``.
+    Falls back to the raw string for other formats.
+    """
+    model_json, separator, call_params = llm_string.rpartition("---")
+    if not separator:
+        return [llm_string]
+
+    try:
+        model_kwargs = json.loads(model_json).get("kwargs", {})
+    except (ValueError, AttributeError):
+        return [llm_string]
+
+    params = {name: model_kwargs.get(name) for name in _MODEL_PARAMS if name in model_kwargs}
+    try:
+        call = dict(ast.literal_eval(call_params))
+    except (ValueError, SyntaxError, TypeError):
+        call = call_params
+    return [params, call]
+
+
+def _encode_generation(generation: Generation) -> Dict[str, Any]:
+    """Serialize a generation (chat generations keep their message)."""
+    encoded = {"text": generation.text, "generation_info": generation.generation_info}
+    if isinstance(generation, ChatGeneration):
+        encoded["message"] = message_to_dict(generation.message)
+    return encoded
+
+
+def _decode_generation(encoded: Dict[str, Any]) -> Generation:
+    """Inverse of _encode_generation."""
+    if "message" in encoded:
+        return ChatGeneration(
+            message=messages_from_dict([encoded["message"]])[0],
+            generation_info=encoded["generation_info"]
+        )
+    return Generation(text=encoded["text"], generation_info=encoded["generation_info"])
@@ -1,14 +1,47 @@
 """LLM configuration for CrewAI agents."""
 
+from typing import Any, Callable, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_openai import ChatOpenAI
 from config import settings
+from utils.llm_cache import get_response_cache
 from utils.logger import logger
 
 
-def get_llm():
+class StreamingTokenHandler(BaseCallbackHandler):
+    """LangChain callback that forwards each generated token to a callable."""
+    
+    def __init__(self, on_token: Callable[[str], None]):
+        """
+        Initialize handler.
+        
+        Args:
+            on_token: Called with every new token as it is generated
+        """
+        self.on_token = on_token
+    
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        """Forward a newly generated token."""
+        if token:
+            self.on_token(token)
+
+
+def get_llm(
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+    max_tokens: Optional[int] = None
+):
     """
     Get configured LLM instance for CrewAI agents.
     
+    With ``settings.LLM_CACHE_ENABLED`` the model uses the shared on-disk
+    response cache (see utils.llm_cache).
+    
+    Args:
+        callbacks: Optional LangChain callbacks; when given, the model
+            streams its output so handlers receive tokens as they arrive
+        max_tokens: Completion limit (defaults to ``settings.LLM_MAX_TOKENS``)
+    
     Returns:
         ChatOpenAI instance configured with SiliconFlow API
     """
@@ -20,6 +53,10 @@ def get_llm():
         openai_api_base=settings.LLM_BASE_URL,
         openai_api_key=settings.SILICONFLOW_API_KEY,
         temperature=settings.LLM_TEMPERATURE,
-        max_tokens=settings.LLM_MAX_TOKENS
+        max_tokens=max_tokens or settings.LLM_MAX_TOKENS,
+        streaming=bool(callbacks),
+        callbacks=callbacks,
+        # True requires the registered cache; None leaves caching off
+        cache=True if get_response_cache() is not None else None
     )
 
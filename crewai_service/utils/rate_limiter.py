@@ -0,0 +1,78 @@
+"""Rate limiting for direct LLM calls made outside a crew."""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter (max calls per minute).
+
+    crewai enforces ``max_rpm`` inside a crew only; calls made directly
+    with the LLM (e.g. per-day summaries) go through this limiter instead
+    so they respect the same ``CREW_MAX_RPM`` budget.
+    """
+
+    def __init__(self, max_per_minute: int):
+        """
+        Initialize limiter.
+
+        Args:
+            max_per_minute: Maximum calls started in any 60-second window
+        """
+        self.max_per_minute = max(1, max_per_minute)
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a call may start.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_per_minute:
+                    self._calls.append(now)
+                    return True
+                wait = 60 - (now - self._calls[0])
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+_limiters: Dict[int, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(max_per_minute: int) -> RateLimiter:
+    """
+    Get the process-wide limiter for a given rate.
+
+    Shared so concurrent report generations draw from one budget.
+
+    Args:
+        max_per_minute: Maximum calls per minute
+
+    Returns:
+        RateLimiter instance
+    """
+    with _limiters_lock:
+        if max_per_minute not in _limiters:
+            _limiters[max_per_minute] = RateLimiter(max_per_minute)
+        return _limiters[max_per_minute]
@@ -0,0 +1,197 @@
+"""Search Cache - In-memory cache of MineContext search results."""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from config import settings
+from utils.logger import logger
+
+
+class SearchCache:
+    """
+    TTL + LRU cache of MineContext search and query results.
+
+    Reports, retries and ``get_context`` lookups repeat the same queries
+    over the same date ranges; cached results skip MineContext's vector
+    search. Entries expire after ``ttl_seconds`` and beyond
+    ``max_entries`` the least recently used are evicted.
+
+    MineContext only changes when the Screenpipe sync script ingests new
+    activities, which it records by advancing the watermark in its state
+    file. The whole cache is dropped when that watermark moves, so results
+    are never older than the last ingestion (ingested documents can belong
+    to any topic, and the documents' dates do not tell which ranges they
+    affect).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        watermark_path: Optional[str] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum cached results (0 for no limit)
+            ttl_seconds: Entry lifetime (0 keeps entries until evicted)
+            watermark_path: Sync state file whose ``last_frame_id`` marks
+                ingestion progress (None disables invalidation)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.watermark_path = os.path.expanduser(watermark_path) if watermark_path else None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._watermark: Any = None
+        self._state_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached result.
+
+        Args:
+            key: Cache key (see search_key)
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        self._check_watermark()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a result.
+
+        Args:
+            key: Cache key (see search_key)
+            value: Result to cache (treated as read-only by callers)
+        """
+        self._check_watermark()
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if self.max_entries:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries, invalidations
+            and the current watermark
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "invalidations": self.invalidations,
+                "watermark": self._watermark
+            }
+
+    def _check_watermark(self):
+        """Clear the cache if the sync script advanced its watermark."""
+        if self.watermark_path is None:
+            return
+
+        try:
+            mtime = os.stat(self.watermark_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        # The state file is only parsed when it was rewritten
+        with self._lock:
+            if mtime == self._state_mtime:
+                return
+            self._state_mtime = mtime
+
+        watermark = _read_watermark(self.watermark_path) if mtime is not None else None
+
+        with self._lock:
+            if watermark == self._watermark:
+                return
+            first_read = self._watermark is None and not self._entries
+            self._watermark = watermark
+            self._entries.clear()
+            if not first_read:
+                self.invalidations += 1
+
+        if not first_read:
+            logger.info(f"MineContext ingestion watermark moved to {watermark}; search cache cleared")
+
+
+def search_key(kind: str, query: str, top_k: int, *filters: Any) -> Tuple[Any, ...]:
+    """
+    Cache key of a MineContext request.
+
+    Args:
+        kind: Endpoint kind (e.g. "vector", "context")
+        query: Query text (surrounding whitespace ignored)
+        top_k: Requested number of results
+        *filters: Date filters or other request parameters
+
+    Returns:
+        Hashable key
+    """
+    return (kind, query.strip(), top_k) + tuple(filters)
+
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> Optional[SearchCache]:
+    """
+    Get the shared MineContext search cache.
+
+    Returns:
+        SearchCache instance, or None if disabled
+    """
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+
+    return SearchCache(
+        max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+        watermark_path=settings.MINECONTEXT_SYNC_STATE_PATH or None
+    )
+
+
+def _read_watermark(path: str) -> Any:
+    """``last_frame_id`` from the sync state file (None if unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("last_frame_id")
+    except (OSError, ValueError, AttributeError):
+        return None
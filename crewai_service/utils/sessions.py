@@ -0,0 +1,265 @@
+"""Session segmentation for Screenpipe activity streams.
+
+Dependency-free on purpose: also imported by
+scripts/screenpipe/screenpipe_sync.py outside the service.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+# Gap between frames after which the user is considered idle
+DEFAULT_IDLE_GAP_SECONDS = 300.0
+
+# Time credited to the last frame before an idle gap or end of stream
+# (roughly one Screenpipe capture interval)
+DEFAULT_TAIL_SECONDS = 2.0
+
+_FRACTION_RE = re.compile(r"(\.\d{6})\d+")
+
+
+def to_epoch_seconds(value: Any) -> Optional[float]:
+    """
+    Convert a frame timestamp to Unix epoch seconds.
+
+    Accepts datetimes, epoch numbers (seconds or milliseconds) and ISO 8601
+    / SQLite text (``2025-11-03 10:00:00.123+00:00``). Naive values are
+    treated as UTC, which is how Screenpipe stores them.
+
+    Args:
+        value: Timestamp value
+
+    Returns:
+        Epoch seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, (int, float)):
+        # Millisecond timestamps (e.g. the conversations DB)
+        return value / 1000.0 if value > 1e11 else float(value)
+
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        text = _FRACTION_RE.sub(r"\1", text.replace("Z", "+00:00"))
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def to_local_date(value: Any) -> Optional[str]:
+    """
+    Local calendar date of a frame timestamp.
+
+    Args:
+        value: Timestamp value (see to_epoch_seconds)
+
+    Returns:
+        ISO date (YYYY-MM-DD), or None if the value cannot be parsed
+    """
+    ts = to_epoch_seconds(value)
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts).date().isoformat()
+
+
+class Sessionizer:
+    """
+    Streaming splitter that turns ordered frames into activity sessions.
+
+    Frames must arrive in timestamp order. A session closes when the
+    app (and optionally window) changes or when the gap to the next frame
+    exceeds ``idle_gap_seconds``. Each frame is credited the time until
+    the next frame, so a session closed by a switch lasts until the switch;
+    a session closed by idleness or end of stream gets ``tail_seconds``
+    for its last frame. Everything happens in one pass with O(1) state.
+    """
+
+    def __init__(
+        self,
+        idle_gap_seconds: float = DEFAULT_IDLE_GAP_SECONDS,
+        tail_seconds: float = DEFAULT_TAIL_SECONDS,
+        split_on_window: bool = True,
+        text_filter_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize sessionizer.
+
+        Args:
+            idle_gap_seconds: Gap that ends a session as idle
+            tail_seconds: Time credited to a session's final frame
+            split_on_window: Also split when the window title changes
+            text_filter_factory: Optional factory for a per-session object
+                with ``add(text) -> bool`` (e.g. a deduplicator); when set,
+                kept OCR texts are collected in each session's ``texts``
+        """
+        self.idle_gap_seconds = idle_gap_seconds
+        self.tail_seconds = tail_seconds
+        self.split_on_window = split_on_window
+        self.text_filter_factory = text_filter_factory
+        self._current: Optional[Dict[str, Any]] = None
+        self._text_filter = None
+
+    def add(
+        self,
+        timestamp: Any,
+        app: str,
+        window: Optional[str] = None,
+        text: Optional[str] = None,
+        frame_id: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Feed one frame.
+
+        Args:
+            timestamp: Frame timestamp (see to_epoch_seconds)
+            app: Application name
+            window: Window title
+            text: OCR text of the frame
+            frame_id: Frame identifier
+
+        Returns:
+            The session closed by this frame, or None
+        """
+        ts = to_epoch_seconds(timestamp)
+        if ts is None or not app:
+            return None
+
+        window = window or "Unknown Window"
+        closed = None
+        current = self._current
+
+        if current is not None:
+            gap = max(0.0, ts - current["_last_ts"])
+            same_context = current["app"] == app and (
+                not self.split_on_window or current["window"] == window
+            )
+
+            if gap > self.idle_gap_seconds:
+                closed = self._close(current["_last_ts"] + self.tail_seconds)
+            elif not same_context:
+                closed = self._close(ts)
+
+        if self._current is None:
+            self._open(ts, timestamp, app, window, frame_id)
+
+        current = self._current
+        current["_last_ts"] = ts
+        current["end_time"] = timestamp
+        current["last_frame_id"] = frame_id
+        current["frame_count"] += 1
+
+        if self._text_filter is not None and text:
+            if self._text_filter.add(text):
+                current["texts"].append(text)
+            else:
+                current["duplicate_texts"] += 1
+
+        return closed
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Close the open session at end of stream.
+
+        Returns:
+            The final session, or None if nothing is open
+        """
+        if self._current is None:
+            return None
+        return self._close(self._current["_last_ts"] + self.tail_seconds)
+
+    def _open(self, ts: float, timestamp: Any, app: str, window: str, frame_id: Any):
+        """Start a new session."""
+        self._current = {
+            "app": app,
+            "window": window,
+            "start_time": timestamp,
+            "end_time": timestamp,
+            "start_ts": ts,
+            "end_ts": ts,
+            "duration_seconds": 0.0,
+            "first_frame_id": frame_id,
+            "last_frame_id": frame_id,
+            "frame_count": 0,
+            "texts": [],
+            "duplicate_texts": 0,
+            "_last_ts": ts
+        }
+        self._text_filter = self.text_filter_factory() if self.text_filter_factory else None
+
+    def _close(self, end_ts: float) -> Dict[str, Any]:
+        """Finish the open session at ``end_ts``."""
+        session = self._current
+        session.pop("_last_ts")
+        session["end_ts"] = end_ts
+        session["duration_seconds"] = max(0.0, end_ts - session["start_ts"])
+        self._current = None
+        self._text_filter = None
+        return session
+
+
+def sessionize(
+    frames: Iterable[Dict[str, Any]],
+    idle_gap_seconds: float = DEFAULT_IDLE_GAP_SECONDS,
+    tail_seconds: float = DEFAULT_TAIL_SECONDS,
+    split_on_window: bool = True,
+    text_filter_factory: Optional[Callable[[], Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Split ordered activity records into sessions.
+
+    Args:
+        frames: Activity dicts with timestamp, app, window, ocr_text, frame_id
+        idle_gap_seconds: Gap that ends a session as idle
+        tail_seconds: Time credited to a session's final frame
+        split_on_window: Also split when the window title changes
+        text_filter_factory: Optional per-session text filter factory
+
+    Yields:
+        Session records in order
+    """
+    sessionizer = Sessionizer(idle_gap_seconds, tail_seconds, split_on_window, text_filter_factory)
+
+    for frame in frames:
+        closed = sessionizer.add(
+            frame.get("timestamp"),
+            frame.get("app") or frame.get("app_name"),
+            frame.get("window") or frame.get("window_name"),
+            frame.get("ocr_text"),
+            frame.get("frame_id")
+        )
+        if closed is not None:
+            yield closed
+
+    final = sessionizer.flush()
+    if final is not None:
+        yield final
+
+
+def sort_by_timestamp(frames: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order activity records by timestamp, dropping unparseable ones.
+
+    Args:
+        frames: Activity dicts
+
+    Returns:
+        Records in ascending timestamp order
+    """
+    keyed = []
+    for frame in frames:
+        ts = to_epoch_seconds(frame.get("timestamp"))
+        if ts is not None:
+            keyed.append((ts, frame))
+    keyed.sort(key=lambda item: item[0])
+    return [frame for _, frame in keyed]
@@ -0,0 +1,111 @@
+"""Token counting for prompt budgeting (tiktoken with a heuristic fallback)."""
+
+import threading
+from typing import Optional
+
+from config import settings
+from utils.logger import logger
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain-openai
+    tiktoken = None
+
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in a text.
+
+    Uses the tiktoken encoding from ``settings.CONTEXT_TOKENIZER``. It is
+    not the serving model's own tokenizer, but BPE counts are close enough
+    for budgeting. When tiktoken or its encoding file is unavailable
+    (e.g. offline), falls back to an estimate of ~4 ASCII characters or
+    1 CJK character per token.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return estimate_tokens(text)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate tokens without a tokenizer.
+
+    Multi-byte UTF-8 characters (mostly CJK in this data) are counted as a
+    token each, everything else as a quarter token.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    chars = len(text)
+    # Each CJK character adds two extra UTF-8 bytes
+    wide = (len(text.encode("utf-8")) - chars) // 2
+    return wide + (chars - wide + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "...") -> str:
+    """
+    Shorten a text to at most ``max_tokens`` tokens.
+
+    Args:
+        text: Original text
+        max_tokens: Token limit
+        suffix: Marker appended when the text was cut
+
+    Returns:
+        The text, truncated if needed
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:max(0, max_tokens - 1)]) + suffix
+
+    # Binary search on length with the estimator
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) < max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + suffix
+
+
+def _get_encoding() -> Optional["tiktoken.Encoding"]:
+    """Load the tiktoken encoding once; None if unavailable."""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            if tiktoken is not None:
+                try:
+                    _encoding = tiktoken.get_encoding(settings.CONTEXT_TOKENIZER)
+                except Exception as e:
+                    logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+            _encoding_loaded = True
+
+    return _encoding
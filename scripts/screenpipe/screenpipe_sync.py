@@ -1,21 +1,56 @@
 #!/usr/bin/env python3
 """
 Screenpipe → MineContext 同步脚本
-每小时自动同步一次桌面活动数据，实现完整的"记忆→理解"链路
+增量同步桌面活动数据，实现完整的"记忆→理解"链路
+
+同步进度以高水位线（最后同步的 frame id）持久化到本地状态文件，
+每轮从水位线继续按 frame id 顺序分批处理；文档 ID 由 frame id 决定，
+重复摄入同一批数据是幂等的，因此可以每分钟运行一次。
+仍在进行中的最后一个会话不会被摄入，而是记下它的首帧，下一批/下一轮
+从该帧重新读取并继续累积，直到会话因切换或空闲而结束，
+因此一个连续的会话只生成一个文档。
 """
 
 import sqlite3
+import hashlib
+import re
 import requests
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import os
+import sys
 from pathlib import Path
 
+# 复用服务端的会话切分和应用分类逻辑（纯标准库模块，不依赖服务配置）；
+# 通过 utils 包导入，与服务端共用同一份模块
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "crewai_service"))
+from utils.sessions import Sessionizer, to_epoch_seconds
+from utils.app_classifier import AppClassifier
+
 # ============ 配置 ============
 SCREENPIPE_DB = os.path.expanduser("~/.screenpipe/db.sqlite")
 MINECONTEXT_API = "http://127.0.0.1:17860"
-SYNC_INTERVAL = 3600  # 1小时（秒）
+SYNC_STATE_FILE = os.path.expanduser("~/.screenpipe/minecontext_sync_state.json")
+REJECTED_FILE = os.path.expanduser("~/.screenpipe/minecontext_sync_rejected.jsonl")  # 被拒绝文档的死信记录
+SYNC_INTERVAL = 60  # 1分钟（秒）
+INITIAL_LOOKBACK_HOURS = 1  # 首次同步（无水位线）回溯的小时数
+BATCH_SIZE = 2000  # 每批处理的 frame 数
+MAX_BATCHES_PER_CYCLE = 50  # 每轮最多处理的批次数
+SETTLE_SECONDS = 30  # 只同步早于该秒数的 frame，等待 OCR 写入完成
+INGEST_CONCURRENCY = 8  # 并发摄入的请求数（同时也是连接池大小）
+INGEST_TIMEOUT = 10  # 单个摄入请求超时（秒）
+INGEST_RETRIES = 3  # 连接错误 / 429 / 5xx 的重试次数
+INGEST_BACKOFF = 0.5  # 重试退避系数（秒）：0.5, 1, 2...
+NEAR_DUP_ENABLED = True  # 是否启用 SimHash 近似去重
+NEAR_DUP_WINDOW = 8  # 与最近多少个保留文本比较
+NEAR_DUP_THRESHOLD = 3  # 64 位指纹海明距离阈值
+SESSION_IDLE_GAP = 300  # 帧间隔超过该秒数视为空闲，切分会话
+SESSION_TAIL_SECONDS = 2  # 会话最后一帧计入的时长（约一个截屏间隔）
 MIN_CONTEXT_LENGTH = 50  # 最小上下文长度（字符）
 MAX_CONTEXT_LENGTH = 2000  # 最大上下文长度（字符）
 
@@ -45,76 +80,207 @@ def check_minecontext_api():
         print(f"   cd '/Users/ruiwang/Desktop/killer app' && ./start_minecontext.sh")
         return False
 
-# ============ 数据获取 ============
+# ============ 同步状态 ============
 
-def fetch_recent_activities(hours=1):
-    """从 Screenpipe 获取最近的活动"""
+def load_sync_state():
+    """读取同步水位线，不存在时返回 None"""
+    if not os.path.exists(SYNC_STATE_FILE):
+        return None
+    
     try:
-        conn = sqlite3.connect(SCREENPIPE_DB)
-        cursor = conn.cursor()
-        
-        since = datetime.now() - timedelta(hours=hours)
-        since_ts = since.strftime("%Y-%m-%d %H:%M:%S")
-        
-        # 查询最近的 frames 和 OCR 文本
-        query = """
-        SELECT 
-            f.timestamp,
-            f.app_name,
-            f.window_name,
-            o.text as ocr_text
-        FROM frames f
-        LEFT JOIN ocr_text o ON f.id = o.frame_id
-        WHERE f.timestamp > ?
-        ORDER BY f.timestamp DESC
-        """
-        
-        cursor.execute(query, (since_ts,))
-        activities = cursor.fetchall()
-        conn.close()
-        
-        return activities
+        with open(SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  读取同步状态失败，将重新初始化: {e}")
+        return None
+
+def save_sync_state(last_frame_id, last_timestamp, open_session_frame_id=None):
+    """
+    原子写入同步水位线（先写临时文件再替换）
     
-    except sqlite3.Error as e:
-        print(f"❌ 查询 Screenpipe 数据库失败: {e}")
-        return []
+    open_session_frame_id 是尚未结束、还未摄入的最后一个会话的首帧，
+    下一轮从这里重新读取。
+    """
+    state = {
+        "last_frame_id": last_frame_id,
+        "last_timestamp": last_timestamp,
+        "open_session_frame_id": open_session_frame_id,
+        "updated_at": datetime.now().isoformat()
+    }
+    
+    os.makedirs(os.path.dirname(SYNC_STATE_FILE), exist_ok=True)
+    tmp_path = f"{SYNC_STATE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, SYNC_STATE_FILE)
 
-# ============ 数据处理 ============
+# ============ 数据获取 ============
+
+def connect_screenpipe_db():
+    """以只读模式打开 Screenpipe 数据库（不阻塞 Screenpipe 的写入）"""
+    conn = sqlite3.connect(f"file:{SCREENPIPE_DB}?mode=ro", uri=True, timeout=10)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def initial_watermark(conn, hours=INITIAL_LOOKBACK_HOURS):
+    """首次同步：把水位线设在 hours 小时前的第一个 frame 之前"""
+    # Screenpipe 以 RFC 3339 文本存储 UTC 时间戳（2025-11-03T10:00:00.123+00:00），
+    # 不能直接与空格分隔的时间文本比较，用 julianday() 解析后再比较；
+    # 前面按日期前缀粗筛（放宽一天），以便使用 timestamp 索引
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    since_day = (since - timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    row = conn.execute(
+        "SELECT MIN(id) FROM frames WHERE timestamp >= ? AND julianday(timestamp) > julianday(?)",
+        (since_day, since.strftime("%Y-%m-%d %H:%M:%S"))
+    ).fetchone()
+    
+    if row and row[0] is not None:
+        return row[0] - 1
+    
+    # 最近没有活动：从当前最大 id 开始
+    row = conn.execute("SELECT MAX(id) FROM frames").fetchone()
+    return row[0] if row and row[0] is not None else 0
 
-def group_activities_by_context(activities):
+def fetch_activities_after(conn, last_frame_id, limit=BATCH_SIZE):
+    """
+    按 frame id 顺序获取水位线之后的一批活动
+    
+    先在子查询中按 id 截取 limit 个 frame，保证一个 frame 的 OCR
+    行不会被批次边界截断；太新的 frame（OCR 可能尚未写入）留到下一轮。
+    时间戳是 RFC 3339 文本，按 julianday() 解析后比较。
     """
-    将活动按上下文分组
-    同一应用+窗口的连续活动合并为一个上下文
+    query = """
+    WITH batch AS (
+        SELECT id FROM frames
+        WHERE id > ?
+          AND julianday(timestamp) <= julianday('now', ?)
+        ORDER BY id ASC
+        LIMIT ?
+    )
+    SELECT 
+        f.id,
+        f.timestamp,
+        f.app_name,
+        f.window_name,
+        o.text as ocr_text
+    FROM batch b
+    JOIN frames f ON f.id = b.id
+    LEFT JOIN ocr_text o ON f.id = o.frame_id
+    ORDER BY f.id ASC
     """
-    contexts = {}
     
-    for timestamp, app, window, ocr_text in activities:
-        # 跳过空值
-        if not app:
-            continue
-        
-        # 生成上下文键
-        key = f"{app}::{window or 'Unknown Window'}"
-        
-        if key not in contexts:
-            contexts[key] = {
-                "app": app,
-                "window": window or "Unknown Window",
-                "ocr_texts": [],
-                "start_time": timestamp,
-                "end_time": timestamp,
-                "count": 0
-            }
+    return conn.execute(query, (last_frame_id, f"-{SETTLE_SECONDS} seconds", limit)).fetchall()
+
+# ============ 文本去重 ============
+
+_WORD_RE = re.compile(r"\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+def normalize_text(text):
+    """规范化 OCR 文本：去首尾空白并折叠连续空白"""
+    return _SPACE_RE.sub(" ", text).strip()
+
+def text_digest(text):
+    """规范化文本的 64 位内容哈希（精确去重用）"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+def text_features(text):
+    """SimHash 特征：小写单词集合；单词太少（如中文长句）时改用字符三元组"""
+    words = set(_WORD_RE.findall(text.lower()))
+    if len(words) >= 8:
+        return words
+    compact = _SPACE_RE.sub("", text.lower())
+    return {compact[i:i + 3] for i in range(max(1, len(compact) - 2))}
+
+def simhash(text):
+    """64 位 SimHash 指纹：相似文本的指纹海明距离小"""
+    weights = [0] * 64
+    for feature in text_features(text):
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+class TextDeduplicator:
+    """
+    单个上下文内的 OCR 文本去重
+    
+    先用内容哈希集合做 O(1) 精确去重；可选地再与最近 NEAR_DUP_WINDOW 个
+    保留文本的 SimHash 指纹比较，海明距离不超过 NEAR_DUP_THRESHOLD 的
+    视为近似重复（静态屏幕的 OCR 常有个别字符抖动）。每帧成本为常数，
+    整体 O(n)。
+    """
+    
+    def __init__(self, near_dup=NEAR_DUP_ENABLED):
+        self.near_dup = near_dup
+        self.digests = set()
+        self.fingerprints = deque(maxlen=NEAR_DUP_WINDOW)
+        self.duplicates = 0
+    
+    def add(self, text):
+        """文本是新内容时返回 True，重复时返回 False"""
+        digest = text_digest(text)
+        if digest in self.digests:
+            self.duplicates += 1
+            return False
+        self.digests.add(digest)
         
-        # 添加 OCR 文本（去重）
-        if ocr_text and ocr_text.strip():
-            if ocr_text not in contexts[key]["ocr_texts"]:
-                contexts[key]["ocr_texts"].append(ocr_text.strip())
+        if self.near_dup:
+            fingerprint = simhash(text)
+            for previous in self.fingerprints:
+                if bin(fingerprint ^ previous).count("1") <= NEAR_DUP_THRESHOLD:
+                    self.duplicates += 1
+                    return False
+            self.fingerprints.append(fingerprint)
         
-        contexts[key]["end_time"] = timestamp
-        contexts[key]["count"] += 1
+        return True
+
+# ============ 数据处理 ============
+
+def split_into_sessions(activities, batch_full=False, now=None):
+    """
+    将活动切分为会话
+    按 frame 顺序单遍扫描：应用/窗口切换或空闲超过 SESSION_IDLE_GAP 秒时
+    开始新会话，会话时长按帧间隔累计（见 crewai_service/utils/sessions.py）；
+    每个会话内的 OCR 文本经哈希/SimHash 去重
+    
+    最后一个会话可能在下一批继续：只有最后一帧距现在已超过
+    SESSION_IDLE_GAP 秒（空闲结束）时才输出，否则作为未结束会话返回。
+    批次已满且只有这一个会话时仍然输出，避免超长会话让同步停滞。
+    
+    返回 (已结束的会话列表, 未结束的会话或 None)
+    """
+    sessionizer = Sessionizer(
+        idle_gap_seconds=SESSION_IDLE_GAP,
+        tail_seconds=SESSION_TAIL_SECONDS,
+        text_filter_factory=TextDeduplicator
+    )
+    sessions = []
+    
+    for frame_id, timestamp, app, window, ocr_text in activities:
+        text = normalize_text(ocr_text) if ocr_text else ""
+        closed = sessionizer.add(timestamp, app, window, text, frame_id)
+        if closed is not None:
+            sessions.append(closed)
     
-    return list(contexts.values())
+    final = sessionizer.flush()
+    if final is None:
+        return sessions, None
+    
+    now = time.time() if now is None else now
+    last_seen = to_epoch_seconds(final["end_time"])
+    idle_closed = last_seen is not None and now - last_seen > SESSION_IDLE_GAP
+    if idle_closed or (batch_full and not sessions):
+        sessions.append(final)
+        return sessions, None
+    
+    return sessions, final
 
 def filter_contexts(contexts):
     """过滤上下文，移除无意义的内容"""
@@ -122,7 +288,7 @@ def filter_contexts(contexts):
     
     for ctx in contexts:
         # 合并 OCR 文本
-        content = "\n\n".join(ctx["ocr_texts"])
+        content = "\n\n".join(ctx["texts"])
         
         # 跳过过短的内容
         if len(content) < MIN_CONTEXT_LENGTH:
@@ -139,95 +305,258 @@ def filter_contexts(contexts):
 
 # ============ 数据摄入 ============
 
+# 与 CrewAI 服务共用的内置分类规则（应用 + 窗口标题）
+_classifier = AppClassifier()
+
+_session = None
+
+def get_session():
+    """
+    获取共享的 MineContext HTTP 会话（连接池 + 重试退避）
+    
+    文档 ID 是确定的，POST 重试是幂等的，因此可以对 POST 启用重试。
+    """
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=INGEST_RETRIES,
+            backoff_factor=INGEST_BACKOFF,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=INGEST_CONCURRENCY,
+            max_retries=retry
+        )
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+def build_document(ctx):
+    """构造 MineContext 文档"""
+    # 文档 ID 由 frame id 决定，重复摄入会覆盖而不是新增
+    doc_id = f"screenpipe_{ctx['app']}_{ctx['first_frame_id']}"
+    
+    return {
+        "documentId": doc_id,
+        "source": "screenpipe",
+        "mimeType": "text/plain",
+        "title": f"{ctx['app']} - {ctx['window']}",
+        "createdAt": ctx["start_time"],
+        "content": ctx["merged_content"],
+        "metadata": {
+            "app": ctx["app"],
+            "window": ctx["window"],
+            "start_time": ctx["start_time"],
+            "end_time": ctx["end_time"],
+            "first_frame_id": ctx["first_frame_id"],
+            "last_frame_id": ctx["last_frame_id"],
+            "frame_count": ctx["frame_count"],
+            "duration_seconds": round(ctx["duration_seconds"], 1),
+            "category": _classifier.classify(ctx["app"], ctx["window"]),
+            "type": "screen_capture",
+            "source": "screenpipe"
+        }
+    }
+
+def post_document(body):
+    """
+    发送一个已序列化的文档，返回 (是否成功, 错误信息, 是否可重试)
+    
+    连接错误、超时、429 和 5xx 是暂时性的，可以重试；其他 4xx（如 413、422）
+    表示文档本身被拒绝，重试也不会成功。
+    """
+    try:
+        response = get_session().post(
+            f"{MINECONTEXT_API}/api/ingest/document/write",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=INGEST_TIMEOUT
+        )
+        if response.status_code == 200:
+            return True, None, False
+        retryable = response.status_code == 429 or not 400 <= response.status_code < 500
+        return False, f"失败: {response.status_code}", retryable
+    
+    except Exception as e:
+        return False, f"错误: {str(e)[:40]}", True
+
+def record_rejected(document, error):
+    """把被 MineContext 拒绝的文档追加到死信文件，便于事后排查"""
+    metadata = document["metadata"]
+    entry = {
+        "documentId": document["documentId"],
+        "error": error,
+        "first_frame_id": metadata["first_frame_id"],
+        "last_frame_id": metadata["last_frame_id"],
+        "start_time": metadata["start_time"],
+        "content_length": len(document["content"]),
+        "rejected_at": datetime.now().isoformat()
+    }
+    
+    os.makedirs(os.path.dirname(REJECTED_FILE), exist_ok=True)
+    with open(REJECTED_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
 def ingest_to_minecontext(contexts):
-    """将上下文摄入 MineContext"""
-    success_count = 0
-    fail_count = 0
+    """
+    将上下文并发摄入 MineContext
+    
+    使用共享连接池和有界线程池（INGEST_CONCURRENCY），单个慢请求
+    不会阻塞整批；返回本批的吞吐统计。可重试的失败计入 fail（水位线
+    保持不变）；被拒绝的文档计入 rejected 并写入死信文件，不再重试。
+    """
+    stats = {"success": 0, "fail": 0, "rejected": 0, "bytes": 0, "seconds": 0.0}
+    started = time.time()
     
+    jobs = []
     for ctx in contexts:
-        content = ctx["merged_content"]
-        
-        # 构造文档
-        doc_id = f"screenpipe_{ctx['app']}_{ctx['start_time'].replace(':', '-').replace(' ', '_')}"
-        
-        doc = {
-            "documentId": doc_id,
-            "source": "screenpipe",
-            "mimeType": "text/plain",
-            "title": f"{ctx['app']} - {ctx['window']}",
-            "createdAt": ctx["start_time"],
-            "content": content,
-            "metadata": {
-                "app": ctx["app"],
-                "window": ctx["window"],
-                "start_time": ctx["start_time"],
-                "end_time": ctx["end_time"],
-                "frame_count": ctx["count"],
-                "type": "screen_capture",
-                "source": "screenpipe"
-            }
+        document = build_document(ctx)
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        jobs.append((ctx, document, body))
+    
+    with ThreadPoolExecutor(max_workers=INGEST_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(post_document, body): (ctx, document, body)
+            for ctx, document, body in jobs
         }
         
-        try:
-            response = requests.post(
-                f"{MINECONTEXT_API}/api/ingest/document/write",
-                json=doc,
-                timeout=30
-            )
+        for future in as_completed(futures):
+            ctx, document, body = futures[future]
+            ok, error, retryable = future.result()
             
-            if response.status_code == 200:
-                print(f"  ✅ {ctx['app'][:20]:20s} | {ctx['window'][:30]:30s} | {len(content):4d} 字符")
-                success_count += 1
+            if ok:
+                print(f"  ✅ {ctx['app'][:20]:20s} | {ctx['window'][:30]:30s} | {len(ctx['merged_content']):4d} 字符")
+                stats["success"] += 1
+                stats["bytes"] += len(body)
+            elif retryable:
+                print(f"  ❌ {ctx['app'][:20]:20s} | {error}")
+                stats["fail"] += 1
             else:
-                print(f"  ❌ {ctx['app'][:20]:20s} | 失败: {response.status_code}")
-                fail_count += 1
-        
-        except Exception as e:
-            print(f"  ❌ {ctx['app'][:20]:20s} | 错误: {str(e)[:40]}")
-            fail_count += 1
+                print(f"  🚫 {ctx['app'][:20]:20s} | {error}（已拒绝，记入 {REJECTED_FILE}）")
+                record_rejected(document, error)
+                stats["rejected"] += 1
     
-    return success_count, fail_count
+    stats["seconds"] = time.time() - started
+    print_throughput("本批", stats)
+    return stats
+
+def print_throughput(label, stats):
+    """打印吞吐指标：文档/秒、字节/秒、失败数"""
+    seconds = max(stats["seconds"], 1e-6)
+    print(
+        f"📈 {label}: {stats['success']} 文档 / {stats['bytes'] / 1024:.1f} KB, "
+        f"{stats['success'] / seconds:.1f} docs/s, "
+        f"{stats['bytes'] / 1024 / seconds:.1f} KB/s, "
+        f"失败 {stats['fail']}, 拒绝 {stats.get('rejected', 0)}, 耗时 {stats['seconds']:.2f}s"
+    )
 
 # ============ 主循环 ============
 
-def sync_once(hours=1):
-    """执行一次同步"""
-    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 开始同步...")
+def sync_batch(activities, batch_full=False):
+    """
+    处理一批活动：切分会话、过滤、摄入
+    
+    返回 (本批吞吐统计, 未结束的最后一个会话或 None)
+    """
+    contexts, open_session = split_into_sessions(activities, batch_full=batch_full)
+    duplicates = sum(ctx["duplicate_texts"] for ctx in contexts)
+    filtered = filter_contexts(contexts)
+    print(
+        f"🔄 {len(activities)} 条记录 → {len(contexts)} 个已结束会话 → {len(filtered)} 个有效会话"
+        f"（去重 {duplicates} 段 OCR 文本）"
+        + (f"，会话进行中（frame {open_session['first_frame_id']} 起）" if open_session else "")
+    )
     
-    # 1. 获取活动
-    activities = fetch_recent_activities(hours=hours)
-    print(f"📥 获取到 {len(activities)} 条活动记录")
+    if not filtered:
+        return {"success": 0, "fail": 0, "rejected": 0, "bytes": 0, "seconds": 0.0}, open_session
     
-    if not activities:
-        print("💤 暂无新活动")
+    return ingest_to_minecontext(filtered), open_session
+
+def sync_once(initial_hours=INITIAL_LOOKBACK_HOURS):
+    """
+    执行一次增量同步
+    
+    从水位线开始按批处理新 frame，每批没有可重试的失败时才推进水位线；
+    失败的批次会在下一轮重试（文档 ID 固定，重试是幂等的）。被 MineContext
+    拒绝的文档（4xx）不会阻塞水位线，而是记入死信文件后跳过。
+    未结束的最后一个会话从其首帧开始重新读取（见 split_into_sessions）。
+    """
+    print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 开始同步...")
+    
+    try:
+        conn = connect_screenpipe_db()
+    except sqlite3.Error as e:
+        print(f"❌ 打开 Screenpipe 数据库失败: {e}")
         return 0, 0
     
-    # 2. 分组
-    contexts = group_activities_by_context(activities)
-    print(f"🔄 分组为 {len(contexts)} 个上下文")
+    totals = {"success": 0, "fail": 0, "rejected": 0, "bytes": 0, "seconds": 0.0}
+    started = time.time()
     
-    # 3. 过滤
-    filtered = filter_contexts(contexts)
-    print(f"✨ 过滤后剩余 {len(filtered)} 个有效上下文")
+    try:
+        state = load_sync_state()
+        open_frame_id = None
+        if state is None:
+            last_frame_id = initial_watermark(conn, hours=initial_hours)
+            print(f"🆕 首次同步，从 frame {last_frame_id} 之后开始（回溯 {initial_hours} 小时）")
+        else:
+            last_frame_id = state["last_frame_id"]
+            open_frame_id = state.get("open_session_frame_id")
+            print(f"📍 水位线: frame {last_frame_id} ({state.get('last_timestamp')})")
+        
+        for _ in range(MAX_BATCHES_PER_CYCLE):
+            # 未结束的会话从首帧重新读取，与新 frame 一起继续切分
+            read_after = last_frame_id if open_frame_id is None else open_frame_id - 1
+            activities = fetch_activities_after(conn, read_after)
+            if not activities:
+                break
+            
+            print(f"📥 获取到 {len(activities)} 条活动记录 (frame {activities[0][0]} - {activities[-1][0]})")
+            batch_full = len({row[0] for row in activities}) >= BATCH_SIZE
+            stats, open_session = sync_batch(activities, batch_full=batch_full)
+            for key in ("success", "fail", "rejected", "bytes"):
+                totals[key] += stats[key]
+            
+            if stats["fail"] > 0:
+                print("⚠️  本批有摄入失败，水位线保持不变，下一轮重试")
+                break
+            
+            last_frame_id, last_timestamp = activities[-1][0], activities[-1][1]
+            open_frame_id = open_session["first_frame_id"] if open_session else None
+            save_sync_state(last_frame_id, last_timestamp, open_frame_id)
+            
+            if not batch_full:
+                break
     
-    if not filtered:
-        print("💤 没有有效内容可同步")
-        return 0, 0
+    except sqlite3.Error as e:
+        print(f"❌ 查询 Screenpipe 数据库失败: {e}")
+    
+    finally:
+        conn.close()
     
-    # 4. 摄入
-    print(f"📤 开始摄入 MineContext:")
-    success, fail = ingest_to_minecontext(filtered)
+    totals["seconds"] = time.time() - started
+    
+    if totals["success"] == 0 and totals["fail"] == 0 and totals["rejected"] == 0:
+        print("💤 暂无新活动")
+    else:
+        print(
+            f"\n✅ 同步完成: {totals['success']} 成功, {totals['fail']} 失败, "
+            f"{totals['rejected']} 被拒绝"
+        )
+        print_throughput("本轮", totals)
     
-    print(f"\n✅ 同步完成: {success} 成功, {fail} 失败")
-    return success, fail
+    return totals["success"], totals["fail"]
 
 def main_loop():
     """主循环：定时同步"""
     print("=" * 70)
     print("🚀 Screenpipe → MineContext 同步服务")
     print("=" * 70)
-    print(f"📊 同步间隔: {SYNC_INTERVAL}秒 ({SYNC_INTERVAL/3600:.1f}小时)")
+    print(f"📊 同步间隔: {SYNC_INTERVAL}秒")
     print(f"📂 Screenpipe DB: {SCREENPIPE_DB}")
+    print(f"📍 同步状态: {SYNC_STATE_FILE}")
     print(f"🔗 MineContext API: {MINECONTEXT_API}")
     print(f"📏 内容长度: {MIN_CONTEXT_LENGTH} - {MAX_CONTEXT_LENGTH} 字符")
     print("=" * 70)
@@ -243,7 +572,7 @@ def main_loop():
     print("💡 按 Ctrl+C 停止\n")
     
     # 首次同步
-    sync_once(hours=1)
+    sync_once()
     
     # 定时循环
     while True:
@@ -255,7 +584,7 @@ def main_loop():
             time.sleep(SYNC_INTERVAL)
             
             # 执行同步
-            sync_once(hours=1)
+            sync_once()
         
         except KeyboardInterrupt:
             print("\n\n⏹️  收到停止信号，退出...")
@@ -278,7 +607,7 @@ def run_once():
     if not check_minecontext_api():
         return
     
-    success, fail = sync_once(hours=1)
+    success, fail = sync_once()
     
     if success > 0:
         print("\n✅ 测试成功！您可以在 MineContext 中搜索刚才的活动了。")